@@ -1,7 +1,9 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_executor import run_in_executor
+from queued_logging import enable_queued_logging
+from router import flight_router, run_routed
 import rich
 from pydantic import BaseModel  # type: ignore
 from typing import List, Any
@@ -15,23 +17,13 @@ from agents.exceptions import (
 )
 
 
-enable_verbose_stdout_logging()
+# verbose logs background thread se likhe jate hain, event loop stdout par nahi rukta
+enable_queued_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -51,6 +43,7 @@ class FlightBook(BaseModel):
 
 
 @function_tool()
+@run_in_executor("thread", max_concurrency=8)
 def book_flight(flight: FlightBook) -> str:
     """Book a flight"""
     passenger_names = ", ".join(flight.name)
@@ -64,6 +57,7 @@ class SeatChange(BaseModel):
 
 
 @function_tool
+@run_in_executor("thread", max_concurrency=8)
 def change_seat_class(change: SeatChange):
     """Change seat class"""
     if change.current_class == change.new_class:
@@ -86,10 +80,15 @@ agent = Agent(
 )
 
 
+# saaf flight requests traige LLM turn ke baghair seedha flight agent ko jati hain (router.py)
+router = flight_router()
+
+
 async def main():
     try:
-        result = await Runner.run(
-            router_agent,
+        result = await run_routed(
+            router,
+            agent,
             "what is answer 2 + 2 = ?",
             # "Book a flight from karachi to dubai on 2023-06-15 in business class for 2 passengers. and passenger name is Tehreem and ayesha",
             run_config=config,
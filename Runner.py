@@ -1,7 +1,9 @@
 from agents import Agent , Runner , AsyncOpenAI , OpenAIChatCompletionsModel ,handoff, ModelSettings , RunContextWrapper  , TContext , function_tool , TResponseInputItem  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv # type: ignore
-import os
+from provider import get_client, get_model
+from response_cache import CachedModel, default_response_cache
+from tool_cache import memoize_tool
+from tool_executor import run_in_executor
 import asyncio
 from pydantic import BaseModel  # type: ignore
 from dataclasses import dataclass
@@ -11,25 +13,9 @@ from agents.agent import StopAtTools  # <-- yahi import hona chahiye
 from agents.run import HandoffInputFilter
 
 
-
-load_dotenv()
-
-
-
-key = os.getenv("api_key")
-if not key:
-    raise ValueError("API key is not set in the environment variables.")
-
-
-
-Externl_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=Externl_client,
-)
+Externl_client: AsyncOpenAI = get_client()
+# response cache opt-in hai: sirf neeche enable() kiye gaye agents cache hote hain
+model: CachedModel = CachedModel(get_model("gemini-2.0-flash"))
 
 
 
@@ -112,12 +98,18 @@ news_bot = Agent(
     model=model
 )
 
+default_response_cache.enable(agent1, recipe_bot, news_bot)
+
 @function_tool
+@memoize_tool(ttl=300)
+@run_in_executor("inline")  # sirf ek string lautata hai, thread hop ki zaroorat nahi
 def wheather():
     """Get the current weather."""
     return "Sunny"
     
 @function_tool
+@memoize_tool(ttl=3600)
+@run_in_executor("inline")  # sirf ek string lautata hai, thread hop ki zaroorat nahi
 def Today():
     """ Get the current day"""
     return "Today is Monday"
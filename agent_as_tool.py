@@ -1,27 +1,16 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, ToolCallOutputItem , enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool , RunResult  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from arithmetic import evaluate, format_number
 import rich
 from pydantic import BaseModel  # type: ignore
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -41,6 +30,13 @@ def error_handler(ctx : RunContextWrapper , error : Exception):
     print(f"A tool call failed with the following error: {error}")
     return "An internal server error occurred. Please try again later."
 
+# Sub-agent ek hi dafa banta hai aur har call mein reuse hota hai (pehle har call par naya Agent banta tha)
+math_teacher = Agent(
+    name = "Math_Teacher",
+    instructions = "You are a math teacher. You can answer questions related to math. ",
+    model = model
+)
+
 # Customizing tool_agents
 @function_tool(
         # failure_error_function = None
@@ -48,14 +44,13 @@ def error_handler(ctx : RunContextWrapper , error : Exception):
 async def math_tool(input: str):
     """This is math tool"""
     # raise ValueError("custom error give by tehreem")
-    agent = Agent(
-        name = "Math_Teacher",
-        instructions = "You are a math teacher. You can answer questions related to math. ",
-        model = model
-    )
+    # "2 + 2 = ?" jaisa seedha hisaab local hi hal ho jata hai, LLM sirf word problems ke liye
+    value = evaluate(input)
+    if value is not None:
+        return format_number(value)
 
     result  = await Runner.run(
-        agent,
+        math_teacher,
         input,
         run_config=config,
         max_turns = 6
@@ -76,25 +71,37 @@ async def extract_json_payload(run_result: RunResult) -> str:
 
 
 
+# as_tool bhi module level par ek baar: tool aur uska JSON schema har run mein dobara nahi bante
+computer_teacher_tool = agent.as_tool(
+    tool_name="computer_teacher",
+    tool_description="useful for answering questions related to computer science and programming.",
+    # custom_output_extractor=  extract_json_payload # esma error arha hai abhi esko smjhna hai 
+)
+
+
 main_agent = Agent(
     name="main agent",
     instructions=" you are a main agent. if user query is related about programing and computer so use computer teacher tool and if user query is related about math so use math tooland you can also hanfoff to other agents if needed. ",
     model=model,
     tools=[
-    agent.as_tool(
-        tool_name="computer_teacher",
-        tool_description="useful for answering questions related to computer science and programming.",
-        # custom_output_extractor=  extract_json_payload # esma error arha hai abhi esko smjhna hai 
-    ) ,
+    computer_teacher_tool,
     math_tool
     ],
  
 )
 
 async def main():
+    query = "2 + 2 = ? "
+
+    # seedha hisaab ho to main agent ka LLM turn bhi nahi chahiye
+    value = evaluate(query)
+    if value is not None:
+        print("Final Result: " , format_number(value))
+        return
+
     result = await Runner.run(
         starting_agent=main_agent,
-        input="2 + 2 = ? ",
+        input=query,
         run_config=config,
     )
 
@@ -1,7 +1,7 @@
-from agents import Agent , Runner , AsyncOpenAI , OpenAIChatCompletionsModel ,handoff,RunContextWrapper  , TContext , function_tool , TResponseInputItem  # type: ignore
+from agents import Agent , Runner , AsyncOpenAI , OpenAIChatCompletionsModel ,handoff, ModelSettings ,RunContextWrapper  , TContext , function_tool , TResponseInputItem  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv # type: ignore
-import os
+from provider import get_client, get_model
+from response_cache import CachedModel, default_response_cache
 import asyncio
 from pydantic import BaseModel  # type: ignore
 from dataclasses import dataclass
@@ -11,23 +11,9 @@ from agents.agent import StopAtTools  # type: ignore <-- yahi import hona chahiy
 from agents.run import TraceCtxManager # type: ignore
 
 
-load_dotenv()
-
-openai = os.getenv("OPENAI_API_KEY")
-key = os.getenv("api_key")
-if not key:
-    raise ValueError("API key is not set in the environment variables.")
-
-
-
-Externl_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=Externl_client,
-)
+Externl_client: AsyncOpenAI = get_client()
+# response cache opt-in hai: sirf neeche enable() kiye gaye agents cache hote hain
+model: CachedModel = CachedModel(get_model("gemini-2.0-flash"))
 
 
 def filter_func(input_text: str) -> str:
@@ -67,7 +53,8 @@ agent1 = Agent(
     name="JokeBot",
     instructions="You are a joke bot",
     # instructions=dynamic_instructions,
-    model=model
+    model=model,
+    model_settings=ModelSettings(temperature=0.2),  # low temperature: response cache mein aa sakte hain
 )
 agent2 = Agent(
     name="speechBot",
@@ -80,15 +67,19 @@ agent2 = Agent(
 recipe_bot = Agent(
     name="RecipeBot",
     instructions="You are a recipe bot that suggests healthy recipes.",
-    model=model
+    model=model,
+    model_settings=ModelSettings(temperature=0.2),  # low temperature: response cache mein aa sakte hain
 )
 
 news_bot = Agent(
     name="NewsBot",
     instructions="You are a news bot that gives the latest headlines.",
-    model=model
+    model=model,
+    model_settings=ModelSettings(temperature=0.2),  # low temperature: response cache mein aa sakte hain
 )
 
+default_response_cache.enable(agent1, recipe_bot, news_bot)
+
 @function_tool
 def wheather():
     """Get the current weather."""
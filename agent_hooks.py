@@ -1,28 +1,19 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool, AgentHooks  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_executor import run_in_executor
+from router import flight_router, run_routed
+from metrics import MetricsAgentHooks, PRINT_HOOKS, default_metrics
 import rich
 from pydantic import BaseModel  # type: ignore
 from typing import List, Any
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -92,6 +83,7 @@ class FlightBook(BaseModel):
 
 
 @function_tool()
+@run_in_executor("thread", max_concurrency=8)
 def book_flight(flight: FlightBook):
     """Book a flight"""
     passenger_names = ", ".join(flight.name)
@@ -105,6 +97,7 @@ class SeatChange(BaseModel):
 
 
 @function_tool
+@run_in_executor("thread", max_concurrency=8)
 def change_seat_class(change: SeatChange):
     """Change seat class"""
     if change.current_class == change.new_class:
@@ -117,7 +110,8 @@ flight_agent = Agent(
     instructions="you are a flight agent that can provide information about flights. and you have also flight booking tool that can book flight if needed so you can use that tool to book flight.",
     model=model,
     tools=[book_flight, change_seat_class],
-    hooks=AgentHooksflow(),
+    # print wale hooks sirf AGENTS_PRINT_HOOKS=1 par, warna sirf in-memory metrics (metrics.py)
+    hooks=AgentHooksflow() if PRINT_HOOKS else MetricsAgentHooks(),
 )
 
 agent = Agent(
@@ -129,8 +123,13 @@ agent = Agent(
 )
 
 
+# saaf flight requests traige LLM turn ke baghair seedha flight agent ko jati hain (router.py)
+router = flight_router()
+
+
 async def main():
-    result = await Runner.run(
+    result = await run_routed(
+        router,
         agent,
         "Book a flight from karachi to dubai on 2023-06-15 in business class for 2 passengers. and passenger name is Tehreem and ayesha",
         run_config=config,
@@ -141,6 +140,9 @@ async def main():
         result.final_output,
         "\n===================================================\n",
     )
+    rich.print("Router stats:", router.stats.as_dict())
+    if not PRINT_HOOKS:
+        rich.print("Metrics:", default_metrics.snapshot())
 
 
 if __name__ == "__main__":
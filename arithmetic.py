@@ -0,0 +1,87 @@
+from decimal import Decimal, localcontext
+from fractions import Fraction
+import ast
+import operator
+import re
+
+# Safe local arithmetic evaluator.
+# "2 + 2 = ?" jaise sawal ke liye poora LLM run zaroori nahi. Sirf numbers, + - * / // % **
+# aur brackets chalte hain (ast whitelist, eval nahi). Word problem ho to None milta hai aur
+# caller LLM ko bhej deta hai.
+
+_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+# "what is 2+2 = ?" -> "2+2"
+_PREFIX = re.compile(r"^\s*(what\s+is|what's|calculate|compute|solve|evaluate)\s+", re.IGNORECASE)
+_SUFFIX = re.compile(r"[\s=?]+$")
+_ALLOWED = re.compile(r"^[\d\s.+\-*/%()]+$")
+# "3x4" / "3 x 4" mein x guna hai, magar "0x10" hex hai: woh x rehta hai aur _ALLOWED use rad karta hai
+_TIMES = re.compile(r"(?<=[\d)\s])(?<!(?<![\d.])0)x(?=[\d(\s])")
+
+MAX_EXPONENT = 1000
+MAX_LENGTH = 200
+# (10**1000)**1000 jaise nested powers ka exponent chhota hai magar result bohot bara;
+# har * aur ** ke baad numerator / denominator ka size check hota hai
+MAX_BITS = 4096
+
+
+def _normalize(text: str) -> str:
+    text = _PREFIX.sub("", text.strip())
+    text = _SUFFIX.sub("", text)
+    text = _TIMES.sub("*", text)
+    return text.replace("×", "*").replace("÷", "/").replace("^", "**")
+
+
+def _eval(node: ast.AST) -> Fraction:
+    if isinstance(node, ast.Expression):
+        return _eval(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return Fraction(str(node.value))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_eval(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        left, right = _eval(node.left), _eval(node.right)
+        if isinstance(node.op, ast.Pow):
+            # bohot bara power (9**9**9) CPU kha jata hai
+            if right.denominator != 1 or abs(right) > MAX_EXPONENT:
+                raise ValueError("unsupported exponent")
+            # compute se pehle andaza: result ke bits ~ base ke bits * exponent
+            bits = max(left.numerator.bit_length(), left.denominator.bit_length())
+            if bits * abs(right.numerator) > MAX_BITS:
+                raise ValueError("result too large")
+        result = _OPERATORS[type(node.op)](left, right)
+        if isinstance(node.op, (ast.Pow, ast.Mult)) and (
+            result.numerator.bit_length() > MAX_BITS or result.denominator.bit_length() > MAX_BITS
+        ):
+            raise ValueError("result too large")
+        return result
+    raise ValueError(f"unsupported expression: {type(node).__name__}")
+
+
+def evaluate(text: str) -> Fraction | None:
+    """Value of ``text`` if it is plain arithmetic, else None."""
+    expr = _normalize(text)
+    if not expr or len(expr) > MAX_LENGTH or not _ALLOWED.match(expr) or not re.search(r"\d", expr):
+        return None
+    try:
+        return _eval(ast.parse(expr, mode="eval"))
+    except (SyntaxError, ValueError, ZeroDivisionError, TypeError):
+        return None
+
+
+def format_number(value: Fraction) -> str:
+    if value.denominator == 1:
+        return str(value.numerator)
+    # float() bare results (10**1000/3) par OverflowError deta hai, Decimal nahi
+    with localcontext() as ctx:
+        ctx.prec = 10
+        return format(Decimal(value.numerator) / value.denominator, "g")
@@ -0,0 +1,268 @@
+from agents import Agent, Runner  # type: ignore
+from agents.run import DEFAULT_MAX_TURNS  # type: ignore
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from rate_limit import request_priority
+from typing import Any, Iterator
+import argparse
+import asyncio
+import importlib
+import json
+import time
+import provider
+
+# Batch runner: requests.jsonl ki har line ek request hai.
+# File line-by-line parhi jati hai (poori memory mein load nahi hoti), har record apna
+# starting agent chun sakta hai, N requests ek saath chalti hain aur har result foran
+# output JSONL mein likh diya jata hai. Dobara chalane par jo offsets ho chuke hain wo skip.
+#
+#   python batch_runner.py requests.jsonl -o results.jsonl --concurrency 32
+#   python batch_runner.py requests.jsonl -o results.jsonl --resume
+#
+# Record format (sirf "input" zaroori hai):
+#   {"id": "r1", "agent": "agent_hooks:agent", "input": "book a flight ...", "max_turns": 5}
+
+
+@dataclass
+class BatchRecord:
+    offset: int  # input file mein line number (0 se)
+    id: Any
+    agent: str
+    input: Any
+    max_turns: int
+    context: Any = None
+    error: str | None = None  # line parse nahi hui; run nahi hota, sirf error row likhi jati hai
+
+
+@dataclass
+class BatchStats:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        done = self.succeeded + self.failed
+        return done / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "per_second": round(self.per_second, 2)}
+
+
+_agents: dict[str, Agent] = {}
+
+
+def resolve_agent(ref: str) -> Agent:
+    """Load an agent from ``"module:attribute"``, e.g. ``"agent_hooks:agent"`` (cached)."""
+    if ref not in _agents:
+        module_name, _, attr = ref.partition(":")
+        module = importlib.import_module(module_name)
+        agent = getattr(module, attr or "agent", None)
+        if not isinstance(agent, Agent):
+            raise ValueError(f"{ref!r} is not an Agent.")
+        _agents[ref] = agent
+    return _agents[ref]
+
+
+def read_records(
+    path: str | Path,
+    default_agent: str,
+    input_field: str = "input",
+    id_field: str = "id",
+    skip: set[int] | None = None,
+    start: int = 0,
+) -> Iterator[BatchRecord]:
+    """Yield records lazily, skipping offsets below ``start`` and those in ``skip``.
+
+    A malformed line becomes a record with ``error`` set, so it gets an error row instead of
+    stopping the batch.
+    """
+    with open(path, encoding="utf-8") as f:
+        for offset, line in enumerate(f):
+            if offset < start or (skip and offset in skip) or not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"expected a JSON object, got {type(row).__name__}")
+            except ValueError as e:  # JSONDecodeError bhi ValueError hai
+                yield BatchRecord(
+                    offset=offset,
+                    id=offset,
+                    agent=default_agent,
+                    input=None,
+                    max_turns=DEFAULT_MAX_TURNS,
+                    error=f"{type(e).__name__}: {e}",
+                )
+                continue
+            yield BatchRecord(
+                offset=offset,
+                id=row.get(id_field, offset),
+                agent=row.get("agent", default_agent),
+                input=row.get(input_field, row.get("prompt")),
+                max_turns=row.get("max_turns", DEFAULT_MAX_TURNS),
+                context=row.get("context"),
+            )
+
+
+def completed_offsets(output_path: str | Path, retry_errors: bool = False) -> tuple[int, set[int]]:
+    """Read a previous output file; return ``(watermark, done)``.
+
+    ``watermark`` is the first offset that is not finished; everything below it is done, so
+    reading can start there. ``done`` holds finished offsets above the watermark (results are
+    written out of order when requests run concurrently).
+    """
+    done: set[int] = set()
+    path = Path(output_path)
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # crash ke waqt aadhi likhi line
+                if not isinstance(row, dict) or row.get("offset") is None:
+                    continue
+                if retry_errors and row.get("error"):
+                    continue
+                done.add(row["offset"])
+    watermark = 0
+    while watermark in done:
+        watermark += 1
+    return watermark, {o for o in done if o > watermark}
+
+
+async def run_record(record: BatchRecord, run_config) -> dict[str, Any]:
+    result_row: dict[str, Any] = {"offset": record.offset, "id": record.id, "agent": record.agent}
+    started = time.perf_counter()
+    if record.error:
+        result_row.update(output=None, usage=None, error=record.error, latency_s=0.0)
+        return result_row
+    try:
+        if record.input is None:
+            raise ValueError("record has no input")
+        result = await Runner.run(
+            resolve_agent(record.agent),
+            record.input,
+            context=record.context,
+            max_turns=record.max_turns,
+            run_config=run_config,
+        )
+        output = result.final_output
+        usage = result.context_wrapper.usage
+        result_row.update(
+            output=output.model_dump() if hasattr(output, "model_dump") else output,
+            last_agent=result.last_agent.name,
+            usage={
+                "requests": usage.requests,
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "total_tokens": usage.total_tokens,
+            },
+            error=None,
+        )
+    except Exception as e:
+        result_row.update(output=None, usage=None, error=f"{type(e).__name__}: {e}")
+    result_row["latency_s"] = round(time.perf_counter() - started, 4)
+    return result_row
+
+
+async def run_batch(
+    records: Iterator[BatchRecord],
+    output_path: str | Path,
+    concurrency: int = 16,
+    run_config=None,
+    stats: BatchStats | None = None,
+    progress_every: int = 100,
+) -> BatchStats:
+    """Run ``records`` with at most ``concurrency`` in flight, appending each result to ``output_path``.
+
+    Model calls go out with "batch" priority, so interactive traffic is served first.
+    """
+    stats = stats or BatchStats()
+    queue: asyncio.Queue[BatchRecord | None] = asyncio.Queue(maxsize=concurrency * 2)
+    started = time.perf_counter()
+
+    async def produce():
+        # queue bounded hai, is liye file utni hi parhi jati hai jitna workers kha sakein
+        for record in records:
+            await queue.put(record)
+            stats.total += 1
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        async def worker():
+            while (record := await queue.get()) is not None:
+                row = await run_record(record, run_config)
+                out.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+                out.flush()
+                if row["error"]:
+                    stats.failed += 1
+                else:
+                    stats.succeeded += 1
+                    stats.input_tokens += row["usage"]["input_tokens"]
+                    stats.output_tokens += row["usage"]["output_tokens"]
+                done = stats.succeeded + stats.failed
+                if progress_every and done % progress_every == 0:
+                    stats.seconds = time.perf_counter() - started
+                    print(f"[batch] {done} done, {stats.failed} failed, {stats.per_second:.1f}/s")
+
+        with request_priority("batch"):
+            await asyncio.gather(produce(), *(worker() for _ in range(concurrency)))
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of requests through the agents.")
+    parser.add_argument("input", nargs="?", default="requests.jsonl")
+    parser.add_argument("-o", "--output", default="results.jsonl")
+    parser.add_argument("--agent", default="agent_hooks:agent", help="default module:attribute")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--input-field", default="input")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--resume", action="store_true", help="skip offsets already in --output")
+    parser.add_argument("--retry-errors", action="store_true", help="with --resume, rerun failed records")
+    parser.add_argument("--start", type=int, default=0, help="first offset to run")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many records")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    if not args.resume and output.exists():
+        output.unlink()
+
+    start, skip = args.start, set()
+    if args.resume:
+        watermark, skip = completed_offsets(output, args.retry_errors)
+        start = max(start, watermark)
+    stats = BatchStats(skipped=start + len(skip))
+
+    records = read_records(args.input, args.agent, args.input_field, args.id_field, skip, start)
+    if args.limit is not None:
+        records = (r for _, r in zip(range(args.limit), records))
+
+    provider.configure_pool(
+        max_connections=max(provider.pool_settings.max_connections, args.concurrency)
+    )
+    try:
+        await run_batch(
+            records,
+            output,
+            args.concurrency,
+            run_config=provider.run_config(workflow_name="batch_runner"),
+            stats=stats,
+        )
+    finally:
+        await provider.aclose()
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+import httpx  # type: ignore
+
+# Record/replay cassette for model calls.
+# Record mode mein har chat-completions request + response (streaming chunks bhi) ek JSONL
+# cassette mein likha jata hai, key = normalized request ka hash. Replay mode mein wahi
+# responses cassette se aate hain, network bilkul nahi. provider.py isay env se lagata hai:
+#
+#   AGENTS_CASSETTE=cassettes/flights.jsonl.gz AGENTS_CASSETTE_MODE=record python agent_hooks.py
+#   AGENTS_CASSETTE=cassettes/flights.jsonl.gz AGENTS_CASSETTE_MODE=replay python agent_hooks.py
+#
+# Modes: "record" (hamesha network, sab likho), "replay" (sirf cassette, miss = error),
+# "auto" (cassette mein ho to replay, warna record).
+
+# ye fields har run mein badal sakte hain aur jawab par asar nahi dalte
+VOLATILE_FIELDS = ("user", "metadata")
+
+
+class CassetteMiss(Exception):
+    """Replay mode got a request that is not in the cassette."""
+
+
+def _endpoint(path: str) -> str:
+    # base URL (gemini / localhost mock) key ka hissa nahi
+    return "chat/completions" if path.endswith("chat/completions") else path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def request_key(method: str, path: str, body: Any) -> str:
+    """Hash of method, endpoint and the request body with sorted keys and volatile fields removed."""
+    if isinstance(body, dict):
+        body = {k: v for k, v in body.items() if k not in VOLATILE_FIELDS}
+    canonical = json.dumps(
+        [method.upper(), _endpoint(path), body], sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+@dataclass
+class CassetteStats:
+    hits: int = 0
+    misses: int = 0
+    recorded: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Cassette:
+    """Append-only JSONL (``.gz`` for gzip) of recorded interactions.
+
+    The same request can be recorded several times (e.g. a retry after 429); replay serves
+    the recordings for a key in order and then keeps repeating the last one.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self._open("rt") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def next(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+            return entries[min(i, len(entries) - 1)]
+
+    def append(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # gzip append naya member banata hai, gzip.open dono ko ek saath parh leta hai
+            with self._open("at") as f:
+                f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+            self._entries.setdefault(entry["key"], []).append(entry)
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Passes the SSE stream through and collects complete events with their arrival delays."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, on_done: Callable[[list[str], list[float]], None]):
+        self._inner = inner
+        self._on_done = on_done
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        events: list[str] = []
+        delays: list[float] = []
+        pending = b""
+        last = time.perf_counter()
+        async for chunk in self._inner:
+            pending += chunk
+            while b"\n\n" in pending:
+                event, pending = pending.split(b"\n\n", 1)
+                now = time.perf_counter()
+                events.append(event.decode("utf-8") + "\n\n")
+                delays.append(round(now - last, 4))
+                last = now
+            yield chunk
+        if pending:
+            events.append(pending.decode("utf-8"))
+            delays.append(round(time.perf_counter() - last, 4))
+        self._on_done(events, delays)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, events: list[str], delays: list[float] | None):
+        self._events = events
+        self._delays = delays
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for i, event in enumerate(self._events):
+            if self._delays:
+                await asyncio.sleep(self._delays[i])
+            yield event.encode("utf-8")
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records to / replays from a ``Cassette``.
+
+    ``realtime=True`` replays streaming chunks with their recorded gaps (for TTFT checks);
+    by default replay is as fast as possible.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport | None,
+        cassette: Cassette,
+        mode: str = "auto",
+        realtime: bool = False,
+    ):
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if inner is None and mode != "replay":
+            raise ValueError(f"Cassette mode {mode!r} needs a real transport.")
+        self.inner = inner
+        self.cassette = cassette
+        self.mode = mode
+        self.realtime = realtime
+        self.stats = CassetteStats()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        raw = await request.aread()
+        body = json.loads(raw) if raw else None
+        key = request_key(request.method, request.url.path, body)
+
+        if self.mode != "record":
+            entry = self.cassette.next(key)
+            if entry is not None:
+                self.stats.hits += 1
+                return self._replay(entry, request)
+            self.stats.misses += 1
+            if self.mode == "replay":
+                raise CassetteMiss(
+                    f"No recording for {request.method} {request.url.path} (key {key}) in {self.cassette.path}"
+                )
+        return await self._record(key, request)
+
+    def _replay(self, entry: dict[str, Any], request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": entry.get("content_type", "application/json")}
+        if "events" in entry:
+            delays = entry.get("delays") if self.realtime else None
+            return httpx.Response(
+                entry["status"], headers=headers, stream=_ReplayStream(entry["events"], delays), request=request
+            )
+        content = entry["json"] if "json" in entry else entry.get("text", "")
+        if not isinstance(content, str):
+            content = json.dumps(content)
+        return httpx.Response(entry["status"], headers=headers, content=content.encode(), request=request)
+
+    async def _record(self, key: str, request: httpx.Request) -> httpx.Response:
+        # gzip bytes cassette mein nahi chahiye; stream pass-through bhi raw bytes deta hai
+        request.headers["accept-encoding"] = "identity"
+        response = await self.inner.handle_async_request(request)
+        content_type = response.headers.get("content-type", "")
+        entry: dict[str, Any] = {
+            "key": key,
+            "endpoint": _endpoint(request.url.path),
+            "status": response.status_code,
+            "content_type": content_type,
+        }
+
+        if content_type.startswith("text/event-stream"):
+            def on_done(events: list[str], delays: list[float]) -> None:
+                self.cassette.append({**entry, "events": events, "delays": delays})
+                self.stats.recorded += 1
+
+            return httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=_RecordingStream(response.stream, on_done),
+                request=request,
+                extensions=response.extensions,
+            )
+
+        raw = await response.aread()
+        text = raw.decode("utf-8", errors="replace")
+        try:
+            entry["json"] = json.loads(text)
+        except json.JSONDecodeError:
+            entry["text"] = text
+        self.cassette.append(entry)
+        self.stats.recorded += 1
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=raw,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
@@ -0,0 +1,166 @@
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator
+import asyncio
+import hashlib
+import httpx  # type: ignore
+
+# Single-flight request coalescing.
+# Ek hi waqt mein N bilkul same requests (same URL, API key aur body) aayen to upstream par
+# sirf ek call jati hai. Baqi sab usi call ke bytes padhte hain: har caller ko apna alag
+# httpx.Response milta hai (apni copy parse hoti hai), streaming mein har subscriber ko
+# shuru se saare chunks milte hain. Upstream call khatam hote hi flight hat jati hai, ye cache nahi.
+
+# ye header wali request kabhi coalesce nahi hoti (hedge.py ki duplicate request ko alag call chahiye)
+NO_COALESCE_HEADER = "x-agents-no-coalesce"
+
+
+@dataclass
+class CoalesceStats:
+    upstream_calls: int = 0  # jo requests waqai network par gayi
+    coalesced: int = 0  # jo kisi chalti hui call ke saath jud gayi
+    streaming_fanouts: int = 0  # streaming flights jinke ek se zyada subscribers the
+    max_fanout: int = 0
+    upstream_cancelled: int = 0  # sab subscribers chale gaye to upstream band
+
+    @property
+    def coalesced_ratio(self) -> float:
+        total = self.upstream_calls + self.coalesced
+        return self.coalesced / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "coalesced_ratio": round(self.coalesced_ratio, 4)}
+
+
+class _Flight:
+    def __init__(self):
+        self.status: int | None = None
+        self.headers: httpx.Headers | None = None
+        self.extensions: dict[str, Any] = {}
+        self.chunks: list[bytes] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.ready = asyncio.Event()  # status + headers aa gaye (ya error)
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+        self.total_subscribers = 0
+        self.task: asyncio.Task | None = None
+
+    def notify(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class _FanOutStream(httpx.AsyncByteStream):
+    def __init__(self, transport: "CoalescingTransport", flight: _Flight):
+        self._transport = transport
+        self._flight = flight
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        flight, i = self._flight, 0
+        while True:
+            while i < len(flight.chunks):
+                yield flight.chunks[i]
+                i += 1
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            await flight.changed.wait()
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._transport._unsubscribe(self._flight)
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that shares one upstream call between identical concurrent requests."""
+
+    # GET coalesce nahi hota: warm_up() jaan boojh kar same GET /models kai baar bhejta hai
+    def __init__(self, inner: httpx.AsyncBaseTransport, methods: tuple[str, ...] = ("POST",)):
+        self.inner = inner
+        self.methods = methods
+        self.stats = CoalesceStats()
+        self._flights: dict[str, _Flight] = {}
+
+    @staticmethod
+    def request_key(request: httpx.Request, body: bytes) -> str:
+        digest = hashlib.sha256()
+        for part in (request.method, str(request.url), request.headers.get("authorization", "")):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(body)
+        return digest.hexdigest()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.headers.pop(NO_COALESCE_HEADER, None) or request.method not in self.methods:
+            return await self.inner.handle_async_request(request)
+        body = await request.aread()
+        key = self.request_key(request, body)
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.create_task(self._pump(key, flight, request))
+            self.stats.upstream_calls += 1
+        else:
+            self.stats.coalesced += 1
+        flight.subscribers += 1
+        flight.total_subscribers += 1
+        self.stats.max_fanout = max(self.stats.max_fanout, flight.total_subscribers)
+
+        try:
+            await flight.ready.wait()
+        except asyncio.CancelledError:
+            self._unsubscribe(flight)
+            raise
+        if flight.status is None:
+            self._unsubscribe(flight)
+            raise flight.error
+        return httpx.Response(
+            flight.status,
+            headers=flight.headers,
+            stream=_FanOutStream(self, flight),
+            request=request,
+            extensions=flight.extensions,
+        )
+
+    async def _pump(self, key: str, flight: _Flight, request: httpx.Request) -> None:
+        response = None
+        try:
+            response = await self.inner.handle_async_request(request)
+            flight.status, flight.headers = response.status_code, response.headers
+            flight.extensions = {
+                k: v for k, v in response.extensions.items() if k in ("http_version", "reason_phrase")
+            }
+            flight.ready.set()
+            async for chunk in response.stream:
+                flight.chunks.append(chunk)
+                flight.notify()
+        except asyncio.CancelledError:
+            flight.error = httpx.ReadError("Upstream request cancelled; no subscribers left.", request=request)
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.ready.set()
+            flight.notify()
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if flight.total_subscribers > 1 and (flight.headers or {}).get(
+                "content-type", ""
+            ).startswith("text/event-stream"):
+                self.stats.streaming_fanouts += 1
+            if response is not None:
+                await response.aclose()
+
+    def _unsubscribe(self, flight: _Flight) -> None:
+        flight.subscribers -= 1
+        if flight.subscribers <= 0 and not flight.done and flight.task is not None:
+            # koi sunne wala nahi bacha, upstream band karo
+            self.stats.upstream_cancelled += 1
+            flight.task.cancel()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -1,27 +1,16 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, function_tool , enable_verbose_stdout_logging    # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_cache import memoize_tool
 from pydantic import BaseModel # type: ignore
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
 # External client
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
 # Model
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 # Run config
 config = RunConfig(
@@ -39,6 +28,7 @@ class IsAdmin(BaseModel):
 
 # Tool to check admin
 @function_tool
+@memoize_tool(ttl=60)
 async def check_admin(username: str, password: str) -> bool:
     """Check if the user is an admin."""
     admin_user = IsAdmin(username="admin", password="admin123")
@@ -0,0 +1,236 @@
+from agents import Agent, Runner  # type: ignore
+from agents.run import RunConfig  # type: ignore
+from rate_limit import request_priority
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Guardrail verdict cache.
+# Guardrail agents (jaise user_input_guard, TeacherQueryGuardrail) har request par ek
+# poora Runner.run karte hain. Same sawal dobara aye to purana verdict yahan se mil jata hai.
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    persistent_hits: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_input(input: Any) -> str:
+    """Lowercase, collapse whitespace; list inputs are normalized item by item."""
+    if isinstance(input, str):
+        return re.sub(r"\s+", " ", input).strip().lower()
+    items = []
+    for item in input:
+        if isinstance(item, dict) and isinstance(item.get("content"), str):
+            item = {**item, "content": normalize_input(item["content"])}
+        items.append(item)
+    return json.dumps(items, sort_keys=True, default=str)
+
+
+def agent_identity(agent: Agent) -> str:
+    """name + instructions hash + output_type, so editing the prompt invalidates old verdicts."""
+    instructions = agent.instructions
+    if not isinstance(instructions, str):
+        instructions = getattr(instructions, "__qualname__", repr(instructions))
+    output_type = agent.output_type
+    output_name = (
+        f"{output_type.__module__}.{output_type.__qualname__}" if output_type else "str"
+    )
+    digest = hashlib.sha256((instructions or "").encode()).hexdigest()[:16]
+    return f"{agent.name}|{digest}|{output_name}"
+
+
+class GuardrailCache:
+    """LRU + TTL cache of guardrail agent outputs with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 600.0,
+        db_path: str | None = None,
+        max_db_entries: int = 10_000,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self._db_writes = 0
+        self.stats = CacheStats()
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS guardrail_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._prune_db(time.time())  # pichle runs ke expired rows
+            self._db.commit()
+
+    def make_key(self, agent: Agent, input: Any) -> str:
+        raw = agent_identity(agent) + "\n" + normalize_input(input)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    # ---- in-memory tier ----
+
+    def _get_memory(self, key: str) -> Any | None:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._items[key]
+            self.stats.expired += 1
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def _put_memory(self, key: str, value: Any, expires_at: float) -> None:
+        self._items[key] = (expires_at, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.stats.evictions += 1
+
+    # ---- SQLite tier ----
+
+    def _get_db(self, key: str) -> tuple[float, str] | None:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, payload FROM guardrail_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row
+
+    def _prune_db(self, now: float) -> None:
+        self._db.execute("DELETE FROM guardrail_cache WHERE expires_at < ?", (now,))
+        # sab ka ttl ek hai, is liye sab se pehle expire hone wale hi sab se purane hain
+        self._db.execute(
+            """
+            DELETE FROM guardrail_cache WHERE key IN (
+                SELECT key FROM guardrail_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_db_entries,),
+        )
+
+    def _put_db(self, key: str, payload: str, expires_at: float) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO guardrail_cache (key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self._db_writes += 1
+            # har 100 writes par expired aur size limit se upar wale rows hatao
+            if self._db_writes % 100 == 0:
+                self._prune_db(time.time())
+            self._db.commit()
+
+    @staticmethod
+    def _dump(value: Any) -> str:
+        if hasattr(value, "model_dump_json"):
+            return value.model_dump_json()
+        return json.dumps(value)
+
+    @staticmethod
+    def _load(agent: Agent, payload: str) -> Any:
+        output_type = agent.output_type
+        if output_type is not None and hasattr(output_type, "model_validate_json"):
+            return output_type.model_validate_json(payload)
+        return json.loads(payload)
+
+    async def get(self, agent: Agent, input: Any) -> Any | None:
+        key = self.make_key(agent, input)
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            row = await asyncio.to_thread(self._get_db, key)
+            if row is not None and row[0] >= time.time():
+                value = self._load(agent, row[1])
+                self._put_memory(key, value, row[0])
+                self.stats.persistent_hits += 1
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def put(self, agent: Agent, input: Any, value: Any) -> None:
+        key = self.make_key(agent, input)
+        expires_at = time.time() + self.ttl
+        self._put_memory(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._put_db, key, self._dump(value), expires_at)
+
+    def clear(self) -> None:
+        self._items.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM guardrail_cache")
+                self._db.commit()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._items),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "persistent_hits": self.stats.persistent_hits,
+            "evictions": self.stats.evictions,
+            "expired": self.stats.expired,
+            "hit_ratio": round(self.stats.hit_ratio, 4),
+        }
+
+
+default_cache = GuardrailCache(
+    maxsize=int(os.getenv("AGENTS_GUARDRAIL_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AGENTS_GUARDRAIL_CACHE_TTL", "600")),
+    db_path=os.getenv("AGENTS_GUARDRAIL_CACHE_DB") or None,
+    max_db_entries=int(os.getenv("AGENTS_GUARDRAIL_CACHE_MAX_ENTRIES", "10000")),
+)
+
+
+async def run_guardrail_agent(
+    guard_agent: Agent,
+    input: Any,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    cache: GuardrailCache | None = default_cache,
+) -> Any:
+    """Runner.run the guardrail agent, unless a fresh verdict for this input is cached."""
+    if cache is not None:
+        cached = await cache.get(guard_agent, input)
+        if cached is not None:
+            return cached
+
+    with request_priority("guardrail"):  # user-facing agents ki requests pehle jayen
+        result = await Runner.run(
+            starting_agent=guard_agent,
+            input=input,
+            context=context,
+            run_config=run_config,
+        )
+    if cache is not None:
+        await cache.put(guard_agent, input, result.final_output)
+    return result.final_output
@@ -1,7 +1,6 @@
 from agents import Agent, HandoffInputData, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, handoff, enable_verbose_stdout_logging, function_tool, ModelSettings, trace, RunContextWrapper  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
 from pydantic import BaseModel  # type: ignore
 import rich
 # from agents.extensions import handoff_filters
@@ -9,22 +8,11 @@ import rich
 # print("++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++")
 # enable_verbose_stdout_logging()
 # print("++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++")
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
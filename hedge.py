@@ -0,0 +1,236 @@
+from agents import ModelResponse, ModelSettings, Tool, TResponseInputItem  # type: ignore
+from agents.agent_output import AgentOutputSchemaBase  # type: ignore
+from agents.handoffs import Handoff  # type: ignore
+from agents.models.interface import Model, ModelTracing  # type: ignore
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator
+import asyncio
+import json
+import time
+
+# Hedged requests for tail latency.
+# Primary model ka pehla token (streaming) ya poora jawab (get_response) ek percentile deadline
+# (jaise pichli calls ka p95) tak na aaye to wahi request secondary model / provider ko bhi
+# bhej di jati hai. Jo pehle jawab de wo jeet-ta hai, doosra cancel. Hedges ki tadaad aur
+# zaya tokens dono par budget hai, taake slow upstream ke waqt kharcha double na ho jaye.
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    secondary_wins: int = 0
+    primary_wins_after_hedge: int = 0
+    budget_denied: int = 0  # deadline guzri magar budget khatam tha
+    wasted_requests: int = 0
+    wasted_tokens: int = 0  # haarne wali call ke (andaze ke) tokens
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hedge_rate": round(self.hedge_rate, 4)}
+
+
+def _estimate_tokens(system_instructions: str | None, input: Any) -> int:
+    return (len(system_instructions or "") + len(json.dumps(input, default=str))) // 4
+
+
+async def _pump(stream: AsyncIterator[Any], queue: asyncio.Queue) -> None:
+    # poora generator ek hi task mein chalta hai (SDK ke tracing spans contextvars use karte hain)
+    try:
+        async for event in stream:
+            queue.put_nowait(("event", event))
+        queue.put_nowait(("done", None))
+    except Exception as e:
+        queue.put_nowait(("error", e))
+    finally:
+        # haarne wale ka task cancel hota hai: generator (aur us ka HTTP body, limiter slot,
+        # in_flight) isi waqt band karo, GC ke intezar par na chhoro
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class HedgedModel(Model):
+    """Races ``secondary`` against ``primary`` when the primary is slower than the deadline.
+
+    The deadline is the ``percentile`` of the last ``window`` primary latencies (time to first
+    stream event, or to the full response), or ``initial_deadline`` until ``min_samples`` exist.
+    Hedging stops once hedges exceed ``max_hedge_ratio`` of requests or wasted tokens reach
+    ``max_wasted_tokens``.
+    """
+
+    def __init__(
+        self,
+        primary: Model,
+        secondary: Model,
+        percentile: float = 95.0,
+        initial_deadline: float = 2.0,
+        min_deadline: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_hedge_ratio: float = 0.1,
+        max_wasted_tokens: int | None = None,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile
+        self.initial_deadline = initial_deadline
+        self.min_deadline = min_deadline
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_wasted_tokens = max_wasted_tokens
+        self.stats = HedgeStats()
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def deadline(self) -> float:
+        if len(self._latencies) < self.min_samples:
+            return self.initial_deadline
+        values = sorted(self._latencies)
+        value = values[min(len(values) - 1, int(len(values) * self.percentile / 100))]
+        return max(self.min_deadline, value)
+
+    def _may_hedge(self) -> bool:
+        over_ratio = self.stats.hedged + 1 > self.max_hedge_ratio * self.stats.requests + 1
+        over_tokens = (
+            self.max_wasted_tokens is not None and self.stats.wasted_tokens >= self.max_wasted_tokens
+        )
+        if over_ratio or over_tokens:
+            self.stats.budget_denied += 1
+            return False
+        return True
+
+    def _record_primary(self, started: float, finished: list[float], deadline: float) -> None:
+        # hedge ke baad bhi sample primary ka hi: secondary ki latency se p95 neeche girta aur
+        # aur zyada hedges hote. Primary kamyab na hua ho (ya race ke baad cancel) to sirf itna
+        # pata hai ke wo deadline se slow tha, is liye sample deadline par censor hota hai.
+        self._latencies.append(finished[0] - started if finished else deadline)
+
+    def _record_winner(self, primary_won: bool) -> None:
+        if primary_won:
+            self.stats.primary_wins_after_hedge += 1
+        else:
+            self.stats.secondary_wins += 1
+        self.stats.wasted_requests += 1
+
+    async def _race(self, primary: asyncio.Task, secondary: asyncio.Task) -> tuple[asyncio.Task, asyncio.Task]:
+        """Return ``(winner, loser)``; a task that fails loses to one that succeeds."""
+        pending = {primary, secondary}
+        first_error: asyncio.Task | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task, (secondary if task is primary else primary)
+                first_error = first_error or task
+        return first_error, (secondary if first_error is primary else primary)
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        self.stats.requests += 1
+        started = time.perf_counter()
+        deadline = self.deadline()
+        primary = asyncio.create_task(self.primary.get_response(*args, **kwargs))
+        primary_finished: list[float] = []
+        primary.add_done_callback(
+            lambda t: t.cancelled() or t.exception() or primary_finished.append(time.perf_counter())
+        )
+        secondary: asyncio.Task | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=deadline)
+            if done or not self._may_hedge():
+                response = await primary
+                self._latencies.append(time.perf_counter() - started)
+                return response
+
+            self.stats.hedged += 1
+            secondary = asyncio.create_task(self.secondary.get_response(*args, **kwargs))
+            winner, loser = await self._race(primary, secondary)
+            self._record_primary(started, primary_finished, deadline)
+            self._record_winner(winner is primary)
+            if loser.done() and loser.exception() is None:
+                self.stats.wasted_tokens += loser.result().usage.total_tokens
+            else:
+                loser.cancel()
+                self.stats.wasted_tokens += _estimate_tokens(system_instructions, input)
+            return winner.result()
+        finally:
+            for task in (primary, secondary):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        self.stats.requests += 1
+        started = time.perf_counter()
+        deadline = self.deadline()
+        queues = [asyncio.Queue()]
+        pumps = [asyncio.create_task(_pump(self.primary.stream_response(*args, **kwargs), queues[0]))]
+        firsts = [asyncio.create_task(queues[0].get())]
+        primary_first: list[float] = []
+        firsts[0].add_done_callback(
+            lambda t: t.cancelled() or t.result()[0] == "error" or primary_first.append(time.perf_counter())
+        )
+        try:
+            done, _ = await asyncio.wait(firsts, timeout=deadline)
+            winner = 0
+            if not done and self._may_hedge():
+                self.stats.hedged += 1
+                queues.append(asyncio.Queue())
+                pumps.append(
+                    asyncio.create_task(_pump(self.secondary.stream_response(*args, **kwargs), queues[1]))
+                )
+                firsts.append(asyncio.create_task(queues[1].get()))
+                pending = set(firsts)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    ok = [t for t in done if t.result()[0] != "error"]
+                    if ok or not pending:
+                        winner = firsts.index((ok or list(done))[0])
+                        break
+                loser = 1 - winner
+                firsts[loser].cancel()
+                pumps[loser].cancel()
+                # loser ka response winner ke stream hone tak khula na rahe
+                await asyncio.gather(firsts[loser], pumps[loser], return_exceptions=True)
+                self._record_primary(started, primary_first, deadline)
+                self._record_winner(winner == 0)
+                self.stats.wasted_tokens += _estimate_tokens(system_instructions, input)
+            else:
+                await asyncio.wait(firsts)
+                self._latencies.append(time.perf_counter() - started)
+
+            kind, value = firsts[winner].result()
+            while kind == "event":
+                yield value
+                kind, value = await queues[winner].get()
+            if kind == "error":
+                raise value
+        finally:
+            tasks = [t for t in pumps + firsts if not t.done()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,7 +1,11 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool, AgentHooks, input_guardrail, GuardrailFunctionOutput, InputGuardrailTripwireTriggered  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_executor import run_in_executor
+from guardrail_cache import run_guardrail_agent
+from preclassifier import PreClassifier, fast_path_guardrail
+from speculative import run_speculative, speculation_stats
+from router import LocalRouter, run_routed
 import rich
 from pydantic import BaseModel  # type: ignore
 from typing import List, Any
@@ -9,21 +13,10 @@ from agents.exceptions import AgentsException
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -51,21 +44,34 @@ user_input_guard = Agent(
 )
 
 
+# saaf flight / saaf non-flight inputs LLM ke baghair decide ho jate hain
+flight_classifier = PreClassifier(
+    name="flight",
+    allow_keywords=["flight", "flights", "airline", "boarding", "seat", "seat class", "business class", "economy", "passenger", "passengers", "ticket", "departure", "layover"],
+    deny_keywords=["recipe", "joke", "poem", "weather", "news", "homework", "capital of"],
+    deny_patterns=[r"^[\s\d+\-*/().=?x]*(what is )?(answer )?[\s\d+\-*/().=?x]+$"],
+)
+
+
 @input_guardrail
 async def inputguardrail(
     ctx: RunContextWrapper, agent: Agent, input: str
 ) -> GuardrailFunctionOutput:
-    result = await Runner.run(
-        starting_agent=user_input_guard,
-        input=input,
-        context=ctx.context,
-        run_config=config,
-    )
+    async def ask_guardrail_agent() -> GuardrailFunctionOutput:
+        # same input dobara aye to cached verdict use hota hai (guardrail_cache.py)
+        final_output = await run_guardrail_agent(
+            user_input_guard,
+            input,
+            context=ctx.context,
+            run_config=config,
+        )
+
+        return GuardrailFunctionOutput(
+            output_info=final_output,
+            tripwire_triggered=not final_output.is_flight_related,
+        )
 
-    return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_flight_related,
-    )
+    return await fast_path_guardrail(flight_classifier, input, ask_guardrail_agent)
 
 
 class FlightBook(BaseModel):
@@ -78,6 +84,7 @@ class FlightBook(BaseModel):
 
 
 @function_tool()
+@run_in_executor("thread", max_concurrency=8)
 def book_flight(flight: FlightBook):
     """Book a flight"""
     passenger_names = ", ".join(flight.name)
@@ -91,6 +98,7 @@ class SeatChange(BaseModel):
 
 
 @function_tool
+@run_in_executor("thread", max_concurrency=8)
 def change_seat_class(change: SeatChange):
     """Change seat class"""
     if change.current_class == change.new_class:
@@ -113,14 +121,20 @@ agent = Agent(
     input_guardrails=[inputguardrail],
 )
 
+# saaf flight requests traige LLM turn ke baghair seedha flight agent ko (guardrail phir bhi chalta hai)
+router = LocalRouter({"flight agent": flight_classifier})
+
 
 async def main():
     try:
-        result = await Runner.run(
+        # router confident na ho to traige agent; guardrail aur pehla model call saath saath chalte hain
+        result = await run_routed(
+            router,
             agent,
             "what is answer 2 + 2 = ?",
             # "Book a flight from karachi to dubai on 2023-06-15 in business class for 2 passengers. and passenger name is Tehreem and ayesha",
             run_config=config,
+            runner=run_speculative,
         )
 
         print(
@@ -134,6 +148,9 @@ async def main():
     except AgentsException as e:
         print("\n\n Exception raised ------->\n ", e, "\n\n")
 
+    rich.print("Speculation stats:", speculation_stats.as_dict())
+    rich.print("Router stats:", router.stats.as_dict())
+
 if __name__ == "__main__":
     import asyncio
 
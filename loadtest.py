@@ -0,0 +1,296 @@
+from agents import InputGuardrail, ModelSettings, OutputGuardrail, Runner  # type: ignore
+from openai.types.responses import ResponseTextDeltaEvent  # type: ignore
+from batch_runner import BatchRecord, read_records, resolve_agent
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import statistics
+import subprocess
+import time
+import provider
+
+# Load test harness.
+# Ek corpus (jaise requests.jsonl) ko kisi bhi agent graph par target QPS (open loop) ya
+# fixed concurrency (closed loop) par chalata hai aur latency percentiles, time to first token
+# (run_streamed), turns per run aur guardrail ka time naapta hai. Report sorted-keys JSON hai
+# taake do runs ka `diff` ya `--compare` seedha kaam kare.
+#
+#   python loadtest.py corpus.jsonl --agent main:TeacherAgent --qps 20 --requests 500 -o before.json
+#   python loadtest.py corpus.jsonl --agent main:TeacherAgent --qps 20 --requests 500 \
+#       --model-settings '{"temperature": 0}' -o after.json --compare before.json
+
+# har run ke guardrail timings; guardrail tasks context copy karte hain, list wahi rehti hai
+_guardrail_times: ContextVar[dict[str, float] | None] = ContextVar("_guardrail_times", default=None)
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(values: list[float], scale: float = 1000.0) -> dict[str, float | None]:
+    """p50/p95/p99/mean/max, in milliseconds by default."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50) * scale, 2),
+        "p95": round(percentile(values, 95) * scale, 2),
+        "p99": round(percentile(values, 99) * scale, 2),
+        "mean": round(statistics.fmean(values) * scale, 2),
+        "max": round(max(values) * scale, 2),
+    }
+
+
+def _timed(run, kind: str):
+    @functools.wraps(run)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await run(*args, **kwargs)
+        finally:
+            times = _guardrail_times.get()
+            if times is not None:
+                times[kind] = times.get(kind, 0.0) + time.perf_counter() - started
+
+    return wrapper
+
+
+def instrument_guardrails() -> None:
+    """Time every input/output guardrail in the process, including those on handoff targets."""
+    if not getattr(InputGuardrail.run, "_loadtest_timed", False):
+        InputGuardrail.run = _timed(InputGuardrail.run, "input")
+        OutputGuardrail.run = _timed(OutputGuardrail.run, "output")
+        InputGuardrail.run._loadtest_timed = True
+
+
+@dataclass
+class Sample:
+    latency: float
+    ttft: float | None = None
+    turns: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    guardrail_input: float = 0.0
+    guardrail_output: float = 0.0
+    error: str | None = None
+    queued: float = 0.0  # open loop mein schedule se kitni der baad shuru hua
+
+
+@dataclass
+class LoadTest:
+    agent_ref: str
+    streamed: bool = False
+    run_config: Any = None
+    samples: list[Sample] = field(default_factory=list)
+
+    def __post_init__(self):
+        instrument_guardrails()
+
+    async def one(self, record: BatchRecord, scheduled: float | None = None) -> Sample:
+        started = time.perf_counter()
+        times: dict[str, float] = {}
+        token = _guardrail_times.set(times)
+        sample = Sample(latency=0.0, queued=started - scheduled if scheduled else 0.0)
+        try:
+            agent = resolve_agent(record.agent)
+            if self.streamed:
+                result = Runner.run_streamed(
+                    agent,
+                    record.input,
+                    context=record.context,
+                    max_turns=record.max_turns,
+                    run_config=self.run_config,
+                )
+                async for event in result.stream_events():
+                    if (
+                        sample.ttft is None
+                        and event.type == "raw_response_event"
+                        and isinstance(event.data, ResponseTextDeltaEvent)
+                    ):
+                        sample.ttft = time.perf_counter() - started
+            else:
+                result = await Runner.run(
+                    agent,
+                    record.input,
+                    context=record.context,
+                    max_turns=record.max_turns,
+                    run_config=self.run_config,
+                )
+            usage = result.context_wrapper.usage
+            sample.turns = len(result.raw_responses)
+            sample.input_tokens = usage.input_tokens
+            sample.output_tokens = usage.output_tokens
+        except Exception as e:
+            sample.error = type(e).__name__
+        finally:
+            _guardrail_times.reset(token)
+        sample.latency = time.perf_counter() - started
+        sample.guardrail_input = times.get("input", 0.0)
+        sample.guardrail_output = times.get("output", 0.0)
+        return sample
+
+    async def closed_loop(self, records: Iterator[BatchRecord], concurrency: int) -> None:
+        """``concurrency`` virtual users, each sends its next request as soon as one finishes."""
+        async def user():
+            for record in records:  # shared iterator: har record ek hi user uthata hai
+                self.samples.append(await self.one(record))
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    async def open_loop(self, records: Iterator[BatchRecord], qps: float, max_in_flight: int) -> None:
+        """Start requests on a fixed schedule of ``qps``, whether or not earlier ones finished."""
+        limit = asyncio.Semaphore(max_in_flight)
+        tasks = []
+        t0 = time.perf_counter()
+
+        async def fire(record: BatchRecord, scheduled: float):
+            async with limit:
+                self.samples.append(await self.one(record, scheduled))
+
+        for i, record in enumerate(records):
+            scheduled = t0 + i / qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(record, scheduled)))
+        await asyncio.gather(*tasks)
+
+    def report(self, seconds: float, settings: dict[str, Any]) -> dict[str, Any]:
+        ok = [s for s in self.samples if s.error is None]
+        errors: dict[str, int] = {}
+        for s in self.samples:
+            if s.error:
+                errors[s.error] = errors.get(s.error, 0) + 1
+        return {
+            "settings": settings,
+            "requests": len(self.samples),
+            "succeeded": len(ok),
+            "errors": dict(sorted(errors.items())),
+            "seconds": round(seconds, 3),
+            "achieved_qps": round(len(self.samples) / seconds, 2) if seconds else 0.0,
+            "latency_ms": summarize([s.latency for s in ok]),
+            "ttft_ms": summarize([s.ttft for s in ok if s.ttft is not None]),
+            "schedule_lag_ms": summarize([s.queued for s in self.samples]),
+            "turns": {
+                "mean": round(statistics.fmean([s.turns for s in ok]), 3) if ok else None,
+                "max": max((s.turns for s in ok), default=None),
+            },
+            "tokens": {
+                "input": sum(s.input_tokens for s in ok),
+                "output": sum(s.output_tokens for s in ok),
+            },
+            "guardrail_ms": {
+                "input": summarize([s.guardrail_input for s in ok]),
+                "output": summarize([s.guardrail_output for s in ok]),
+                # output guardrails final answer ke baad chalte hain, poora time latency mein judta hai
+                "output_share_of_latency": round(
+                    sum(s.guardrail_output for s in ok) / sum(s.latency for s in ok), 4
+                ) if ok else None,
+            },
+        }
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """Human-readable deltas for the headline numbers of two reports."""
+    lines = []
+    for section in ("latency_ms", "ttft_ms"):
+        for key in ("p50", "p95", "p99"):
+            a, b = old.get(section, {}).get(key), new.get(section, {}).get(key)
+            if a and b is not None:
+                lines.append(f"{section}.{key}: {a} -> {b} ({(b - a) / a * 100:+.1f}%)")
+    for key in ("achieved_qps", "succeeded"):
+        lines.append(f"{key}: {old.get(key)} -> {new.get(key)}")
+    return lines
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test an agent graph with a JSONL corpus.")
+    parser.add_argument("corpus", nargs="?", default="requests.jsonl")
+    parser.add_argument("--agent", default="agent_hooks:agent", help="default module:attribute")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--qps", type=float, help="open loop: requests started per second")
+    mode.add_argument("--concurrency", type=int, default=8, help="closed loop: virtual users")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="cap for --qps mode")
+    parser.add_argument("--requests", type=int, default=None, help="total requests (corpus repeats)")
+    parser.add_argument("--warmup", type=int, default=0, help="requests excluded from the report")
+    parser.add_argument("--streamed", action="store_true", help="use Runner.run_streamed (TTFT)")
+    parser.add_argument("--model", default=provider.DEFAULT_MODEL)
+    parser.add_argument("--model-settings", default="{}", help="JSON for ModelSettings")
+    parser.add_argument("--input-field", default="input")
+    parser.add_argument("-o", "--output", default="loadtest_report.json")
+    parser.add_argument("--compare", default=None, help="previous report to diff against")
+    args = parser.parse_args()
+
+    model_settings = json.loads(args.model_settings)
+    if args.streamed:
+        # streaming mein usage chunk tabhi aata hai jab maanga jaye
+        model_settings.setdefault("include_usage", True)
+    run_config = provider.run_config(
+        args.model,
+        model_settings=ModelSettings(**model_settings),
+        tracing_disabled=True,
+    )
+
+    def corpus() -> Iterator[BatchRecord]:
+        if not args.requests:
+            return read_records(args.corpus, args.agent, args.input_field)
+        # corpus repeat hota hai: ek dafa parho, khali ho to cycle hamesha ghoomta rehta
+        records = list(read_records(args.corpus, args.agent, args.input_field))
+        if not records:
+            parser.error(f"{args.corpus} has no records to repeat for --requests")
+        return itertools.islice(itertools.cycle(records), args.requests)
+
+    test = LoadTest(args.agent, streamed=args.streamed, run_config=run_config)
+    records = corpus()
+    if args.warmup:
+        await test.closed_loop(itertools.islice(records, args.warmup), min(args.warmup, 8))
+        test.samples.clear()
+
+    started = time.perf_counter()
+    if args.qps:
+        await test.open_loop(records, args.qps, args.max_in_flight)
+    else:
+        await test.closed_loop(records, args.concurrency)
+    seconds = time.perf_counter() - started
+    await provider.aclose()
+
+    report = test.report(
+        seconds,
+        settings={
+            "agent": args.agent,
+            "corpus": args.corpus,
+            "mode": "open_loop" if args.qps else "closed_loop",
+            "qps": args.qps,
+            "concurrency": None if args.qps else args.concurrency,
+            "streamed": args.streamed,
+            "model": args.model,
+            "model_settings": model_settings,
+            "mock": provider.USE_MOCK,
+            "commit": _git_commit(),
+        },
+    )
+    Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    print(json.dumps(report, indent=2, sort_keys=True))
+    if args.compare:
+        print("\n".join(compare(json.loads(Path(args.compare).read_text()), report)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,37 +11,28 @@ from agents import (  # type: ignore
     TResponseInputItem,
     ModelSettings,
     function_tool,
-    enable_verbose_stdout_logging
 )
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv
-import os
+from provider import get_client, get_model
+from queued_logging import enable_queued_logging, queued_logging_stats
+from guardrail_cache import run_guardrail_agent
+from preclassifier import PreClassifier, fast_path_guardrail
+from speculative import run_speculative, speculation_stats
+from hedge import HedgedModel
+from coalesce import NO_COALESCE_HEADER
 from pydantic import BaseModel  # type: ignore
 import asyncio
 import  rich
 
-load_dotenv()
-
-# openai = os.getenv("OPENAI_API_KEY")
-key = os.getenv("api_key")
-if not key:
-    raise ValueError("API key is not set in the environment variables.")
 
 print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>.")
-enable_verbose_stdout_logging()
+# verbose logs background thread se likhe jate hain, event loop stdout par nahi rukta
+enable_queued_logging()
 print(">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>.")
 
 
-Externl_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=Externl_client,
-
-
-)
+Externl_client: AsyncOpenAI = get_client()
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config: RunConfig = RunConfig(
     model=model,
@@ -49,6 +40,20 @@ config: RunConfig = RunConfig(
         tracing_disabled=True
 )
 
+# TeacherAgent latency-critical hai: primary slow ho to duplicate request doosre model /
+# provider ko (yahan same model, alag uncoalesced request), jo pehle aaye wo jeet-ta hai
+teacher_model = HedgedModel(
+    model,
+    get_model("gemini-2.0-flash", **{NO_COALESCE_HEADER: "1"}),
+    percentile=95,
+    max_hedge_ratio=0.1,
+)
+teacher_config: RunConfig = RunConfig(
+    model=teacher_model,
+      model_provider=Externl_client,
+        tracing_disabled=True
+)
+
 
 class IsTeacherQuery(BaseModel):
     is_teacher_query: bool
@@ -85,21 +90,32 @@ Only approve the query if it clearly relates to a teacher's academic role.
 )
 
 
+# TeacherQueryGuardrail ki instructions wale keywords, sirf ambiguous queries LLM tak jati hain
+teacher_classifier = PreClassifier(
+    name="teacher",
+    allow_keywords=["python", "javascript", "typescript", "next.js", "coding", "code", "programming", "debug", "debugging", "syntax", "algorithm", "data structure", "lecture", "quiz", "assignment", "project", "concept"],
+    deny_keywords=["class timing", "slot", "early leave", "leave", "schedule", "exam schedule", "mark sheet", "marksheet", "grade appeal", "enrollment", "registration"],
+)
+
+
 @input_guardrail
 async def is_teacher_query_guardrail(
     ctx: RunContextWrapper[None], agent: Agent, input: TResponseInputItem
 ) -> GuardrailFunctionOutput:
-    result = await Runner.run(
-        starting_agent=TeacherQueryGuardrail,
-        input=input,
-        context=ctx.context,
-        run_config=config,
-    )
+    async def ask_guardrail_agent() -> GuardrailFunctionOutput:
+        final_output = await run_guardrail_agent(
+            TeacherQueryGuardrail,
+            input,
+            context=ctx.context,
+            run_config=config,
+        )
 
-    return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=not result.final_output.is_teacher_query,
-    )
+        return GuardrailFunctionOutput(
+            output_info=final_output,
+            tripwire_triggered=not final_output.is_teacher_query,
+        )
+
+    return await fast_path_guardrail(teacher_classifier, input, ask_guardrail_agent)
 
 @function_tool
 def is_additional_query(num1 , num2):
@@ -124,7 +140,7 @@ You are a programming teacher.
 
 if query is math addition related then use is_additional_query function to add two numbers
 """,
-    model=model,
+    model=teacher_model,
     tools=[is_additional_query],
     input_guardrails=[is_teacher_query_guardrail],
       model_settings=ModelSettings(
@@ -143,10 +159,11 @@ if query is math addition related then use is_additional_query function to add t
 
 async def main():
     try:
-        result = await Runner.run(
+        # guardrail aur TeacherAgent ka pehla model call saath saath chalte hain
+        result = await run_speculative(
             TeacherAgent,
             "What is the difference between JavaScript and TypeScript?",
-            run_config=config,
+            run_config=teacher_config,
         )
         print("✅ Result:", result.final_output)
         print("-" * 50)
@@ -156,6 +173,10 @@ async def main():
         print("Your Query is not related to a teacher's responsibility.")
         print("❌ Guardrail triggered!", e)
 
+    rich.print("Speculation stats:", speculation_stats.as_dict())
+    rich.print("Hedge stats:", teacher_model.stats.as_dict())
+    rich.print("Logging stats:", queued_logging_stats())
+
 
 if __name__ == "__main__":
     asyncio.run(main())
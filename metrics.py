@@ -0,0 +1,335 @@
+from agents import Agent, AgentHooks, RunHooks, RunContextWrapper, Tool  # type: ignore
+from bisect import bisect_left
+from typing import Any
+import json
+import os
+import threading
+import time
+
+# In-memory metrics for agent runs.
+# Hooks mein print (khaas kar on_llm_start par poori input list) har callback par sync stdout
+# write karta hai. Ye hooks sirf memory mein counters / histograms update karte hain (koi I/O
+# nahi, run loop kabhi block nahi hota). Export alag se hota hai:
+#
+#   default_metrics.to_prometheus()                     # Prometheus text format
+#   default_metrics.write_prometheus("metrics.prom")    # node_exporter textfile collector
+#   JsonlExporter(default_metrics, "metrics.jsonl").start()  # background thread, rolling file
+#
+# AGENTS_PRINT_HOOKS=1 ho to demos purane print wale hooks use karte hain.
+
+PRINT_HOOKS = os.getenv("AGENTS_PRINT_HOOKS", "0") == "1"
+
+# LLM latency, llm_calls_total, tokens_total aur run_turns on_llm_start / on_llm_end se aate hain
+# (openai-agents 0.2.9 se). Purane SDK par ye hooks kabhi nahi chalte aur metrics chupchap
+# adhoore rehte, is liye yahin ruk jao.
+if not (hasattr(RunHooks, "on_llm_end") and hasattr(AgentHooks, "on_llm_end")):
+    raise ImportError("metrics.py needs openai-agents>=0.2.9 (on_llm_start / on_llm_end hooks are missing).")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TURN_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30)
+
+# run / call start times jo kabhi khatam na hui (error, cancel) unki had
+_MAX_PENDING = 10_000
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style) with count and sum."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # aakhri = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile ``q`` (bucket resolution only)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Named counters and histograms, each keyed by a label set."""
+
+    def __init__(self, prefix: str = "agents"):
+        self.prefix = prefix
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, tuple[tuple[float, ...], dict[Labels, Histogram]]] = {}
+        self._help: dict[str, str] = {}
+        self._lock = threading.Lock()  # exporter thread snapshot leta hai
+
+    def counter(self, name: str, help: str) -> None:
+        self._help[name] = help
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...]) -> None:
+        self._help[name] = help
+        self._histograms.setdefault(name, (buckets, {}))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = _labels(**labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _labels(**labels)
+        with self._lock:
+            buckets, series = self._histograms[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Plain-dict view: counters as values, histograms as count/sum/p50/p95/p99."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(k), **h.as_dict()} for k, h in series.items()]
+                    for name, (_, series) in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in self._counters.items():
+                full = f"{self.prefix}_{name}"
+                lines += [f"# HELP {full} {self._help[name]}", f"# TYPE {full} counter"]
+                lines += [f"{full}{_format_labels(k)} {v:.15g}" for k, v in series.items()]
+            for name, (buckets, series) in self._histograms.items():
+                full = f"{self.prefix}_{name}"
+                lines += [f"# HELP {full} {self._help[name]}", f"# TYPE {full} histogram"]
+                for key, hist in series.items():
+                    cumulative = 0
+                    for bound, n in zip(buckets + (float("inf"),), hist.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{full}_bucket{_format_labels(key, (('le', le),))} {cumulative}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {hist.sum:.15g}")
+                    lines.append(f"{full}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the text exposition (for a textfile collector)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+def _register_defaults(registry: MetricsRegistry) -> MetricsRegistry:
+    registry.histogram("llm_latency_seconds", "Model call latency per agent.", LATENCY_BUCKETS)
+    registry.histogram("tool_latency_seconds", "Function tool latency per tool.", LATENCY_BUCKETS)
+    registry.histogram("run_turns", "Model calls (turns) per run.", TURN_BUCKETS)
+    registry.counter("llm_calls_total", "Model calls per agent.")
+    registry.counter("tokens_total", "Tokens per agent and direction (input/output).")
+    registry.counter("tool_calls_total", "Tool calls per tool.")
+    registry.counter("handoffs_total", "Handoffs per source and target agent.")
+    registry.counter("runs_total", "Runs that produced a final output, per final agent.")
+    return registry
+
+
+default_metrics = _register_defaults(MetricsRegistry())
+
+
+class _Recorder:
+    """Shared bookkeeping behind ``MetricsHooks`` and ``MetricsAgentHooks``."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._started: dict[tuple[int, str], float] = {}
+        self._turns: dict[int, int] = {}
+
+    def _start(self, key: tuple[int, str]) -> None:
+        if len(self._started) >= _MAX_PENDING:
+            self._started.pop(next(iter(self._started)))
+        self._started[key] = time.perf_counter()
+
+    def _elapsed(self, key: tuple[int, str]) -> float | None:
+        started = self._started.pop(key, None)
+        return None if started is None else time.perf_counter() - started
+
+    def llm_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self._start((id(context), agent.name))
+        if len(self._turns) >= _MAX_PENDING:
+            self._turns.pop(next(iter(self._turns)))
+        self._turns[id(context)] = self._turns.get(id(context), 0) + 1
+
+    def llm_end(self, context: RunContextWrapper, agent: Agent, response: Any) -> None:
+        elapsed = self._elapsed((id(context), agent.name))
+        if elapsed is not None:
+            self.registry.observe("llm_latency_seconds", elapsed, agent=agent.name)
+        self.registry.inc("llm_calls_total", agent=agent.name)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.registry.inc("tokens_total", usage.input_tokens, agent=agent.name, direction="input")
+            self.registry.inc("tokens_total", usage.output_tokens, agent=agent.name, direction="output")
+
+    def tool_start(self, context: RunContextWrapper, tool: Tool) -> None:
+        # har tool call ka apna ToolContext hota hai, is liye id(context) call ko pehchanta hai
+        self._start((id(context), tool.name))
+
+    def tool_end(self, context: RunContextWrapper, tool: Tool) -> None:
+        elapsed = self._elapsed((id(context), tool.name))
+        if elapsed is not None:
+            self.registry.observe("tool_latency_seconds", elapsed, tool=tool.name)
+        self.registry.inc("tool_calls_total", tool=tool.name)
+
+    def handoff(self, from_agent: Agent, to_agent: Agent) -> None:
+        self.registry.inc("handoffs_total", source=from_agent.name, target=to_agent.name)
+
+    def run_end(self, context: RunContextWrapper, agent: Agent) -> None:
+        turns = self._turns.pop(id(context), None)
+        if turns is not None:
+            self.registry.observe("run_turns", turns, agent=agent.name)
+        self.registry.inc("runs_total", agent=agent.name)
+
+
+class MetricsHooks(RunHooks):
+    """Run-level hooks that only update in-memory metrics (pass as ``hooks=`` to ``Runner.run``)."""
+
+    def __init__(self, registry: MetricsRegistry = default_metrics):
+        self.recorder = _Recorder(registry)
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self.recorder.llm_start(context, agent)
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        self.recorder.llm_end(context, agent, response)
+
+    async def on_agent_end(self, context, agent, output) -> None:
+        self.recorder.run_end(context, agent)
+
+    async def on_handoff(self, context, from_agent, to_agent) -> None:
+        self.recorder.handoff(from_agent, to_agent)
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self.recorder.tool_start(context, tool)
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        self.recorder.tool_end(context, tool)
+
+
+class MetricsAgentHooks(AgentHooks):
+    """Per-agent hooks (``Agent(hooks=...)``) recording the same metrics as ``MetricsHooks``."""
+
+    def __init__(self, registry: MetricsRegistry = default_metrics):
+        self.recorder = _Recorder(registry)
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self.recorder.llm_start(context, agent)
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        self.recorder.llm_end(context, agent, response)
+
+    async def on_end(self, context, agent, output) -> None:
+        self.recorder.run_end(context, agent)
+
+    async def on_handoff(self, context, agent, source) -> None:
+        # SDK ye source agent ke hooks par chalata hai: agent = naya agent, source = purana
+        self.recorder.handoff(source, agent)
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self.recorder.tool_start(context, tool)
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        self.recorder.tool_end(context, tool)
+
+
+class JsonlExporter:
+    """Appends a registry snapshot to a JSONL file every ``interval`` seconds from a daemon thread.
+
+    The file rolls over to ``path.1`` .. ``path.<backups>`` once it exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = default_metrics,
+        path: str = "metrics.jsonl",
+        interval: float = 10.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+    ):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "JsonlExporter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="metrics-jsonl", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread and write one final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.export()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def export(self) -> None:
+        line = json.dumps({"ts": time.time(), **self.registry.snapshot()})
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
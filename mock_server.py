@@ -0,0 +1,389 @@
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import httpx  # type: ignore
+
+# Deterministic local stand-in for the OpenAI-compatible chat-completions endpoint.
+# Benchmarking / perf kaam offline ho sake: scripted responses aur tool calls, latency
+# distributions, token-rate streaming, aur 429 / 500 errors inject karna.
+#
+# Do tarike:
+#   1. In-process: AGENTS_MOCK=1 python agent_hooks.py   (provider.py MockTransport use karta hai)
+#   2. Localhost:  python mock_server.py --port 8765
+#                  AGENTS_BASE_URL=http://127.0.0.1:8765/v1/ python handoffs.py
+#
+# Script file (AGENTS_MOCK_SCRIPT / --script) JSON list of rules, pehla match jeet-ta hai:
+#   [{"match": "recipe", "text": "Here is a recipe..."},
+#    {"match": "book", "tool": "book_flight", "arguments": {...}}]
+
+
+@dataclass
+class Latency:
+    """Latency distribution in seconds: fixed, uniform(low, high) or lognormal(median, sigma)."""
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        # "fixed:0.2", "uniform:0.1,0.5", "lognormal:0.3,0.6"
+        kind, _, params = spec.partition(":")
+        values = [float(v) for v in params.split(",") if v] or [0.0]
+        return cls(kind, values[0], values[1] if len(values) > 1 else 0.0)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(0, self.b) * self.a if self.a else 0.0
+        return self.a
+
+
+@dataclass
+class MockConfig:
+    latency: Latency = field(default_factory=Latency)  # time to first token / full response
+    tokens_per_second: float = 0.0  # 0 = stream sab ek saath
+    error_429_rate: float = 0.0
+    error_500_rate: float = 0.0
+    seed: int = 0
+    rules: list[dict[str, Any]] = field(default_factory=list)
+    auto_tools: bool = True  # tool ka naam user text mein ho to us tool ko call karo
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        rules = []
+        script = os.getenv("AGENTS_MOCK_SCRIPT")
+        if script:
+            with open(script, encoding="utf-8") as f:
+                rules = json.load(f)
+        return cls(
+            latency=Latency.parse(os.getenv("AGENTS_MOCK_LATENCY", "fixed:0")),
+            tokens_per_second=float(os.getenv("AGENTS_MOCK_TPS", "0")),
+            error_429_rate=float(os.getenv("AGENTS_MOCK_ERROR_429", "0")),
+            error_500_rate=float(os.getenv("AGENTS_MOCK_ERROR_500", "0")),
+            seed=int(os.getenv("AGENTS_MOCK_SEED", "0")),
+            rules=rules,
+        )
+
+
+_GENERIC_NAME_PARTS = {"transfer", "to", "agent", "tool", "get", "check", "is", "the"}
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def sample_from_schema(schema: dict[str, Any], defs: dict[str, Any] | None = None) -> Any:
+    """Deterministic instance of a JSON schema (used for tool arguments and structured output)."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {
+            name: sample_from_schema(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {}), defs)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "mock"
+
+
+class MockChatCompletions:
+    """Builds chat-completions responses for a request body."""
+
+    def __init__(self, config: MockConfig | None = None):
+        self.config = config or MockConfig.from_env()
+        self.rng = random.Random(self.config.seed)
+        self.requests = 0
+        self._ids = 0
+
+    def _next_id(self, prefix: str) -> str:
+        self._ids += 1
+        return f"{prefix}-mock-{self._ids}"
+
+    # ---- decide what to answer ----
+
+    @staticmethod
+    def _text_of(message: dict[str, Any]) -> str:
+        content = message.get("content")
+        if isinstance(content, list):
+            return " ".join(c.get("text", "") for c in content if isinstance(c, dict))
+        return content or ""
+
+    @staticmethod
+    def _is_handoff_result(messages: list[dict[str, Any]], tool_message: dict[str, Any]) -> bool:
+        """True when the tool message answers a ``transfer_to_*`` call (new agent should act)."""
+        for m in reversed(messages):
+            for call in m.get("tool_calls") or []:
+                if call.get("id") == tool_message.get("tool_call_id"):
+                    return call["function"]["name"].startswith("transfer_to_")
+        return False
+
+    @staticmethod
+    def _mentions(name: str, words: set[str]) -> bool:
+        parts = [p for p in name.lower().split("_") if p not in _GENERIC_NAME_PARTS]
+        return bool(parts) and all(
+            any(p == w or (len(w) >= 4 and (w in p or p in w)) for w in words) for p in parts
+        )
+
+    def _plan(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Returns {"text": ...} or {"tool_calls": [(name, arguments), ...]}."""
+        messages = body.get("messages", [])
+        last = messages[-1] if messages else {}
+        user_text = next(
+            (self._text_of(m) for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        tools = {
+            t["function"]["name"]: t["function"] for t in body.get("tools") or []
+            if t.get("type") == "function"
+        }
+
+        if last.get("role") == "tool" and not self._is_handoff_result(messages, last):
+            # tool ka result aa gaya: usi ko jawab bana do
+            return {"text": f"Mock response: {self._text_of(last)}"}
+
+        for rule in self.config.rules:
+            if rule.get("model") and rule["model"] != body.get("model"):
+                continue
+            if not re.search(rule.get("match", ""), user_text, re.IGNORECASE):
+                continue
+            if rule.get("tool") in tools:
+                args = rule.get("arguments") or sample_from_schema(tools[rule["tool"]].get("parameters", {}))
+                return {"tool_calls": [(rule["tool"], args)]}
+            if "text" in rule:
+                return {"text": rule["text"]}
+
+        if self.config.auto_tools and tools:
+            words = set(re.findall(r"\w+", user_text.lower()))
+            for name, fn in tools.items():
+                if self._mentions(name, words):
+                    return {"tool_calls": [(name, sample_from_schema(fn.get("parameters", {})))]}
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"].get("schema", {})
+            return {"text": json.dumps(sample_from_schema(schema))}
+        return {"text": f"Mock answer to: {user_text[:200]}"}
+
+    def _error(self) -> int | None:
+        roll = self.rng.random()
+        if roll < self.config.error_429_rate:
+            return 429
+        if roll < self.config.error_429_rate + self.config.error_500_rate:
+            return 500
+        return None
+
+    # ---- response bodies ----
+
+    def _usage(self, body: dict[str, Any], completion: str) -> dict[str, int]:
+        prompt_tokens = count_tokens(json.dumps(body.get("messages", [])))
+        completion_tokens = count_tokens(completion)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _completion(self, body: dict[str, Any], plan: dict[str, Any]) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": plan.get("text")}
+        finish_reason = "stop"
+        if "tool_calls" in plan:
+            finish_reason = "tool_calls"
+            message["tool_calls"] = [
+                {
+                    "id": self._next_id("call"),
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(args)},
+                }
+                for name, args in plan["tool_calls"]
+            ]
+        return {
+            "id": self._next_id("chatcmpl"),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": self._usage(body, json.dumps(message)),
+        }
+
+    async def _chunks(self, body: dict[str, Any], plan: dict[str, Any]) -> AsyncIterator[bytes]:
+        cmpl_id = self._next_id("chatcmpl")
+        base = {
+            "id": cmpl_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+        }
+
+        def event(delta: dict[str, Any], finish_reason: str | None = None, **extra) -> bytes:
+            chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra}
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0.0
+        yield event({"role": "assistant", "content": ""})
+        if "tool_calls" in plan:
+            for i, (name, args) in enumerate(plan["tool_calls"]):
+                yield event({"tool_calls": [{
+                    "index": i, "id": self._next_id("call"), "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(args)},
+                }]})
+            finish_reason = "tool_calls"
+            completion = json.dumps(plan["tool_calls"])
+        else:
+            completion = plan["text"]
+            # ~4 characters = 1 token
+            for i in range(0, len(completion), 4):
+                if delay:
+                    await asyncio.sleep(delay)
+                yield event({"content": completion[i : i + 4]})
+            finish_reason = "stop"
+        yield event({}, finish_reason)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage_chunk = {**base, "choices": [], "usage": self._usage(body, completion)}
+            yield f"data: {json.dumps(usage_chunk)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    async def handle(self, path: str, body: dict[str, Any]) -> tuple[int, dict[str, str], Any]:
+        """Returns (status, headers, content) where content is bytes or an async byte iterator."""
+        self.requests += 1
+        json_headers = {"content-type": "application/json"}
+        if not path.rstrip("/").endswith("chat/completions"):
+            if path.rstrip("/").endswith("models"):
+                return 200, json_headers, json.dumps({"object": "list", "data": [{"id": "mock", "object": "model"}]}).encode()
+            return 404, json_headers, b'{"error": {"message": "not found"}}'
+
+        await asyncio.sleep(self.config.latency.sample(self.rng))
+        status = self._error()
+        if status is not None:
+            error = {"error": {"message": f"mock injected {status}", "code": status}}
+            headers = {**json_headers, "retry-after": "0"} if status == 429 else json_headers
+            return status, headers, json.dumps(error).encode()
+
+        plan = self._plan(body)
+        if body.get("stream"):
+            return 200, {"content-type": "text/event-stream"}, self._chunks(body, plan)
+        return 200, json_headers, json.dumps(self._completion(body, plan)).encode()
+
+
+class MockTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering from ``MockChatCompletions``; no sockets involved."""
+
+    def __init__(self, server: MockChatCompletions | None = None):
+        self.server = server or MockChatCompletions()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        raw = await request.aread()
+        body = json.loads(raw) if raw else {}
+        status, headers, content = await self.server.handle(request.url.path, body)
+        if isinstance(content, bytes):
+            return httpx.Response(status, headers=headers, content=content, request=request)
+        return httpx.Response(status, headers=headers, stream=_AsyncStream(content), request=request)
+
+
+class _AsyncStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks:
+            yield chunk
+
+
+# ---- localhost HTTP server (keep-alive, chunked streaming) ----
+
+
+async def _serve_connection(server: MockChatCompletions, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode().split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            raw = await reader.readexactly(int(headers.get("content-length", "0")))
+            body = json.loads(raw) if raw else {}
+            status, out_headers, content = await server.handle(path.split("?")[0], body)
+
+            head = f"HTTP/1.1 {status} {'OK' if status == 200 else 'ERROR'}\r\n"
+            for name, value in out_headers.items():
+                head += f"{name}: {value}\r\n"
+            if isinstance(content, bytes):
+                head += f"content-length: {len(content)}\r\n\r\n"
+                writer.write(head.encode() + content)
+            else:
+                writer.write((head + "transfer-encoding: chunked\r\n\r\n").encode())
+                async for chunk in content:
+                    writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    await writer.drain()
+                writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, config: MockConfig | None = None) -> None:
+    server = MockChatCompletions(config)
+    tcp = await asyncio.start_server(lambda r, w: _serve_connection(server, r, w), host, port)
+    print(f"Mock chat-completions server on http://{host}:{port}/v1/")
+    async with tcp:
+        await tcp.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock model server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON rules file")
+    parser.add_argument("--latency", default=None, help='e.g. "fixed:0.2", "uniform:0.1,0.5", "lognormal:0.3,0.6"')
+    parser.add_argument("--tps", type=float, default=None, help="streaming tokens per second")
+    parser.add_argument("--error-429", type=float, default=None)
+    parser.add_argument("--error-500", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockConfig.from_env()
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            config.rules = json.load(f)
+    if args.latency:
+        config.latency = Latency.parse(args.latency)
+    if args.tps is not None:
+        config.tokens_per_second = args.tps
+    if args.error_429 is not None:
+        config.error_429_rate = args.error_429
+    if args.error_500 is not None:
+        config.error_500_rate = args.error_500
+    if args.seed is not None:
+        config.seed = args.seed
+    asyncio.run(serve(args.host, args.port, config))
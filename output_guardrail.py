@@ -1,28 +1,20 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool, AgentHooks, output_guardrail, GuardrailFunctionOutput, OutputGuardrailTripwireTriggered  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_executor import run_in_executor
+from preclassifier import PreClassifier
+from streaming_guardrail import StreamingOutputGuardrail, stream_with_guardrail, streaming_guardrail_stats
+from openai.types.responses import ResponseTextDeltaEvent  # type: ignore
 import rich
 from pydantic import BaseModel  # type: ignore
 from typing import List, Any
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -69,6 +61,19 @@ async def outputguardrail(
     )
 
 
+# streaming mode: flight words partial output mein aate hi local check trip kar deta hai,
+# baqi output har 400 characters par outputguardrail (LLM) se check hota hai
+streaming_output_guard = StreamingOutputGuardrail(
+    local_classifier=PreClassifier(
+        name="flight_output",
+        deny_keywords=["flight", "flights", "airline", "boarding pass", "seat class", "booked flight"],
+    ),
+    llm_guardrail=outputguardrail,
+    wrap_output=lambda text: MessageOutput(response=text),
+    window_chars=400,
+)
+
+
 class FlightBook(BaseModel):
     name: List[str]
     from_location: str
@@ -79,6 +84,7 @@ class FlightBook(BaseModel):
 
 
 @function_tool()
+@run_in_executor("thread", max_concurrency=8)
 def book_flight(flight: FlightBook):
     """Book a flight"""
     passenger_names = ", ".join(flight.name)
@@ -92,6 +98,7 @@ class SeatChange(BaseModel):
 
 
 @function_tool
+@run_in_executor("thread", max_concurrency=8)
 def change_seat_class(change: SeatChange):
     """Change seat class"""
     if change.current_class == change.new_class:
@@ -132,7 +139,22 @@ async def main():
         print("agent output is not related to flights.", e)
 
 
+async def main_streamed():
+    result = Runner.run_streamed(agent, "what is answer 2 + 2 = ?", run_config=config)
+    try:
+        async for event in stream_with_guardrail(result, streaming_output_guard):
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                print(event.data.delta, end="", flush=True)
+        print()
+    except OutputGuardrailTripwireTriggered as e:
+        print("\nagent output is not related to flights. (stream aborted early)", e)
+
+    rich.print(streaming_guardrail_stats.as_dict())
+
+
 if __name__ == "__main__":
     import asyncio
+    import sys
 
-    asyncio.run(main())
+    # python output_guardrail.py --stream  -> streaming guardrail wala run
+    asyncio.run(main_streamed() if "--stream" in sys.argv[1:] else main())
@@ -1,27 +1,17 @@
 from agents import Agent , Runner , AsyncOpenAI , OpenAIChatCompletionsModel , enable_verbose_stdout_logging , function_tool  # type: ignore
 from agents.run import RunConfig  # type: ignore 
-from dotenv import load_dotenv # type: ignore
+from provider import get_client, get_model
+from queued_logging import enable_queued_logging
 from agents import TResponseInputItem  # Add this import if TResponseInputItem is defined in agents.types
-import os
 import rich
 from openai.types.responses import ResponseTextDeltaEvent
-enable_verbose_stdout_logging()
+# verbose logs background thread se likhe jate hain, event loop stdout par nahi rukta
+enable_queued_logging()
 
-load_dotenv()
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
+External_client:AsyncOpenAI = get_client()
 
-External_client:AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model :OpenAIChatCompletionsModel= OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model :OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
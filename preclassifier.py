@@ -0,0 +1,159 @@
+from agents import GuardrailFunctionOutput  # type: ignore
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Literal
+import math
+import re
+import zlib
+
+# Local fast-path pre-classifier.
+# Simple allow/deny faislay (keyword, regex, hashed n-gram score) yahin ho jate hain,
+# guardrail agent (LLM) sirf tab chalta hai jab score beech mein ho yaani ambiguous.
+
+Decision = Literal["allow", "deny"]
+
+
+@dataclass
+class FastPathVerdict:
+    """output_info returned when the pre-classifier decided without the LLM."""
+
+    classifier: str
+    decision: Decision
+    score: float
+    reason: str
+
+
+def input_text(input: Any) -> str:
+    """Flatten a guardrail input (str or list of input items) into plain text."""
+    if isinstance(input, str):
+        return input
+    parts = []
+    for item in input:
+        content = item.get("content") if isinstance(item, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(c.get("text", "") for c in content if isinstance(c, dict))
+    return "\n".join(parts)
+
+
+def _ngrams(text: str, n: int) -> list[str]:
+    text = " " + re.sub(r"\s+", " ", text.lower()).strip() + " "
+    return [text[i : i + n] for i in range(max(1, len(text) - n + 1))]
+
+
+@dataclass
+class PreClassifier:
+    """Scores text towards allow (1.0) or deny (0.0).
+
+    Keyword / regex hits and the hashed character n-gram model all add to one logit,
+    which is squashed to 0..1. At or above ``allow_threshold`` the input is allowed,
+    at or below ``deny_threshold`` it is denied, anything in between falls back to the agent.
+    When allow and deny keywords / patterns both match, the input also falls back. The
+    default ``allow_threshold`` needs at least two allow signals; a single hit never skips the agent.
+    """
+
+    name: str
+    allow_keywords: list[str] = field(default_factory=list)
+    deny_keywords: list[str] = field(default_factory=list)
+    allow_patterns: list[str] = field(default_factory=list)
+    deny_patterns: list[str] = field(default_factory=list)
+    # ek keyword sigmoid(2) ~ 0.88, ek pattern ~ 0.95: akela signal kabhi allow nahi karta,
+    # kam az kam do (jaise do keywords ~ 0.98) chahiye. "flight" likh dena guardrail skip na kare
+    allow_threshold: float = 0.97
+    deny_threshold: float = 0.15
+    keyword_weight: float = 2.0
+    pattern_weight: float = 3.0
+    ngram_weight: float = 1.0
+    ngram_size: int = 3
+    buckets: int = 4096
+    counters: dict[str, int] = field(
+        default_factory=lambda: {"fast_allow": 0, "fast_deny": 0, "fallback": 0}
+    )
+
+    def __post_init__(self):
+        self._allow_kw = [re.compile(rf"\b{re.escape(k.lower())}\b") for k in self.allow_keywords]
+        self._deny_kw = [re.compile(rf"\b{re.escape(k.lower())}\b") for k in self.deny_keywords]
+        self._allow_re = [re.compile(p, re.IGNORECASE) for p in self.allow_patterns]
+        self._deny_re = [re.compile(p, re.IGNORECASE) for p in self.deny_patterns]
+        self._ngram_weights: list[float] | None = None
+
+    def _bucket(self, gram: str) -> int:
+        return zlib.crc32(gram.encode()) % self.buckets
+
+    def fit(self, examples: list[tuple[str, bool]]) -> "PreClassifier":
+        """Learn per-bucket log-odds from ``(text, allowed)`` examples."""
+        allow = [1.0] * self.buckets  # Laplace smoothing
+        deny = [1.0] * self.buckets
+        for text, allowed in examples:
+            target = allow if allowed else deny
+            for gram in _ngrams(text, self.ngram_size):
+                target[self._bucket(gram)] += 1
+        allow_total, deny_total = sum(allow), sum(deny)
+        self._ngram_weights = [
+            math.log((a / allow_total) / (d / deny_total)) for a, d in zip(allow, deny)
+        ]
+        return self
+
+    def _hits(self, text: str) -> tuple[float, float]:
+        """Weighted (allow, deny) keyword / pattern hits."""
+        lowered = text.lower()
+        allow = self.keyword_weight * sum(1 for k in self._allow_kw if k.search(lowered))
+        deny = self.keyword_weight * sum(1 for k in self._deny_kw if k.search(lowered))
+        allow += self.pattern_weight * sum(1 for p in self._allow_re if p.search(text))
+        deny += self.pattern_weight * sum(1 for p in self._deny_re if p.search(text))
+        return allow, deny
+
+    def score(self, text: str) -> float:
+        return self._score(text, *self._hits(text))
+
+    def _score(self, text: str, allow: float, deny: float) -> float:
+        logit = allow - deny
+        if self._ngram_weights is not None:
+            grams = _ngrams(text, self.ngram_size)
+            logit += self.ngram_weight * sum(
+                self._ngram_weights[self._bucket(g)] for g in grams
+            ) / len(grams)
+        logit = max(-50.0, min(50.0, logit))
+        return 1 / (1 + math.exp(-logit))
+
+    def decide(self, text: str) -> tuple[Decision | None, float]:
+        allow, deny = self._hits(text)
+        score = self._score(text, allow, deny)
+        if allow and deny:
+            # "leave early from Python lecture": dono taraf ke signals hain, hits ginna faisla
+            # nahi; guardrail agent decide kare
+            self.counters["fallback"] += 1
+            return None, score
+        if score >= self.allow_threshold:
+            self.counters["fast_allow"] += 1
+            return "allow", score
+        if score <= self.deny_threshold:
+            self.counters["fast_deny"] += 1
+            return "deny", score
+        self.counters["fallback"] += 1
+        return None, score
+
+    def get_stats(self) -> dict[str, Any]:
+        total = sum(self.counters.values())
+        fast = self.counters["fast_allow"] + self.counters["fast_deny"]
+        return {**self.counters, "fast_path_ratio": round(fast / total, 4) if total else 0.0}
+
+
+async def fast_path_guardrail(
+    classifier: PreClassifier,
+    input: Any,
+    fallback: Callable[[], Awaitable[GuardrailFunctionOutput]],
+) -> GuardrailFunctionOutput:
+    """Return a verdict right away when the classifier is confident, else await ``fallback``."""
+    decision, score = classifier.decide(input_text(input))
+    if decision is None:
+        return await fallback()
+    return GuardrailFunctionOutput(
+        output_info=FastPathVerdict(
+            classifier=classifier.name,
+            decision=decision,
+            score=round(score, 4),
+            reason=f"decided locally by {classifier.name} pre-classifier",
+        ),
+        tripwire_triggered=decision == "deny",
+    )
@@ -0,0 +1,311 @@
+from agents import Agent, RunResult, RunResultStreaming  # type: ignore
+from agents.run import AgentRunner, set_default_agent_runner  # type: ignore
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import uuid
+
+# Per-run profiling.
+# Sync tools (book_flight) aur print wale hooks event loop ko chupke se rok dete hain. Profiling
+# on ho to har (sampled) run ke gird teen collectors chalte hain:
+#   cpu    -> cProfile (.prof file + top functions)
+#   memory -> run se pehle / baad tracemalloc snapshot ka diff
+#   lag    -> loop har `interval` par jagta hai; der se jage to blocked interval record hota hai,
+#             aur ek watchdog thread usi waqt loop thread ka stack utha leta hai (kahan ruka tha)
+# Har run ki report profiles/<time>-<agent>-<id>/ mein likhi jati hai.
+#
+#   AGENTS_PROFILE=cpu,memory,lag (ya 1 = sab)   AGENTS_PROFILE_SAMPLE=0.1   AGENTS_PROFILE_DIR=profiles
+#
+# provider.py AGENTS_PROFILE dekh kar install_profiling() chalata hai, jisse har Runner.run /
+# run_streamed / run_sync profile hota hai. Ek block ke liye: async with profile_run("name"): ...
+
+COLLECTORS = ("cpu", "memory", "lag")
+
+
+@dataclass
+class ProfileSettings:
+    collectors: tuple[str, ...] = COLLECTORS
+    sample_rate: float = 1.0
+    output_dir: str = "profiles"
+    lag_interval: float = 0.01
+    lag_threshold: float = 0.05  # is se zyada der loop ruka to "blocked"
+    top: int = 25
+
+    @classmethod
+    def from_env(cls) -> "ProfileSettings":
+        raw = os.getenv("AGENTS_PROFILE", "")
+        collectors = COLLECTORS if raw.lower() in ("1", "true", "yes", "all") else tuple(
+            c.strip() for c in raw.split(",") if c.strip() in COLLECTORS
+        )
+        return cls(
+            collectors=collectors,
+            sample_rate=float(os.getenv("AGENTS_PROFILE_SAMPLE", "1.0")),
+            output_dir=os.getenv("AGENTS_PROFILE_DIR", "profiles"),
+            lag_interval=float(os.getenv("AGENTS_PROFILE_LAG_INTERVAL", "0.01")),
+            lag_threshold=float(os.getenv("AGENTS_PROFILE_LAG_THRESHOLD", "0.05")),
+        )
+
+
+profile_settings = ProfileSettings.from_env()
+
+# nested runs (agent-as-tool, guardrail agents) bahar wale run ki profile mein hi aa jate hain
+_active: ContextVar[bool] = ContextVar("_profiling_active", default=False)
+# cProfile ek waqt mein ek hi chal sakta hai
+_cpu_lock = threading.Lock()
+# tracemalloc process-wide hai: concurrent runs mein pehla khatam hone wala use band na kare.
+# Users gine jate hain; 0 -> 1 par start, 1 -> 0 par stop (agar humne hi start kiya tha)
+_memory_lock = threading.Lock()
+_memory_users = 0
+_started_tracemalloc = False
+
+logger = logging.getLogger("openai.agents")
+
+
+def _acquire_tracemalloc() -> None:
+    global _memory_users, _started_tracemalloc
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        _memory_users += 1
+
+
+def _release_tracemalloc() -> None:
+    global _memory_users, _started_tracemalloc
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and _started_tracemalloc:
+            tracemalloc.stop()
+            _started_tracemalloc = False
+
+
+@dataclass
+class BlockedInterval:
+    at_ms: float  # run shuru hone ke baad
+    duration_ms: float
+    stack: list[str] = field(default_factory=list)
+
+
+class LoopLagMonitor:
+    """Records intervals where the event loop could not wake up on time, with the blocking stack."""
+
+    def __init__(self, interval: float = 0.01, threshold: float = 0.05):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocks: list[BlockedInterval] = []
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._heartbeat = time.perf_counter()
+        self._stack: list[str] | None = None
+        self._started = 0.0
+        self._loop_thread = threading.get_ident()
+
+    async def _tick(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            lag = now - before - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.blocks.append(
+                    BlockedInterval(
+                        at_ms=round((before + self.interval - self._started) * 1000, 2),
+                        duration_ms=round(lag * 1000, 2),
+                        stack=self._stack or [],
+                    )
+                )
+            self._stack = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            if self._stack is None and time.perf_counter() - self._heartbeat > self.threshold + self.interval:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._stack = traceback.format_stack(frame)[-12:]
+
+    def start(self) -> None:
+        self._started = self._heartbeat = time.perf_counter()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "blocked_total_ms": round(sum(b.duration_ms for b in self.blocks), 2),
+            "blocks": [b.__dict__ for b in sorted(self.blocks, key=lambda b: -b.duration_ms)],
+        }
+
+
+class RunProfiler:
+    """Collectors for one run; ``start()`` / ``stop()`` must be called on the loop thread."""
+
+    def __init__(self, name: str, settings: ProfileSettings):
+        self.name = name
+        self.settings = settings
+        self.cpu: cProfile.Profile | None = None
+        self.lag: LoopLagMonitor | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._tracing = False
+        self._started = 0.0
+        self.seconds = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        try:
+            if "memory" in self.settings.collectors:
+                _acquire_tracemalloc()
+                self._tracing = True
+                self._snapshot = tracemalloc.take_snapshot()
+            if "cpu" in self.settings.collectors and _cpu_lock.acquire(blocking=False):
+                self.cpu = cProfile.Profile()
+                self.cpu.enable()
+            if "lag" in self.settings.collectors:
+                self.lag = LoopLagMonitor(self.settings.lag_interval, self.settings.lag_threshold)
+                self.lag.start()
+        except Exception:
+            # profiler ki kharabi run ko nahi rokti; jo collector chal chuke wo stop() band karega
+            logger.warning("Profiler start failed for run %r", self.name, exc_info=True)
+
+    def stop(self) -> Path | None:
+        """Stop the collectors and write the report; never raises into the profiled run."""
+        self.seconds = time.perf_counter() - self._started
+        memory = None
+        try:
+            try:
+                if self.cpu is not None:
+                    self.cpu.disable()
+                if self.lag is not None:
+                    self.lag.stop()
+                if self._snapshot is not None:
+                    after = tracemalloc.take_snapshot()
+                    memory = after.compare_to(self._snapshot, "lineno")[: self.settings.top]
+            finally:
+                # shared resources har haal mein wapas, warna agle runs ka profile atak jata hai
+                if self.cpu is not None:
+                    _cpu_lock.release()
+                if self._tracing:
+                    self._tracing = False
+                    _release_tracemalloc()
+            return self._write(memory)
+        except Exception:
+            logger.warning("Profiler teardown failed for run %r", self.name, exc_info=True)
+            return None
+
+    def _write(self, memory: list[tracemalloc.StatisticDiff] | None) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.name)[:40]
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = Path(self.settings.output_dir) / f"{stamp}-{slug}-{uuid.uuid4().hex[:6]}"
+        out.mkdir(parents=True, exist_ok=True)
+        summary: dict[str, Any] = {"name": self.name, "seconds": round(self.seconds, 4)}
+        if self.cpu is not None:
+            self.cpu.dump_stats(out / "cpu.prof")  # snakeviz / pstats se kholo
+            text = io.StringIO()
+            pstats.Stats(self.cpu, stream=text).sort_stats("cumulative").print_stats(self.settings.top)
+            (out / "cpu.txt").write_text(text.getvalue())
+            summary["cpu"] = "cpu.prof"
+        elif "cpu" in self.settings.collectors:
+            summary["cpu"] = "skipped: another run was being profiled"
+        if memory is not None:
+            (out / "memory.txt").write_text("\n".join(str(stat) for stat in memory) + "\n")
+            summary["memory_growth_bytes"] = sum(stat.size_diff for stat in memory)
+        if self.lag is not None:
+            lag = self.lag.report()
+            (out / "lag.json").write_text(json.dumps(lag, indent=2))
+            summary.update(
+                max_loop_lag_ms=lag["max_lag_ms"],
+                blocked_total_ms=lag["blocked_total_ms"],
+                blocked_intervals=len(lag["blocks"]),
+            )
+        (out / "summary.json").write_text(json.dumps(summary, indent=2))
+        return out
+
+
+def _should_profile(settings: ProfileSettings) -> bool:
+    return bool(settings.collectors) and not _active.get() and random.random() < settings.sample_rate
+
+
+@asynccontextmanager
+async def profile_run(
+    name: str, settings: ProfileSettings | None = None
+) -> AsyncIterator[RunProfiler | None]:
+    """Profile the block if sampled; yields the profiler (or None when skipped)."""
+    settings = settings or profile_settings
+    if not _should_profile(settings):
+        yield None
+        return
+    profiler = RunProfiler(name, settings)
+    token = _active.set(True)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active.reset(token)
+
+
+class ProfilingAgentRunner(AgentRunner):
+    """AgentRunner that wraps every run (sampled) in ``profile_run``."""
+
+    def __init__(self, settings: ProfileSettings | None = None):
+        super().__init__()
+        self.settings = settings or profile_settings
+
+    async def run(self, starting_agent: Agent, input: Any, **kwargs: Any) -> RunResult:
+        async with profile_run(starting_agent.name, self.settings):
+            return await super().run(starting_agent, input, **kwargs)
+
+    def run_streamed(self, starting_agent: Agent, input: Any, **kwargs: Any) -> RunResultStreaming:
+        if not _should_profile(self.settings):
+            return super().run_streamed(starting_agent, input, **kwargs)
+        profiler = RunProfiler(starting_agent.name, self.settings)
+        token = _active.set(True)  # run ka background task isi context ki copy leta hai
+        profiler.start()
+        try:
+            result = super().run_streamed(starting_agent, input, **kwargs)
+        except BaseException:
+            profiler.stop()
+            raise
+        finally:
+            _active.reset(token)
+        # streaming run apne task mein chalta hai; wo khatam ho to report
+        result._run_impl_task.add_done_callback(lambda _: profiler.stop())
+        return result
+
+
+def install_profiling(settings: ProfileSettings | None = None) -> ProfilingAgentRunner:
+    """Make ``Runner.run`` / ``run_streamed`` / ``run_sync`` profile every sampled run."""
+    runner = ProfilingAgentRunner(settings)
+    set_default_agent_runner(runner)
+    return runner
@@ -0,0 +1,289 @@
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel  # type: ignore
+from agents.run import RunConfig  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+from dataclasses import dataclass, asdict
+from rate_limit import ReleaseOnCloseStream
+from typing import Any
+import asyncio
+import os
+import httpx  # type: ignore
+
+# Shared model provider.
+# Pehle har script apna AsyncOpenAI client aur OpenAIChatCompletionsModel banata tha,
+# ab sab scripts yahan se ek hi keep-alive connection pool share karte hain.
+
+load_dotenv()
+
+BASE_URL = os.getenv(
+    "AGENTS_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/"
+)
+DEFAULT_MODEL = os.getenv("AGENTS_MODEL", "gemini-2.0-flash")
+
+
+@dataclass
+class PoolSettings:
+    """Tunable limits for the shared HTTP connection pool."""
+
+    max_connections: int = int(os.getenv("AGENTS_POOL_MAX_CONNECTIONS", "100"))
+    max_keepalive_connections: int = int(os.getenv("AGENTS_POOL_MAX_KEEPALIVE", "20"))
+    keepalive_expiry: float = float(os.getenv("AGENTS_POOL_KEEPALIVE_EXPIRY", "60"))
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    warm_connections: int = int(os.getenv("AGENTS_POOL_WARM_CONNECTIONS", "0"))
+
+
+@dataclass
+class PoolMetrics:
+    requests: int = 0
+    responses: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    connections_opened: int = 0  # naya TCP connect
+    tls_handshakes: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served on an already-open connection."""
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1 - self.connections_opened / self.requests)
+
+
+pool_settings = PoolSettings()
+pool_metrics = PoolMetrics()
+
+_http_client: httpx.AsyncClient | None = None
+_base_transport: httpx.AsyncHTTPTransport | None = None
+_clients: dict[tuple, AsyncOpenAI] = {}
+_models: dict[tuple, OpenAIChatCompletionsModel] = {}
+_coalescing = None  # CoalescingTransport, jab USE_COALESCE ho
+limiter = None  # AdaptiveLimiter, jab USE_RATE_LIMIT ho
+
+
+# AGENTS_MOCK=1: koi network nahi, mock_server.py ka in-process transport jawab deta hai
+USE_MOCK = os.getenv("AGENTS_MOCK", "").lower() in ("1", "true", "yes")
+# AGENTS_CASSETTE=path: model calls cassette.py se record / replay hote hain
+CASSETTE_PATH = os.getenv("AGENTS_CASSETTE")
+CASSETTE_MODE = os.getenv("AGENTS_CASSETTE_MODE", "auto")
+CASSETTE_REALTIME = os.getenv("AGENTS_CASSETTE_REALTIME", "").lower() in ("1", "true", "yes")
+# same waqt ki same requests ek upstream call share karti hain (coalesce.py); AGENTS_COALESCE=0 se band
+USE_COALESCE = os.getenv("AGENTS_COALESCE", "1").lower() in ("1", "true", "yes")
+# client-side RPM/TPM buckets + AIMD concurrency (rate_limit.py); AGENTS_RATE_LIMIT=0 se band
+USE_RATE_LIMIT = os.getenv("AGENTS_RATE_LIMIT", "1").lower() in ("1", "true", "yes")
+# AGENTS_TRACE_STORE=traces.db (ya .jsonl): spans remote ke bajaye batches mein local file mein
+# (trace_store.py); AGENTS_TRACE_LOCAL_ONLY=0 ho to remote export bhi chalta rehta hai
+TRACE_STORE = os.getenv("AGENTS_TRACE_STORE")
+if TRACE_STORE:
+    from trace_store import install_local_tracing
+
+    install_local_tracing(
+        TRACE_STORE,
+        local_only=os.getenv("AGENTS_TRACE_LOCAL_ONLY", "1").lower() in ("1", "true", "yes"),
+    )
+# AGENTS_PROFILE=cpu,memory,lag (ya 1): har sampled run ki profile report (profiling.py)
+if os.getenv("AGENTS_PROFILE"):
+    from profiling import install_profiling
+
+    install_profiling()
+
+
+def _api_key() -> str:
+    if USE_MOCK or (CASSETTE_PATH and CASSETTE_MODE == "replay"):
+        return os.getenv("api_key") or "mock"
+    key = os.getenv("api_key")
+    if not key:
+        raise ValueError("API key is not set in the environment variables.")
+    return key
+
+
+async def _trace(event: str, info: dict[str, Any]) -> None:
+    # httpcore trace extension: har naye socket / TLS handshake par call hota hai
+    if event == "connection.connect_tcp.complete":
+        pool_metrics.connections_opened += 1
+    elif event == "connection.start_tls.complete":
+        pool_metrics.tls_handshakes += 1
+
+
+async def _on_request(request: httpx.Request) -> None:
+    request.extensions["trace"] = _trace
+    pool_metrics.requests += 1
+
+
+async def _on_response(response: httpx.Response) -> None:
+    pool_metrics.responses += 1
+    if response.status_code >= 400:
+        pool_metrics.errors += 1
+
+
+def _in_flight_done() -> None:
+    pool_metrics.in_flight -= 1
+
+
+class _InFlightTransport(httpx.AsyncBaseTransport):
+    """Counts a request as in flight until its response body is done with (or the send fails)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool_metrics.in_flight += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            # timeout / connection error / cancel: response hook kabhi nahi chalta
+            pool_metrics.in_flight -= 1
+            raise
+        response.stream = ReleaseOnCloseStream(response.stream, _in_flight_done)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def configure_pool(**settings: Any) -> PoolSettings:
+    """Change pool limits. Must be called before the first client is created."""
+    if _http_client is not None:
+        raise RuntimeError("configure_pool() must be called before the pool is created.")
+    for name, value in settings.items():
+        if not hasattr(pool_settings, name):
+            raise ValueError(f"Unknown pool setting: {name}")
+        setattr(pool_settings, name, value)
+    return pool_settings
+
+
+def _build_transport() -> httpx.AsyncBaseTransport:
+    global _base_transport, _coalescing, limiter
+    transport: httpx.AsyncBaseTransport | None
+    if USE_MOCK:
+        from mock_server import MockTransport
+
+        transport = MockTransport()
+    elif CASSETTE_PATH and CASSETTE_MODE == "replay":
+        transport = None  # replay mein koi socket nahi khulta
+    else:
+        limits = httpx.Limits(
+            max_connections=pool_settings.max_connections,
+            max_keepalive_connections=pool_settings.max_keepalive_connections,
+            keepalive_expiry=pool_settings.keepalive_expiry,
+        )
+        transport = _base_transport = httpx.AsyncHTTPTransport(limits=limits)
+    if transport is not None and USE_RATE_LIMIT:
+        from rate_limit import AdaptiveLimiter, RateLimitTransport
+
+        limiter = AdaptiveLimiter(
+            rpm=float(os.getenv("AGENTS_RPM", "0")),
+            tpm=float(os.getenv("AGENTS_TPM", "0")),
+            initial_concurrency=int(os.getenv("AGENTS_CONCURRENCY", "16")),
+            max_concurrency=int(
+                os.getenv("AGENTS_MAX_CONCURRENCY", str(pool_settings.max_connections))
+            ),
+            latency_target=float(os.getenv("AGENTS_LATENCY_TARGET", "0")),
+        )
+        transport = RateLimitTransport(transport, limiter)
+    if CASSETTE_PATH:
+        from cassette import Cassette, CassetteTransport
+
+        transport = CassetteTransport(
+            transport, Cassette(CASSETTE_PATH), CASSETTE_MODE, realtime=CASSETTE_REALTIME
+        )
+    if USE_COALESCE:
+        from coalesce import CoalescingTransport
+
+        transport = _coalescing = CoalescingTransport(transport)
+    return _InFlightTransport(transport)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The single pooled httpx client shared by every AsyncOpenAI client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            transport=_build_transport(),
+            timeout=httpx.Timeout(
+                pool_settings.read_timeout, connect=pool_settings.connect_timeout
+            ),
+            follow_redirects=True,
+            event_hooks={"request": [_on_request], "response": [_on_response]},
+        )
+    return _http_client
+
+
+def get_client(**default_headers: str) -> AsyncOpenAI:
+    """Return an AsyncOpenAI client bound to the shared pool.
+
+    Clients are cached per set of default headers, so asking twice returns the same object.
+    """
+    key = tuple(sorted(default_headers.items()))
+    if key not in _clients:
+        _clients[key] = AsyncOpenAI(
+            api_key=_api_key(),
+            base_url=BASE_URL,
+            http_client=get_http_client(),
+            default_headers=default_headers or None,
+        )
+    return _clients[key]
+
+
+def get_model(name: str = DEFAULT_MODEL, **default_headers: str) -> OpenAIChatCompletionsModel:
+    """Return the chat-completions model for ``name``; the same instance is reused."""
+    key = (name, tuple(sorted(default_headers.items())))
+    if key not in _models:
+        _models[key] = OpenAIChatCompletionsModel(
+            model=name,
+            openai_client=get_client(**default_headers),
+        )
+    return _models[key]
+
+
+def run_config(model_name: str = DEFAULT_MODEL, **kwargs: Any) -> RunConfig:
+    """RunConfig using the shared model and client."""
+    return RunConfig(
+        model=get_model(model_name),
+        model_provider=get_client(),
+        **kwargs,
+    )
+
+
+async def warm_up(connections: int | None = None) -> None:
+    """Open ``connections`` keep-alive sockets ahead of the first real request.
+
+    Har connection par ek halki si ``GET /models`` request jati hai taake TCP + TLS
+    handshake pehle hi ho jaye.
+    """
+    n = pool_settings.warm_connections if connections is None else connections
+    if n <= 0:
+        return
+    client = get_http_client()
+    headers = {"Authorization": f"Bearer {_api_key()}"}
+
+    async def _ping():
+        try:
+            await client.get(BASE_URL.rstrip("/") + "/models", headers=headers)
+        except httpx.HTTPError:
+            pass
+
+    await asyncio.gather(*(_ping() for _ in range(n)))
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    data = asdict(pool_metrics)
+    data["reuse_ratio"] = round(pool_metrics.reuse_ratio, 4)
+    pool = getattr(_base_transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is not None:
+        data["open_connections"] = len(connections)
+        data["idle_connections"] = sum(1 for c in connections if c.is_idle())
+    if _coalescing is not None:
+        data["coalesce"] = _coalescing.stats.as_dict()
+    if limiter is not None:
+        data["rate_limit"] = limiter.get_stats()
+    return data
+
+
+async def aclose() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    _clients.clear()
+    _models.clear()
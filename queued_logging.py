@@ -0,0 +1,174 @@
+from agents.tracing import get_current_trace  # type: ignore
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterator, TextIO
+import atexit
+import logging
+import os
+import queue
+import sys
+import uuid
+
+# Non-blocking verbose logging.
+# enable_verbose_stdout_logging() har request / response event loop se hi seedha stdout par
+# likhta hai; terminal slow ho to poora loop rukta hai. Yahan record sirf ek bounded queue mein
+# jata hai aur background thread likhta hai. Queue bhari ho to record drop (aur gina) hota hai,
+# loop kabhi intezar nahi karta. Bare payloads truncate / sample hote hain aur har line par
+# run ka correlation id hota hai (SDK trace id, ya log_correlation() wala id).
+#
+#   enable_queued_logging()   # enable_verbose_stdout_logging() ki jagah
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(run_id)s] %(name)s: %(message)s"
+
+_correlation_id: ContextVar[str | None] = ContextVar("_correlation_id", default=None)
+
+
+@contextmanager
+def log_correlation(correlation_id: str | None = None) -> Iterator[str]:
+    """Tag log records from this block (and tasks started in it) with ``correlation_id``."""
+    correlation_id = correlation_id or uuid.uuid4().hex[:12]
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+def current_correlation_id() -> str:
+    explicit = _correlation_id.get()
+    if explicit:
+        return explicit
+    trace = get_current_trace()
+    trace_id = getattr(trace, "trace_id", None) if trace is not None else None
+    return trace_id if trace_id and trace_id != "no-op" else "-"
+
+
+@dataclass
+class QueuedLoggingStats:
+    enqueued: int = 0
+    dropped: int = 0  # queue bhari thi
+    truncated: int = 0
+    sampled_out: int = 0  # bare records jo sampling mein chhor diye
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: full queue drops the record, big messages are cut or sampled.
+
+    Messages longer than ``max_chars`` are truncated; only every ``sample_large_every``-th of
+    them is kept at all (1 = keep every one). WARNING and above are never cut or sampled, and on
+    a full queue they push out the oldest queued record instead of being dropped.
+    """
+
+    def __init__(self, q: queue.Queue, max_chars: int = 2000, sample_large_every: int = 1):
+        super().__init__(q)
+        self.max_chars = max_chars
+        self.sample_large_every = max(1, sample_large_every)
+        self.stats = QueuedLoggingStats()
+        self._large_seen = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # correlation id contextvar se aata hai, is liye queue mein daalne se pehle (loop thread mein)
+        record.run_id = current_correlation_id()
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord | None:
+        record = super().prepare(record)
+        message = record.msg
+        if record.levelno >= logging.WARNING:
+            return record  # errors poore chahiye, chahe kitne bare hon
+        if isinstance(message, str) and len(message) > self.max_chars:
+            self._large_seen += 1
+            if self._large_seen % self.sample_large_every:
+                self.stats.sampled_out += 1
+                return None
+            self.stats.truncated += 1
+            cut = len(message) - self.max_chars
+            record.msg = f"{message[: self.max_chars]}... [{cut} chars truncated]"
+        return record
+
+    def enqueue(self, record: logging.LogRecord | None) -> None:
+        if record is None:
+            return
+        try:
+            self.queue.put_nowait(record)
+            self.stats.enqueued += 1
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.stats.dropped += 1
+                return
+            # warning / error drop nahi hota: sab se purana record nikal kar jagah banao
+            try:
+                self.queue.get_nowait()
+                self.stats.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                self.stats.enqueued += 1
+            except queue.Full:
+                self.stats.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # bhari queue par put_nowait fail hota; band karte waqt thread ke khali karne ka intezar
+        self.queue.put(self._sentinel)
+
+
+_active: tuple[logging.Logger, DroppingQueueHandler, QueueListener] | None = None
+
+
+def enable_queued_logging(
+    level: int = logging.DEBUG,
+    max_queue: int | None = None,
+    max_chars: int | None = None,
+    sample_large_every: int | None = None,
+    stream: TextIO | None = None,
+    logger_name: str = "openai.agents",
+) -> DroppingQueueHandler:
+    """Drop-in replacement for ``enable_verbose_stdout_logging`` that never blocks the event loop.
+
+    Defaults come from AGENTS_LOG_QUEUE (10000), AGENTS_LOG_MAX_CHARS (2000) and
+    AGENTS_LOG_SAMPLE_EVERY (1). Calling it again returns the already-installed handler.
+    """
+    global _active
+    if _active is not None:
+        return _active[1]
+
+    q: queue.Queue = queue.Queue(maxsize=max_queue or int(os.getenv("AGENTS_LOG_QUEUE", "10000")))
+    handler = DroppingQueueHandler(
+        q,
+        max_chars=max_chars or int(os.getenv("AGENTS_LOG_MAX_CHARS", "2000")),
+        sample_large_every=sample_large_every or int(os.getenv("AGENTS_LOG_SAMPLE_EVERY", "1")),
+    )
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = _Listener(q, output, respect_handler_level=True)
+    listener.start()
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    _active = (logger, handler, listener)
+    atexit.register(disable_queued_logging)  # exit par queue mein bache records likh do
+    return handler
+
+
+def disable_queued_logging() -> None:
+    """Detach the handler and flush what is still queued."""
+    global _active
+    if _active is None:
+        return
+    logger, handler, listener = _active
+    _active = None
+    logger.removeHandler(handler)
+    listener.stop()
+
+
+def queued_logging_stats() -> dict[str, Any]:
+    return _active[1].stats.as_dict() if _active else {}
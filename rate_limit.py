@@ -0,0 +1,358 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator
+import asyncio
+import heapq
+import json
+import time
+import weakref
+import httpx  # type: ignore
+
+# Adaptive rate limiting for the model endpoint.
+# Har request pehle limiter se slot leti hai: RPM aur TPM ke token buckets, aur AIMD
+# concurrency limit (429 par aadha, har kamiyab response par thora barhao, latency target
+# se upar jaye to thora kam). Queue priority wali hai: user-facing agents pehle, phir
+# guardrails, sab se aakhir mein batch traffic.
+#
+# Priority do tarah se set hoti hai:
+#   with request_priority("batch"): await Runner.run(...)
+#   get_model(name, **{PRIORITY_HEADER: "guardrail"})   # is model ki har request
+
+PRIORITIES = {"interactive": 0, "guardrail": 1, "batch": 2}
+PRIORITY_HEADER = "x-agents-priority"
+
+_priority: ContextVar[str] = ContextVar("_priority", default="interactive")
+
+
+@contextmanager
+def request_priority(name: str) -> Iterator[None]:
+    """Model calls made inside this block (and tasks started from it) use priority ``name``."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}; use one of {list(PRIORITIES)}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_request_tokens(body: bytes, default_output_tokens: int = 256) -> int:
+    """Prompt size (~4 bytes per token) plus max_tokens, or a default output allowance."""
+    try:
+        data = json.loads(body) if body else {}
+    except json.JSONDecodeError:
+        data = {}
+    max_tokens = data.get("max_tokens") or data.get("max_completion_tokens") or default_output_tokens
+    return len(body) // 4 + int(max_tokens)
+
+
+class TokenBucket:
+    """``rate`` units per minute, up to ``burst`` saved. Level may go negative (debt) for big requests."""
+
+    def __init__(self, per_minute: float, burst: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until the bucket is positive again (0 when a request may go now)."""
+        self._refill()
+        return 0.0 if self.level > 0 else -self.level / self.rate + 1e-3
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def adjust(self, delta: float) -> None:
+        # estimate aur asal usage ka farq wapas / mazeed charge
+        self._refill()
+        self.level = min(self.capacity, self.level - delta)
+
+
+@dataclass
+class ClassStats:
+    requests: int = 0
+    waits: deque = field(default_factory=lambda: deque(maxlen=2048))
+
+    def as_dict(self) -> dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def pct(p: float) -> float | None:
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 2) if waits else None
+
+        return {
+            "requests": self.requests,
+            "queue_wait_ms_p50": pct(0.50),
+            "queue_wait_ms_p95": pct(0.95),
+            "queue_wait_ms_p99": pct(0.99),
+            "queue_wait_ms_max": round(waits[-1] * 1000, 2) if waits else None,
+        }
+
+
+@dataclass
+class LimiterStats:
+    throttled: int = 0  # 429 / 503 responses
+    decreases: int = 0
+    increases: int = 0
+    queue_wait_seconds: float = 0.0
+    classes: dict[str, ClassStats] = field(
+        default_factory=lambda: {name: ClassStats() for name in PRIORITIES}
+    )
+
+
+class AdaptiveLimiter:
+    """Priority queue in front of RPM/TPM token buckets and an AIMD concurrency limit."""
+
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        initial_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_concurrency: int = 100,
+        latency_target: float = 0.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.rpm_bucket = TokenBucket(rpm) if rpm else None
+        self.tpm_bucket = TokenBucket(tpm) if tpm else None
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self.stats = LimiterStats()
+        self._queue: list[tuple[int, int, asyncio.Future, int]] = []
+        self._seq = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    # ---- admission ----
+
+    async def acquire(self, priority: str, tokens: int) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._seq += 1
+        heapq.heappush(self._queue, (PRIORITIES.get(priority, 0), self._seq, future, tokens))
+        started = time.perf_counter()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # slot mil chuka tha, wapas karo
+            raise
+        waited = time.perf_counter() - started
+        self.stats.queue_wait_seconds += waited
+        cls = self.stats.classes.setdefault(priority, ClassStats())
+        cls.requests += 1
+        cls.waits.append(waited)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            _, _, future, tokens = self._queue[0]
+            if future.done():  # cancelled waiter
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= int(self.limit):
+                return  # release() dobara dispatch karega
+            wait = max(
+                self._paused_until - time.monotonic(),
+                self.rpm_bucket.wait_time() if self.rpm_bucket else 0.0,
+                self.tpm_bucket.wait_time() if self.tpm_bucket else 0.0,
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            if self.rpm_bucket:
+                self.rpm_bucket.take(1)
+            if self.tpm_bucket:
+                self.tpm_bucket.take(tokens)
+            self.in_flight += 1
+            future.set_result(None)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    # ---- feedback (AIMD) ----
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return  # ek hi burst ke kai 429 ek hi dafa gine jate hain
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        self.stats.decreases += 1
+
+    def on_response(self, status: int, latency: float, retry_after: float | None) -> None:
+        if status in (429, 503):
+            self.stats.throttled += 1
+            self._decrease(self.decrease_factor)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        elif self.latency_target and latency > self.latency_target:
+            self._decrease(0.9)
+        elif status < 400 and self.limit < self.max_concurrency:
+            # additive increase: har poori "window" (limit jitne responses) par +1
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self.stats.increases += 1
+
+    def on_usage(self, estimated: int, actual: int) -> None:
+        if self.tpm_bucket:
+            self.tpm_bucket.adjust(actual - estimated)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for _, _, f, _ in self._queue if not f.done()),
+            "throttled": self.stats.throttled,
+            "decreases": self.stats.decreases,
+            "increases": self.stats.increases,
+            "queue_wait_seconds": round(self.stats.queue_wait_seconds, 4),
+            "rpm_level": round(self.rpm_bucket.level, 2) if self.rpm_bucket else None,
+            "tpm_level": round(self.tpm_bucket.level, 2) if self.tpm_bucket else None,
+            "classes": {name: cls.as_dict() for name, cls in self.stats.classes.items()},
+        }
+
+
+_closing: set[asyncio.Task] = set()
+
+
+async def _close_quietly(stream: httpx.AsyncByteStream) -> None:
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+class ReleaseOnCloseStream(httpx.AsyncByteStream):
+    """Response body that calls ``on_release`` exactly once when it is done with.
+
+    That is on ``aclose()``, but also when iteration is cancelled or abandoned (a cancelled
+    streamed run never closes its body) and, as a last resort, when the stream is garbage
+    collected. ``on_release`` must not hold a reference to the stream.
+    """
+
+    def __init__(self, inner: httpx.AsyncByteStream, on_release: Callable[[], None]):
+        self._inner = inner
+        self._release = weakref.finalize(self, on_release)  # finalize sirf ek dafa chalta hai
+        self._release.atexit = False
+
+    def _on_chunk(self, chunk: bytes) -> None:
+        pass
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._inner:
+                self._on_chunk(chunk)
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # run cancel hua (ya generator chhor diya gaya): aclose() kabhi nahi aayega
+            if self._release.alive:
+                self._release()
+                try:
+                    task = asyncio.get_running_loop().create_task(_close_quietly(self._inner))
+                except RuntimeError:
+                    pass  # loop band ho chuka; connection GC ke saath jayega
+                else:
+                    _closing.add(task)
+                    task.add_done_callback(_closing.discard)
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            if self._release.alive:
+                self._release()
+                self._on_close()
+
+    def _on_close(self) -> None:
+        pass
+
+
+class _ReleasingStream(ReleaseOnCloseStream):
+    """Holds the limiter slot until the body is done with; reconciles TPM from a JSON body's usage."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, limiter: AdaptiveLimiter, estimated: int, is_json: bool):
+        super().__init__(inner, limiter.release)
+        self._limiter = limiter
+        self._estimated = estimated
+        self._body = bytearray() if is_json else None
+
+    def _on_chunk(self, chunk: bytes) -> None:
+        if self._body is not None:
+            self._body += chunk
+
+    def _on_close(self) -> None:
+        self._reconcile()
+
+    def _reconcile(self) -> None:
+        if not self._body:
+            return
+        try:
+            usage = json.loads(bytes(self._body)).get("usage") or {}
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return  # gzip ya ghair-JSON body: estimate hi rehne do
+        if "total_tokens" in usage:
+            self._limiter.on_usage(self._estimated, int(usage["total_tokens"]))
+
+
+class RateLimitTransport(httpx.AsyncBaseTransport):
+    """httpx transport that admits requests through an ``AdaptiveLimiter``."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, limiter: AdaptiveLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        priority = request.headers.pop(PRIORITY_HEADER, None) or _priority.get()
+        if request.method != "POST":
+            return await self.inner.handle_async_request(request)
+        body = await request.aread()
+        estimated = estimate_request_tokens(body)
+        await self.limiter.acquire(priority, estimated)
+
+        started = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        retry_after = response.headers.get("retry-after")
+        try:
+            retry_after_s = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after_s = None
+        self.limiter.on_response(response.status_code, time.perf_counter() - started, retry_after_s)
+
+        is_json = response.headers.get("content-type", "").startswith("application/json") and not (
+            response.headers.get("content-encoding")
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self.limiter, estimated, is_json),
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,402 @@
+from agents import Agent, ModelResponse, ModelSettings, Tool, TResponseInputItem, Usage  # type: ignore
+from agents.agent_output import AgentOutputSchemaBase  # type: ignore
+from agents.handoffs import Handoff  # type: ignore
+from agents.models.interface import Model, ModelTracing  # type: ignore
+from openai.types.responses import ResponseCompletedEvent, ResponseOutputItem, ResponseStreamEvent  # type: ignore
+from pydantic import TypeAdapter  # type: ignore
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Exact-match LLM response cache, model layer ke andar.
+# RecipeBot / NewsBot / JokeBot jaise agents ko same instructions + same input baar baar milte
+# hain. CachedModel kisi bhi Model ko wrap karta hai; key = (model, system prompt, input items,
+# tools schema, handoffs, output schema, ModelSettings). Memory LRU tier ke neeche SQLite tier.
+# Opt-in hai: sirf wo agents cache hote hain jin par cache.enable(agent) call hua ho.
+
+_output_items = TypeAdapter(list[ResponseOutputItem])
+_stream_event = TypeAdapter(ResponseStreamEvent)
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    persistent_hits: int = 0
+    stream_hits: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+    expired: int = 0
+    saved_input_tokens: int = 0
+    saved_output_tokens: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+def _instructions_digest(instructions: str | None) -> str:
+    return hashlib.sha256((instructions or "").encode()).hexdigest()[:16]
+
+
+def _tool_schema(tool: Tool) -> dict[str, Any]:
+    schema = getattr(tool, "params_json_schema", None)
+    return {
+        "type": type(tool).__name__,
+        "name": getattr(tool, "name", None),
+        "description": getattr(tool, "description", None),
+        "params": schema,
+        "strict": getattr(tool, "strict_json_schema", None),
+    }
+
+
+def _is_transfer_output(output: Any) -> bool:
+    # handoff ka tool output SDK khud banata hai: {"assistant": "<agent name>"}, ye deterministic hai
+    try:
+        value = json.loads(output) if isinstance(output, str) else None
+    except json.JSONDecodeError:
+        return False
+    return isinstance(value, dict) and list(value) == ["assistant"]
+
+
+class ResponseCache:
+    """LRU + TTL cache of model responses with an optional size-limited SQLite tier.
+
+    ``enable(agent)`` / ``disable(agent)`` work on the agent's (string) instructions, which is
+    what the model layer sees; ``default_enabled=True`` caches every agent not disabled.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 3600.0,
+        db_path: str | None = None,
+        max_db_entries: int = 10_000,
+        max_temperature: float = 0.5,
+        cache_unset_temperature: bool = False,
+        deterministic_tools: tuple[str, ...] = (),
+        default_enabled: bool = False,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self.max_temperature = max_temperature
+        self.cache_unset_temperature = cache_unset_temperature
+        self.deterministic_tools = set(deterministic_tools)
+        self.default_enabled = default_enabled
+        self.stats = ResponseCacheStats()
+        self._enabled: set[str] = set()
+        self._disabled: set[str] = set()
+        self._items: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._db_writes = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_created ON llm_response_cache (created_at)"
+            )
+            self._db.commit()
+
+    # ---- policy ----
+
+    def enable(self, *agents: Agent) -> None:
+        for agent in agents:
+            if not isinstance(agent.instructions, str):
+                raise ValueError(f"{agent.name}: only agents with string instructions can be enabled.")
+            digest = _instructions_digest(agent.instructions)
+            self._enabled.add(digest)
+            self._disabled.discard(digest)
+
+    def disable(self, *agents: Agent) -> None:
+        for agent in agents:
+            if isinstance(agent.instructions, str):
+                digest = _instructions_digest(agent.instructions)
+                self._disabled.add(digest)
+                self._enabled.discard(digest)
+
+    def bypass_reason(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        previous_response_id: str | None = None,
+        conversation_id: str | None = None,
+    ) -> str | None:
+        """Why this call must not be cached, or None when it may be."""
+        digest = _instructions_digest(system_instructions)
+        if digest in self._disabled or (not self.default_enabled and digest not in self._enabled):
+            return "agent_not_enabled"
+        if previous_response_id or conversation_id:
+            return "server_side_state"
+        temperature = model_settings.temperature
+        if temperature is None and not self.cache_unset_temperature:
+            return "temperature_unset"
+        if temperature is not None and temperature > self.max_temperature:
+            return "temperature"
+        if isinstance(input, list):
+            calls = {
+                item.get("call_id"): item.get("name")
+                for item in input
+                if isinstance(item, dict) and item.get("type") == "function_call"
+            }
+            for item in input:
+                if not isinstance(item, dict) or item.get("type") != "function_call_output":
+                    continue
+                if calls.get(item.get("call_id")) in self.deterministic_tools:
+                    continue
+                if _is_transfer_output(item.get("output")):
+                    continue
+                return "tool_output"
+        return None
+
+    def make_key(
+        self,
+        model_name: str,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> str:
+        raw = json.dumps(
+            {
+                "model": model_name,
+                "system": system_instructions,
+                "input": input,
+                "settings": model_settings.to_json_dict(),
+                "tools": [_tool_schema(t) for t in tools],
+                "handoffs": [
+                    [h.tool_name, h.tool_description, h.input_json_schema] for h in handoffs
+                ],
+                "output_schema": (
+                    None
+                    if output_schema is None or output_schema.is_plain_text()
+                    else [output_schema.name(), output_schema.json_schema()]
+                ),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    # ---- in-memory tier ----
+
+    def _get_memory(self, key: str) -> dict[str, Any] | None:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._items[key]
+            self.stats.expired += 1
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def _put_memory(self, key: str, value: dict[str, Any], expires_at: float) -> None:
+        self._items[key] = (expires_at, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.stats.evictions += 1
+
+    # ---- SQLite tier ----
+
+    def _get_db(self, key: str) -> tuple[float, str] | None:
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT expires_at, payload FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _put_db(self, key: str, payload: str, expires_at: float) -> None:
+        with self._db_lock:
+            now = time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, payload, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            self._db_writes += 1
+            # har 100 writes par expired aur size limit se upar wale (sab se purane) rows hatao
+            if self._db_writes % 100 == 0:
+                self._db.execute("DELETE FROM llm_response_cache WHERE expires_at < ?", (now,))
+                self._db.execute(
+                    """
+                    DELETE FROM llm_response_cache WHERE key IN (
+                        SELECT key FROM llm_response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_db_entries,),
+                )
+            self._db.commit()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            row = await asyncio.to_thread(self._get_db, key)
+            if row is not None and row[0] >= time.time():
+                value = json.loads(row[1])
+                self._put_memory(key, value, row[0])
+                self.stats.persistent_hits += 1
+        return value
+
+    async def put(self, key: str, value: dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl
+        self._put_memory(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._put_db, key, json.dumps(value), expires_at)
+
+    def clear(self) -> None:
+        self._items.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_response_cache")
+                self._db.commit()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"size": len(self._items), **self.stats.as_dict()}
+
+
+class CachedModel(Model):
+    """Wraps a Model; serves cached responses (and replays cached stream events) when allowed."""
+
+    def __init__(self, inner: Model, cache: "ResponseCache | None" = None):
+        self.inner = inner
+        self.cache = cache or default_response_cache
+        self.model_name = str(getattr(inner, "model", type(inner).__name__))
+
+    def _key(self, system_instructions, input, model_settings, tools, output_schema, handoffs, **kwargs):
+        if self.cache.bypass_reason(
+            system_instructions,
+            input,
+            model_settings,
+            kwargs.get("previous_response_id"),
+            kwargs.get("conversation_id"),
+        ):
+            self.cache.stats.bypassed += 1
+            return None
+        return self.cache.make_key(
+            self.model_name, system_instructions, input, model_settings, tools, output_schema, handoffs
+        )
+
+    def _count_hit(self, entry: dict[str, Any]) -> None:
+        self.cache.stats.hits += 1
+        self.cache.stats.saved_input_tokens += entry.get("input_tokens", 0)
+        self.cache.stats.saved_output_tokens += entry.get("output_tokens", 0)
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs, **kwargs)
+        if key is not None:
+            entry = await self.cache.get(key)
+            if entry is not None:
+                self._count_hit(entry)
+                # cache hit par koi token kharch nahi hua, is liye usage khali
+                return ModelResponse(
+                    output=_output_items.validate_python(entry["output"]), usage=Usage(), response_id=None
+                )
+            self.cache.stats.misses += 1
+
+        response = await self.inner.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        if key is not None:
+            await self.cache.put(
+                key,
+                {
+                    "output": [item.model_dump(mode="json") for item in response.output],
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens,
+                },
+            )
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs, **kwargs)
+        if key is not None:
+            entry = await self.cache.get(key)
+            # get_response se bani entry mein chunks nahi hote; us case mein stream dobara chalao
+            if entry is not None and "events" in entry:
+                self._count_hit(entry)
+                self.cache.stats.stream_hits += 1
+                for raw in entry["events"]:
+                    event = _stream_event.validate_python(raw)
+                    if isinstance(event, ResponseCompletedEvent):
+                        event.response.usage = None
+                    yield event
+                return
+            self.cache.stats.misses += 1
+
+        events: list[dict[str, Any]] = []
+        completed: ResponseCompletedEvent | None = None
+        async for event in self.inner.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        ):
+            if key is not None:
+                events.append(event.model_dump(mode="json"))
+                if isinstance(event, ResponseCompletedEvent):
+                    completed = event
+            yield event
+
+        if key is not None and completed is not None:
+            usage = completed.response.usage
+            await self.cache.put(
+                key,
+                {
+                    "output": [item.model_dump(mode="json") for item in completed.response.output],
+                    "events": events,
+                    "input_tokens": usage.input_tokens if usage else 0,
+                    "output_tokens": usage.output_tokens if usage else 0,
+                },
+            )
+
+
+default_response_cache = ResponseCache(
+    maxsize=int(os.getenv("AGENTS_RESPONSE_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("AGENTS_RESPONSE_CACHE_TTL", "3600")),
+    db_path=os.getenv("AGENTS_RESPONSE_CACHE_DB") or None,
+    max_db_entries=int(os.getenv("AGENTS_RESPONSE_CACHE_MAX_ENTRIES", "10000")),
+)
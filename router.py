@@ -0,0 +1,187 @@
+from agents import Agent, Runner, RunHooks, RunContextWrapper, RunResult, Handoff, handoff  # type: ignore
+from agents.exceptions import UserError  # type: ignore
+from agents.handoffs import HandoffInputData  # type: ignore
+from agents.run import RunConfig, DEFAULT_MAX_TURNS  # type: ignore
+from agents.tracing import get_current_trace, handoff_span, trace  # type: ignore
+from contextlib import nullcontext
+from dataclasses import dataclass, field, asdict, replace
+from preclassifier import PreClassifier, input_text
+from typing import Any, Awaitable, Callable
+import inspect
+
+# Local pre-routing on the handoff graph.
+# Traige agent ka pura LLM turn sirf "flight agent ko handoff karo" kehne mein jata hai.
+# Yahan har handoff target ka ek PreClassifier hai: input saaf taur par kisi ek target ka ho
+# to run seedha usi agent se shuru hota hai, warna traige agent (LLM) hi faisla karta hai.
+# on_handoff hooks (RunHooks aur source agent ke AgentHooks) waise hi fire hote hain jaise
+# normal handoff par, aur traige agent ke input guardrails bhi chalte hain.
+#
+#   router = LocalRouter({"flight agent": PreClassifier(name="flight", allow_keywords=[...])})
+#   result = await run_routed(router, agent, input, run_config=config, hooks=hooks)
+#
+# Example scripts ka triage -> "flight agent" router ek hi jagah hai: router = flight_router()
+
+
+@dataclass
+class RouterStats:
+    routed: int = 0  # LLM triage ke baghair handoff
+    fallback: int = 0  # koi route confident nahi tha, LLM ne decide kiya
+    ambiguous: int = 0  # ek se zyada route confident the
+    hops: int = 0
+    targets: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def routed_ratio(self) -> float:
+        total = self.routed + self.fallback
+        return self.routed / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "routed_ratio": round(self.routed_ratio, 4)}
+
+
+def _is_enabled(item: Handoff, context: RunContextWrapper, agent: Agent) -> Any:
+    enabled = item.is_enabled
+    return enabled(context, agent) if callable(enabled) else enabled
+
+
+class LocalRouter:
+    """Picks a handoff target locally when exactly one route's classifier is confident.
+
+    ``routes`` maps a handoff target's agent name to a ``PreClassifier``; a route is confident
+    when its score reaches the classifier's ``allow_threshold``. Handoffs that need LLM
+    arguments (``input_type``) are never routed locally.
+    """
+
+    def __init__(self, routes: dict[str, PreClassifier], max_hops: int = 3):
+        self.routes = routes
+        self.max_hops = max_hops
+        self.stats = RouterStats()
+
+    async def pick(self, agent: Agent, text: str, context: RunContextWrapper) -> Handoff | None:
+        confident: list[tuple[float, Handoff]] = []
+        for item in agent.handoffs:
+            item = handoff(item) if isinstance(item, Agent) else item
+            classifier = self.routes.get(item.agent_name)
+            if classifier is None or (item.input_json_schema or {}).get("properties"):
+                continue
+            enabled = _is_enabled(item, context, agent)
+            if inspect.isawaitable(enabled):
+                enabled = await enabled
+            if not enabled:
+                continue
+            decision, score = classifier.decide(text)
+            if decision == "allow":
+                confident.append((score, item))
+        if len(confident) == 1:
+            return confident[0][1]
+        if len(confident) > 1:
+            self.stats.ambiguous += 1
+        return None
+
+    async def route(
+        self,
+        starting_agent: Agent,
+        input: Any,
+        context: RunContextWrapper,
+        hooks: RunHooks,
+        run_config: RunConfig,
+    ) -> tuple[Agent, Any]:
+        """Follow confident routes from ``starting_agent``; return the agent to run and its input."""
+        agent, text = starting_agent, input_text(input)
+        for _ in range(self.max_hops):
+            item = await self.pick(agent, text, context)
+            if item is None:
+                break
+            with handoff_span(from_agent=agent.name) as span:
+                # Agent(...) wale handoff ka on_invoke_handoff sirf target agent lautata hai;
+                # handoff(agent, on_handoff=...) ka callback bhi yahin chal jata hai
+                target = await item.on_invoke_handoff(context, "")
+                span.span_data.to_agent = target.name
+                await hooks.on_handoff(context=context, from_agent=agent, to_agent=target)
+                if agent.hooks:
+                    await agent.hooks.on_handoff(context, agent=target, source=agent)
+                input = await self._filter_input(item, input, context, run_config)
+            self.stats.hops += 1
+            self.stats.targets[target.name] = self.stats.targets.get(target.name, 0) + 1
+            agent = target
+        if agent is starting_agent:
+            self.stats.fallback += 1
+        else:
+            self.stats.routed += 1
+        return agent, input
+
+    @staticmethod
+    async def _filter_input(item: Handoff, input: Any, context: RunContextWrapper, run_config: RunConfig) -> Any:
+        input_filter = item.input_filter or run_config.handoff_input_filter
+        if not input_filter:
+            return input
+        filtered = input_filter(
+            HandoffInputData(
+                input_history=input if isinstance(input, str) else tuple(input),
+                pre_handoff_items=(),
+                new_items=(),
+                run_context=context,
+            )
+        )
+        if inspect.isawaitable(filtered):
+            filtered = await filtered
+        if not isinstance(filtered, HandoffInputData):
+            raise UserError(f"Invalid input filter result: {filtered}")
+        history = filtered.input_history
+        return history if isinstance(history, str) else list(history)
+
+
+async def run_routed(
+    router: LocalRouter,
+    starting_agent: Agent,
+    input: Any,
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    hooks: RunHooks | None = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    runner: Callable[..., Awaitable[RunResult]] = Runner.run,
+) -> RunResult:
+    """Like ``Runner.run``, but confident inputs skip straight to the handoff target.
+
+    ``runner`` may be any ``Runner.run``-compatible function, e.g. ``run_speculative``.
+    """
+    run_config = run_config or RunConfig()
+    hooks = hooks or RunHooks()
+    # routing ka handoff span aur asal run ek hi trace mein rahen
+    trace_ctx = (
+        trace(
+            workflow_name=run_config.workflow_name,
+            trace_id=run_config.trace_id,
+            group_id=run_config.group_id,
+            metadata=run_config.trace_metadata,
+            disabled=run_config.tracing_disabled,
+        )
+        if get_current_trace() is None
+        else nullcontext()
+    )
+    with trace_ctx:
+        agent, input = await router.route(
+            starting_agent, input, RunContextWrapper(context=context), hooks, run_config
+        )
+        if agent is not starting_agent and starting_agent.input_guardrails:
+            # pehle agent ke guardrails run_config ke zariye target ke saath chalte hain
+            run_config = replace(
+                run_config,
+                input_guardrails=list(run_config.input_guardrails or [])
+                + list(starting_agent.input_guardrails),
+            )
+        return await runner(
+            agent, input, context=context, run_config=run_config, hooks=hooks, max_turns=max_turns
+        )
+
+
+def flight_router() -> LocalRouter:
+    """Router for the triage -> "flight agent" handoff used by the example scripts."""
+    return LocalRouter({
+        "flight agent": PreClassifier(
+            name="flight",
+            allow_keywords=["flight", "flights", "airline", "boarding", "seat class", "business class", "economy", "passengers", "ticket", "departure", "layover"],
+            deny_keywords=["recipe", "joke", "poem", "weather", "news", "homework"],
+        ),
+    })
@@ -1,28 +1,19 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool, RunHooks, TResponseInputItem  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_executor import run_in_executor
+from router import flight_router, run_routed
+from metrics import MetricsHooks, PRINT_HOOKS, default_metrics
 import rich
 from pydantic import BaseModel  # type: ignore
 from typing import List, Any, Optional
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+External_client: AsyncOpenAI = get_client()
 
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -54,8 +45,9 @@ class Run_Hooks_Flow(RunHooks):
     ) -> None:
         """Called just before invoking the LLM for this agent."""
         print(f"{agent.name} LLM Start ----> on_llm_start\n")
-        print(f"System Prompt: {system_prompt}")
-        print(f"Input Items: {input_items}")
+        # poori input list har turn par print karna mehenga hai, sirf ginti
+        print(f"System Prompt: {(system_prompt or '')[:80]}")
+        print(f"Input Items: {len(input_items)}")
 
     async def on_llm_end(
         self,
@@ -98,6 +90,7 @@ class FlightBook(BaseModel):
 
 
 @function_tool()
+@run_in_executor("thread", max_concurrency=8)
 def book_flight(flight: FlightBook):
     """Book a flight"""
     passenger_names = ", ".join(flight.name)
@@ -111,6 +104,7 @@ class SeatChange(BaseModel):
 
 
 @function_tool
+@run_in_executor("thread", max_concurrency=8)
 def change_seat_class(change: SeatChange):
     """Change seat class"""
     if change.current_class == change.new_class:
@@ -133,13 +127,19 @@ agent = Agent(
 )
 
 
+# saaf flight requests traige LLM turn ke baghair seedha flight agent ko jati hain (router.py)
+router = flight_router()
+
+
 async def main():
-    result = await Runner.run(
+    result = await run_routed(
+        router,
         agent,
         # "Hello, how are you?",
         "Book a flight from karachi to dubai on 2023-06-15 in business class for 2 passengers. and passenger name is Tehreem and ayesha",
         run_config=config,
-        hooks=Run_Hooks_Flow(),
+        # print wale hooks sirf AGENTS_PRINT_HOOKS=1 par, warna sirf in-memory metrics (metrics.py)
+        hooks=Run_Hooks_Flow() if PRINT_HOOKS else MetricsHooks(),
     )
 
     print(
@@ -148,6 +148,9 @@ async def main():
         "\n===================================================\n",
     )
 
+    if not PRINT_HOOKS:
+        print(default_metrics.to_prometheus())
+
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,82 @@
+from agents import SQLiteSession  # type: ignore
+from fast_session import FastSQLiteSession, close_all
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# Benchmark: stock SQLiteSession vs FastSQLiteSession.
+# Har session "turns" dafa add_items + get_items karta hai, sab sessions ek saath chalte hain.
+# Koi model call nahi hoti, sirf storage ka kaam naapa jata hai.
+#
+#   python bench_session.py --sessions 2000 --turns 5
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run_backend(name: str, make_session, sessions: int, turns: int) -> dict:
+    latencies: list[float] = []
+    errors = {"locked": 0, "other": 0}
+
+    async def one_session(i: int):
+        session = make_session(f"bench_{i}")
+        for turn in range(turns):
+            started = time.perf_counter()
+            try:
+                await session.add_items(
+                    [
+                        {"role": "user", "content": f"question {turn} from session {i}"},
+                        {"role": "assistant", "content": f"answer {turn} for session {i}"},
+                    ]
+                )
+                await session.get_items()
+            except Exception as e:
+                errors["locked" if "locked" in str(e) else "other"] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_session(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+    return {
+        "backend": name,
+        "turns": len(latencies),
+        "seconds": round(elapsed, 3),
+        "turns_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "locked_errors": errors["locked"],
+        "other_errors": errors["other"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stock_db = os.path.join(tmp, "stock.db")
+        fast_db = os.path.join(tmp, "fast.db")
+        results = [
+            await run_backend(
+                "SQLiteSession", lambda sid: SQLiteSession(sid, stock_db), args.sessions, args.turns
+            ),
+            await run_backend(
+                "FastSQLiteSession", lambda sid: FastSQLiteSession(sid, fast_db), args.sessions, args.turns
+            ),
+        ]
+        close_all()
+
+    for r in results:
+        print(r)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
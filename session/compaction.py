@@ -0,0 +1,202 @@
+from agents import Agent, Runner, TResponseInputItem  # type: ignore
+from agents.memory import Session, SessionABC  # type: ignore
+from agents.run import RunConfig  # type: ignore
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable
+import asyncio
+import json
+import sqlite3
+import threading
+
+# Automatic history compaction.
+# Lambi conversation mein har turn poori history model ko bhejta hai. Threshold cross hone par
+# purane turns ki jagah ek rolling summary jati hai aur aakhri N turns waise ke waise.
+# Raw items inner session mein hi rehte hain, summary alag table mein save hoti hai (kuch delete nahi hota).
+
+Summarizer = Callable[[str | None, list[TResponseInputItem]], Awaitable[str]]
+
+
+def estimate_tokens(items: list[TResponseInputItem]) -> int:
+    """Rough token count (~4 characters per token), good enough for thresholds."""
+    return sum(len(json.dumps(item, default=str)) for item in items) // 4
+
+
+def _item_text(item: TResponseInputItem) -> str:
+    content = item.get("content") if isinstance(item, dict) else None
+    if isinstance(content, list):
+        content = " ".join(c.get("text", "") for c in content if isinstance(c, dict))
+    if content is None:
+        content = json.dumps(item, default=str)
+    role = item.get("role", item.get("type", "item")) if isinstance(item, dict) else "item"
+    return f"{role}: {content}"
+
+
+def agent_summarizer(model: Any, run_config: RunConfig | None = None) -> Summarizer:
+    """Summarizer backed by a small summary agent."""
+    summary_agent = Agent(
+        name="HistorySummarizer",
+        instructions=(
+            "You compress chat history. Merge the previous summary (if any) with the new messages "
+            "into one short summary. Keep names, facts, decisions, questions the user asked and "
+            "open tasks. Do not add anything that is not in the text."
+        ),
+        model=model,
+    )
+
+    async def summarize(previous: str | None, items: list[TResponseInputItem]) -> str:
+        text = "\n".join(_item_text(item) for item in items)
+        prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{text}"
+        result = await Runner.run(summary_agent, prompt, run_config=run_config)
+        return str(result.final_output)
+
+    return summarize
+
+
+@dataclass
+class CompactionStats:
+    compactions: int = 0
+    compaction_errors: int = 0
+    last_raw_tokens: int = 0
+    last_sent_tokens: int = 0
+    last_saved_tokens: int = 0
+    total_saved_tokens: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class CompactingSession(SessionABC):
+    """Wraps any session; ``get_items`` returns summary + last ``keep_turns`` turns.
+
+    Compaction starts once history is above ``max_items`` items or ``max_tokens`` tokens.
+    The summary is refreshed in the background after ``add_items``, so no turn waits for it.
+    """
+
+    def __init__(
+        self,
+        inner: Session,
+        db_path: str,
+        summarizer: Summarizer,
+        keep_turns: int = 4,
+        max_items: int = 40,
+        max_tokens: int = 4000,
+    ):
+        self.inner = inner
+        self.session_id = getattr(inner, "session_id", "default")
+        self.db_path = db_path
+        self.summarizer = summarizer
+        self.keep_turns = keep_turns
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.stats = CompactionStats()
+        self._task: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_summaries (
+                session_id TEXT PRIMARY KEY,
+                covers_items INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ---- summary storage ----
+
+    def _load_summary_sync(self) -> tuple[int, str] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT covers_items, summary FROM session_summaries WHERE session_id = ?",
+                (self.session_id,),
+            ).fetchone()
+
+    def _save_summary_sync(self, covers_items: int, summary: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_summaries (session_id, covers_items, summary) VALUES (?, ?, ?)",
+                (self.session_id, covers_items, summary),
+            )
+            self._conn.commit()
+
+    def _delete_summary_sync(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM session_summaries WHERE session_id = ?", (self.session_id,)
+            )
+            self._conn.commit()
+
+    # ---- compaction ----
+
+    def _verbatim_start(self, items: list[TResponseInputItem]) -> int:
+        """Index where the last ``keep_turns`` turns begin (a turn starts at a user message)."""
+        user_indexes = [
+            i for i, item in enumerate(items)
+            if isinstance(item, dict) and item.get("role") == "user"
+        ]
+        if len(user_indexes) <= self.keep_turns:
+            return 0
+        return user_indexes[-self.keep_turns]
+
+    def _needs_compaction(self, items: list[TResponseInputItem]) -> bool:
+        return len(items) > self.max_items or estimate_tokens(items) > self.max_tokens
+
+    async def compact(self) -> None:
+        """Fold everything before the last ``keep_turns`` turns into the rolling summary."""
+        items = await self.inner.get_items()
+        cut = self._verbatim_start(items)
+        row = await asyncio.to_thread(self._load_summary_sync)
+        covers, previous = row if row and row[0] <= len(items) else (0, None)
+        if cut <= covers:
+            return
+        summary = await self.summarizer(previous, items[covers:cut])
+        await asyncio.to_thread(self._save_summary_sync, cut, summary)
+        self.stats.compactions += 1
+
+    async def _compact_in_background(self) -> None:
+        try:
+            await self.compact()
+        except Exception:
+            self.stats.compaction_errors += 1
+
+    # ---- Session API ----
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        items = await self.inner.get_items()
+        row = await asyncio.to_thread(self._load_summary_sync)
+        compacted = items
+        if row and 0 < row[0] <= len(items) and self._needs_compaction(items):
+            covers, summary = row
+            compacted = [
+                {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+            ] + items[covers:]
+
+        raw_tokens = estimate_tokens(items)
+        sent_tokens = estimate_tokens(compacted)
+        self.stats.last_raw_tokens = raw_tokens
+        self.stats.last_sent_tokens = sent_tokens
+        self.stats.last_saved_tokens = raw_tokens - sent_tokens
+        self.stats.total_saved_tokens += raw_tokens - sent_tokens
+
+        if limit is not None:
+            compacted = compacted[-limit:]
+        return compacted
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        await self.inner.add_items(items)
+        all_items = await self.inner.get_items()
+        if self._needs_compaction(all_items) and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._compact_in_background())
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        return await self.inner.pop_item()
+
+    async def clear_session(self) -> None:
+        await self.inner.clear_session()
+        await asyncio.to_thread(self._delete_summary_sync)
+
+    async def wait_for_compaction(self) -> None:
+        if self._task is not None:
+            await self._task
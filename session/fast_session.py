@@ -0,0 +1,289 @@
+from agents import TResponseInputItem  # type: ignore
+from agents.memory import SessionABC  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+import asyncio
+import json
+import sqlite3
+import threading
+
+# High-throughput SQLite session backend.
+# Stock SQLiteSession har read / write ek connection par serialize karta hai. Yahan:
+#   - WAL mode (readers writer ko block nahi karte)
+#   - readers ka connection pool (har reader thread ka apna read-only connection)
+#   - ek hi writer jo queue se ops utha kar ek transaction mein batch commit karta hai
+#   - sqlite3 statement cache (prepared statements) aur (session_id, created_at) index
+# Tables stock SQLiteSession wali hi hain, is liye purani history bhi parhi ja sakti hai.
+
+
+class _Store:
+    """One per database file, shared by every FastSQLiteSession that points at it."""
+
+    def __init__(
+        self,
+        db_path: str,
+        sessions_table: str,
+        messages_table: str,
+        readers: int,
+        max_batch: int,
+    ):
+        self.db_path = db_path
+        self.sessions_table = sessions_table
+        self.messages_table = messages_table
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._reader_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._writer_conn: sqlite3.Connection | None = None
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.batches = 0
+        self.batched_ops = 0
+
+        self._sql_insert_session = f"INSERT OR IGNORE INTO {sessions_table} (session_id) VALUES (?)"
+        self._sql_insert_message = f"INSERT INTO {messages_table} (session_id, message_data) VALUES (?, ?)"
+        self._sql_touch_session = f"UPDATE {sessions_table} SET updated_at = CURRENT_TIMESTAMP WHERE session_id = ?"
+        self._sql_select_all = (
+            f"SELECT message_data FROM {messages_table} WHERE session_id = ? "
+            "ORDER BY created_at ASC, id ASC"
+        )
+        self._sql_select_latest = (
+            f"SELECT message_data FROM {messages_table} WHERE session_id = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        self._sql_pop = (
+            f"DELETE FROM {messages_table} WHERE id = ("
+            f"SELECT id FROM {messages_table} WHERE session_id = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT 1) RETURNING message_data"
+        )
+        self._sql_clear_messages = f"DELETE FROM {messages_table} WHERE session_id = ?"
+        self._sql_clear_session = f"DELETE FROM {sessions_table} WHERE session_id = ?"
+
+        self._writer_pool.submit(self._init_writer).result()
+
+    # ---- connections ----
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        else:
+            # isolation_level=None: transactions hum khud BEGIN / commit se chalate hain
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=256, isolation_level=None
+            )
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _init_writer(self) -> None:
+        conn = self._connect(read_only=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.sessions_table} (
+                session_id TEXT PRIMARY KEY,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.messages_table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                message_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (session_id) REFERENCES {self.sessions_table} (session_id)
+                    ON DELETE CASCADE
+            )
+            """
+        )
+        # rowid (id) index mein khud shamil hota hai, is liye ORDER BY created_at, id bhi index se
+        conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_{self.messages_table}_session_id
+            ON {self.messages_table} (session_id, created_at)
+            """
+        )
+        conn.commit()
+        self._writer_conn = conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._local.connection = self._connect(read_only=True)
+        return conn
+
+    # ---- reads (reader pool) ----
+
+    def _get_items_sync(self, session_id: str, limit: int | None) -> list[TResponseInputItem]:
+        conn = self._reader()
+        if limit is None:
+            rows = conn.execute(self._sql_select_all, (session_id,)).fetchall()
+        else:
+            rows = conn.execute(self._sql_select_latest, (session_id, limit)).fetchall()
+            rows.reverse()
+        items = []
+        for (message_data,) in rows:
+            try:
+                items.append(json.loads(message_data))
+            except json.JSONDecodeError:
+                continue
+        return items
+
+    async def get_items(self, session_id: str, limit: int | None) -> list[TResponseInputItem]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._reader_pool, self._get_items_sync, session_id, limit
+        )
+
+    # ---- writes (single writer, batched) ----
+
+    def _apply_op(self, kind: str, session_id: str, payload: Any) -> Any:
+        conn = self._writer_conn
+        if kind == "add":
+            conn.execute(self._sql_insert_session, (session_id,))
+            conn.executemany(self._sql_insert_message, [(session_id, data) for data in payload])
+            conn.execute(self._sql_touch_session, (session_id,))
+            return None
+        if kind == "pop":
+            row = conn.execute(self._sql_pop, (session_id,)).fetchone()
+            return row[0] if row else None
+        if kind == "clear":
+            conn.execute(self._sql_clear_messages, (session_id,))
+            conn.execute(self._sql_clear_session, (session_id,))
+            return None
+        raise ValueError(f"Unknown write op: {kind}")
+
+    def _apply_batch(self, ops: list[tuple[str, str, Any]]) -> list[Any]:
+        """Apply ``ops`` in one transaction; a failing op becomes its exception in the results.
+
+        Every op runs in its own SAVEPOINT, so one failure is rolled back alone and does not
+        fail the other sessions' writes in the same batch.
+        """
+        conn = self._writer_conn
+        results: list[Any] = []
+        try:
+            conn.execute("BEGIN")
+            for kind, session_id, payload in ops:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append(self._apply_op(kind, session_id, payload))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    results.append(e)
+                conn.execute("RELEASE op")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return results
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            ops = [op for op, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._writer_pool, self._apply_batch, ops)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.batched_ops += len(batch)
+            for (_, fut), result in zip(batch, results):
+                if fut.done():
+                    continue
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+
+    async def write(self, kind: str, session_id: str, payload: Any = None) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._writer_task is None or self._writer_task.done():
+            # naya event loop (jaise dusra asyncio.run) -> naya queue aur writer task
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer_task = loop.create_task(self._writer_loop())
+        fut = loop.create_future()
+        await self._queue.put(((kind, session_id, payload), fut))
+        return await fut
+
+    def close(self) -> None:
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self._reader_pool.shutdown(wait=False)
+        self._writer_pool.submit(self._writer_conn.close).result()
+        self._writer_pool.shutdown(wait=True)
+
+
+_stores: dict[tuple[str, str, str], _Store] = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(db_path: str, sessions_table: str, messages_table: str, readers: int, max_batch: int) -> _Store:
+    key = (str(Path(db_path).resolve()), sessions_table, messages_table)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = _Store(db_path, sessions_table, messages_table, readers, max_batch)
+        return _stores[key]
+
+
+class FastSQLiteSession(SessionABC):
+    """Drop-in replacement for ``SQLiteSession`` built for many concurrent sessions.
+
+    All sessions on the same database file share one writer and one reader pool.
+    Only file databases are supported (``:memory:`` cannot be shared across connections).
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        db_path: str | Path,
+        sessions_table: str = "agent_sessions",
+        messages_table: str = "agent_messages",
+        readers: int = 8,
+        max_batch: int = 256,
+    ):
+        if str(db_path) == ":memory:":
+            raise ValueError("FastSQLiteSession needs a database file, not ':memory:'.")
+        self.session_id = session_id
+        self.db_path = db_path
+        self._store = _get_store(str(db_path), sessions_table, messages_table, readers, max_batch)
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        return await self._store.get_items(self.session_id, limit)
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        if not items:
+            return
+        # serialize yahin: na chalne wala item isi caller ko error de, writer batch ko nahi
+        await self._store.write("add", self.session_id, [json.dumps(item) for item in items])
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        message_data = await self._store.write("pop", self.session_id)
+        if message_data is None:
+            return None
+        try:
+            return json.loads(message_data)
+        except json.JSONDecodeError:
+            return None
+
+    async def clear_session(self) -> None:
+        await self._store.write("clear", self.session_id)
+
+
+def close_all() -> None:
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
@@ -1,24 +1,22 @@
 from agents import Agent, Runner, OpenAIChatCompletionsModel, AsyncOpenAI, SQLiteSession    # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from pathlib import Path
 import asyncio
+import os
+import sys
 
-load_dotenv()
-API_KEY = os.getenv("OPENAI_API_KEY")
-Gemini_API_KEY = os.getenv("api_key")
-if not API_KEY and not Gemini_API_KEY:
-    raise ValueError("API key is not set in the environment variables.")
+# shared provider repo root par hai (session ek alag uv workspace member hai)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from provider import get_client, get_model  # noqa: E402
+from fast_session import FastSQLiteSession  # noqa: E402
+from compaction import CompactingSession, agent_summarizer  # noqa: E402
+from memory_index import MemoryIndex, RetrievalSession  # noqa: E402
+from search_index import ConversationSearchIndex  # noqa: E402
 
-external_client = AsyncOpenAI(
-    api_key=Gemini_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
 
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client,
-)
+external_client = get_client()
+
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -28,9 +26,26 @@ config = RunConfig(
 )
 
 
-session = SQLiteSession("conversations_123"  , "conversations_practice.db")
+# session = SQLiteSession("conversations_123"  , "conversations_practice.db")
+# WAL + reader pool + batched single writer (fast_session.py), same tables as SQLiteSession
+raw_session = FastSQLiteSession("conversations_123", "conversations_practice.db")
+if os.getenv("SESSION_MEMORY") == "retrieval":
+    # sirf current input se related purane messages + aakhri 6 items jate hain
+    # (vectors conversations_practice.memory.npy / .jsonl mein)
+    session = RetrievalSession(raw_session, MemoryIndex("conversations_practice.memory"))
+else:
+    # history lambi ho jaye to purane turns ki jagah rolling summary + aakhri 4 turns jate hain
+    session = CompactingSession(
+        raw_session,
+        "conversations_practice.db",
+        summarizer=agent_summarizer(model, config),
+        keep_turns=4,
+    )
 # session = SQLiteSession("conversations_123"  )
 
+# FTS5 index, agent_messages ke triggers se har add_items par update hota hai
+search_index = ConversationSearchIndex("conversations_practice.db")
+
 
 
 Agent = Agent(
@@ -67,6 +82,13 @@ async def main():
         user_input = input("Enter your message (or 'exit' to quit): ")
         if user_input.lower() == "exit":
             break
+        if user_input.startswith("/search "):
+            for hit in await search_index.search(None, user_input[len("/search "):]):
+                print(f"{hit.session_id}  #{hit.message_id}  {hit.snippet}")
+            continue
+
+        if isinstance(session, RetrievalSession):
+            session.set_query(user_input)
 
         response = await Runner.run(
             Agent,
@@ -76,6 +98,8 @@ async def main():
         )
 
         print(response.final_output)
+        if isinstance(session, CompactingSession):
+            print(f"(history tokens saved this turn: {session.stats.last_saved_tokens})")
 
 
 if __name__ == "__main__":
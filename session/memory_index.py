@@ -0,0 +1,268 @@
+from agents import TResponseInputItem  # type: ignore
+from agents.memory import Session, SessionABC  # type: ignore
+from pathlib import Path
+from typing import Any
+import asyncio
+import json
+import re
+import threading
+import zlib
+import numpy as np  # type: ignore
+
+# Retrieval-based session memory.
+# Poori history bhejne ki bajaye sirf wo purane messages jo current input se milte julte hon.
+# Har item ka hashed character n-gram vector NumPy array mein (mmap file) save hota hai,
+# search ek matrix-vector product (cosine) + argpartition top-k hai.
+
+_EARLIER_QUESTIONS = re.compile(
+    r"\b(what did i ask|asked (you )?(before|earlier)|my (previous|earlier|last) (question|message)s?"
+    r"|pehle|phala|abhi tak|kon kon sa)\b",
+    re.IGNORECASE,
+)
+
+
+def item_text(item: TResponseInputItem) -> str:
+    content = item.get("content") if isinstance(item, dict) else None
+    if isinstance(content, list):
+        content = " ".join(c.get("text", "") for c in content if isinstance(c, dict))
+    if isinstance(content, str):
+        return content
+    return json.dumps(item, default=str)
+
+
+class HashingVectorizer:
+    """Character n-grams (plus whole words) hashed into ``dim`` buckets, L2-normalized."""
+
+    def __init__(self, dim: int = 1024, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+
+    def transform(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        text = " " + re.sub(r"\s+", " ", text.lower()).strip() + " "
+        grams = [text[i : i + self.ngram] for i in range(max(1, len(text) - self.ngram + 1))]
+        grams += text.split()
+        if grams:
+            buckets = np.fromiter(
+                (zlib.crc32(g.encode()) % self.dim for g in grams), dtype=np.int64, count=len(grams)
+            )
+            np.add.at(vec, buckets, 1.0)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+class MemoryIndex:
+    """Append-only vector index persisted as ``<prefix>.npy`` (mmap) + ``<prefix>.jsonl`` metadata."""
+
+    def __init__(self, prefix: str | Path, dim: int = 1024, initial_capacity: int = 1024):
+        self.prefix = Path(prefix)
+        self.vectors_path = Path(f"{self.prefix}.npy")
+        self.meta_path = Path(f"{self.prefix}.jsonl")
+        self.vectorizer = HashingVectorizer(dim=dim)
+        self._lock = threading.Lock()
+        self._meta: list[dict[str, Any]] = []
+        self._session_codes: dict[str, int] = {}
+        self._sessions = np.zeros(0, dtype=np.int32)
+
+        tombstones = []
+        if self.meta_path.exists() and self.vectors_path.exists():
+            with open(self.meta_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    (tombstones if "forget" in row else self._meta).append(row)
+            self._vectors = np.lib.format.open_memmap(self.vectors_path, mode="r+")
+            if self._vectors.shape[1] != dim:
+                raise ValueError(f"Index dim is {self._vectors.shape[1]}, expected {dim}.")
+        else:
+            self._vectors = np.lib.format.open_memmap(
+                self.vectors_path, mode="w+", dtype=np.float32, shape=(initial_capacity, dim)
+            )
+            self.meta_path.touch()
+        self._sessions = np.array(
+            [self._code(m["session_id"]) for m in self._meta], dtype=np.int32
+        )
+        for t in tombstones:
+            self._forget_rows(t["forget"], t["before"])
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def _code(self, session_id: str) -> int:
+        return self._session_codes.setdefault(session_id, len(self._session_codes))
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        old = self._vectors
+        tmp_path = Path(f"{self.prefix}.tmp.npy")
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(capacity, old.shape[1])
+        )
+        grown[: len(self)] = old[: len(self)]
+        grown.flush()
+        del old, grown
+        self._vectors = None
+        tmp_path.replace(self.vectors_path)
+        self._vectors = np.lib.format.open_memmap(self.vectors_path, mode="r+")
+
+    def add(self, session_id: str, items: list[TResponseInputItem]) -> None:
+        if not items:
+            return
+        with self._lock:
+            start = len(self)
+            self._grow(start + len(items))
+            texts = [item_text(item) for item in items]
+            self._vectors[start : start + len(items)] = np.stack(
+                [self.vectorizer.transform(t) for t in texts]
+            )
+            self._vectors.flush()
+            new_meta = [
+                {"session_id": session_id, "seq": start + i, "item": item}
+                for i, item in enumerate(items)
+            ]
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                for m in new_meta:
+                    f.write(json.dumps(m, default=str) + "\n")
+            self._meta.extend(new_meta)
+            self._sessions = np.concatenate(
+                [self._sessions, np.full(len(items), self._code(session_id), dtype=np.int32)]
+            )
+
+    def _forget_rows(self, session_id: str, before: int) -> None:
+        code = self._session_codes.get(session_id)
+        if code is not None:
+            self._sessions[:before][self._sessions[:before] == code] = -1
+
+    def forget(self, session_id: str) -> None:
+        """Hide every item indexed so far for ``session_id`` (used by clear_session)."""
+        with self._lock:
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"forget": session_id, "before": len(self)}) + "\n")
+            self._forget_rows(session_id, len(self))
+
+    def search(
+        self, query: str, k: int = 5, session_id: str | None = None, role: str | None = None
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Top-k ``(score, metadata)`` by cosine similarity, best first."""
+        with self._lock:
+            n = len(self)
+            if n == 0:
+                return []
+            scores = self._vectors[:n] @ self.vectorizer.transform(query)
+            mask = self._sessions >= 0  # forget() wale rows -1 hain
+            if session_id is not None:
+                code = self._session_codes.get(session_id)
+                if code is None:
+                    return []
+                mask &= self._sessions == code
+            if role is not None:
+                mask &= np.array([m["item"].get("role") == role for m in self._meta])
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self._meta[i]) for i in top]
+
+    def count(self, session_id: str) -> int:
+        """Number of items indexed (and not forgotten) for ``session_id``."""
+        with self._lock:
+            code = self._session_codes.get(session_id)
+            return 0 if code is None else int((self._sessions == code).sum())
+
+    def recent(self, session_id: str, k: int, role: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            code = self._session_codes.get(session_id)
+            rows = [
+                m for m, c in zip(self._meta, self._sessions)
+                if c == code and (role is None or m["item"].get("role") == role)
+            ]
+        return rows[-k:]
+
+
+class RetrievalSession(SessionABC):
+    """Session that sends the last ``recent_items`` plus the ``top_k`` most relevant older items.
+
+    Call ``set_query(user_input)`` before ``Runner.run`` so retrieval knows the current input;
+    without a query only the recent items are returned. Raw items stay in ``inner``.
+    """
+
+    def __init__(
+        self,
+        inner: Session,
+        index: MemoryIndex,
+        recent_items: int = 6,
+        top_k: int = 5,
+        min_score: float = 0.15,
+    ):
+        self.inner = inner
+        self.session_id = getattr(inner, "session_id", "default")
+        self.index = index
+        self.recent_items = recent_items
+        self.top_k = top_k
+        self.min_score = min_score
+        self.query: str | None = None
+        self._backfilled = False
+        self._backfill_lock = asyncio.Lock()
+
+    async def _backfill(self) -> None:
+        # inner mein wrap hone se pehle ki history (purani conversations_123 jaisi sessions)
+        # index mein nahi hoti; pehli dafa jo items index se aage hain unhein add karo
+        if self._backfilled:
+            return
+        async with self._backfill_lock:
+            if self._backfilled:
+                return
+            items = await self.inner.get_items()
+            indexed = await asyncio.to_thread(self.index.count, self.session_id)
+            await asyncio.to_thread(self.index.add, self.session_id, items[indexed:])
+            self._backfilled = True
+
+    def set_query(self, query: str) -> None:
+        self.query = query
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        await self._backfill()
+        recent = await self.inner.get_items(self.recent_items)
+        if not self.query:
+            return recent if limit is None else recent[-limit:]
+
+        indexed = self.recent_items  # recent wale hits baad mein nikal diye jate hain
+        if _EARLIER_QUESTIONS.search(self.query):
+            # "maine pehle kya pucha?" jaise sawal: pichle user messages hi sab se relevant hain
+            # sab se naye pehle, taake neeche ranking wala hi cut lage
+            hits = self.index.recent(self.session_id, self.top_k + indexed, role="user")[::-1]
+        else:
+            hits = [
+                meta for score, meta in await asyncio.to_thread(
+                    self.index.search, self.query, self.top_k + indexed, self.session_id
+                )
+                if score >= self.min_score
+            ]
+        # jo items recent mein pehle se hain unhein dobara na bhejo; hits ranking order mein hain,
+        # is liye pehle top_k best rakho aur sirf unhein conversation order (seq) mein lagao
+        recent_seqs = {m["seq"] for m in self.index.recent(self.session_id, self.recent_items)}
+        best = [m for m in hits if m["seq"] not in recent_seqs][: self.top_k]
+        older = sorted(best, key=lambda m: m["seq"])
+        items = [m["item"] for m in older] + recent
+        return items if limit is None else items[-limit:]
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        await self._backfill()
+        await self.inner.add_items(items)
+        await asyncio.to_thread(self.index.add, self.session_id, items)
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        # index append-only hai; popped item index mein rehta hai (clear_session se hat-ta hai)
+        return await self.inner.pop_item()
+
+    async def clear_session(self) -> None:
+        await self.inner.clear_session()
+        await asyncio.to_thread(self.index.forget, self.session_id)
+        self._backfilled = True
@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Any
+import argparse
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+
+# Full-text search over stored conversations (SQLite FTS5).
+# agent_messages par triggers lage hain, is liye SQLiteSession ho ya FastSQLiteSession, har
+# add_items / pop / clear ke saath index khud update hota hai. Search async hai aur
+# bm25 rank + snippet ke saath results deta hai.
+#
+#   python search_index.py "biryani recipe" --session conversations_123
+
+
+@dataclass
+class SearchHit:
+    message_id: int
+    session_id: str
+    rank: float
+    snippet: str
+    item: Any
+    created_at: str
+
+
+def _body_sql(data: str) -> str:
+    """SQL expression for the indexed text of the item JSON in column ``data``.
+
+    String ``content`` is used as is; a list of content parts contributes only its ``text``
+    fields, and tool outputs their ``output`` string. JSON keys and ids are never indexed.
+    """
+    return (
+        f"CASE json_type({data}, '$.content') "
+        f"WHEN 'text' THEN json_extract({data}, '$.content') "
+        f"WHEN 'array' THEN (SELECT group_concat(json_extract(part.value, '$.text'), ' ') "
+        f"FROM json_each({data}, '$.content') AS part "
+        f"WHERE json_type(part.value, '$.text') = 'text') "
+        f"ELSE CASE json_type({data}, '$.output') "
+        f"WHEN 'text' THEN json_extract({data}, '$.output') ELSE '' END END"
+    )
+
+
+def to_match_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query (every word quoted, all words required)."""
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    return " ".join(f'"{w}"' for w in words)
+
+
+class ConversationSearchIndex:
+    def __init__(
+        self,
+        db_path: str,
+        messages_table: str = "agent_messages",
+        tokenizer: str = "unicode61 remove_diacritics 2",
+    ):
+        self.db_path = db_path
+        self.messages_table = messages_table
+        self.fts_table = f"{messages_table}_fts"
+        self._local = threading.local()
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._install(conn, tokenizer)
+        conn.close()
+
+    def _install(self, conn: sqlite3.Connection, tokenizer: str) -> None:
+        m, fts = self.messages_table, self.fts_table
+        body = _body_sql("new.message_data")
+        conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {m} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                message_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                body, tokenize = '{tokenizer}'
+            );
+            -- purane DBs mein poora JSON index karne wala trigger ho sakta hai
+            DROP TRIGGER IF EXISTS {fts}_ai;
+            CREATE TRIGGER {fts}_ai AFTER INSERT ON {m} BEGIN
+                INSERT INTO {fts} (rowid, body) VALUES (new.id, {body});
+            END;
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {m} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+            END;
+            """
+        )
+        # triggers se pehle wale purane rows bhi index mein daal do
+        conn.execute(
+            f"""
+            INSERT INTO {fts} (rowid, body)
+            SELECT id, {_body_sql("message_data")}
+            FROM {m} WHERE id > (SELECT COALESCE(MAX(rowid), 0) FROM {fts})
+            """
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._local.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        return conn
+
+    def search_sync(
+        self, session_id: str | None, query: str, limit: int = 10, raw: bool = False
+    ) -> list[SearchHit]:
+        match = query if raw else to_match_query(query)
+        if not match:
+            return []
+        sql = f"""
+            SELECT m.id, m.session_id, bm25({self.fts_table}) AS rank,
+                   snippet({self.fts_table}, 0, '[', ']', '…', 12),
+                   m.message_data, m.created_at
+            FROM {self.fts_table}
+            JOIN {self.messages_table} AS m ON m.id = {self.fts_table}.rowid
+            WHERE {self.fts_table} MATCH ?
+        """
+        params: list[Any] = [match]
+        if session_id is not None:
+            sql += " AND m.session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        rows = self._conn().execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                message_id=row[0],
+                session_id=row[1],
+                rank=row[2],
+                snippet=row[3],
+                item=json.loads(row[4]),
+                created_at=row[5],
+            )
+            for row in rows
+        ]
+
+    async def search(
+        self, session_id: str | None, query: str, limit: int = 10, raw: bool = False
+    ) -> list[SearchHit]:
+        """Ranked hits for ``query`` in one session, or in all sessions when ``session_id`` is None.
+
+        ``raw=True`` passes ``query`` to FTS5 as-is (AND/OR/NEAR, prefix*, column filters).
+        """
+        return await asyncio.to_thread(self.search_sync, session_id, query, limit, raw)
+
+
+async def _cli():
+    parser = argparse.ArgumentParser(description="Search stored conversations.")
+    parser.add_argument("query")
+    parser.add_argument("--db", default="conversations_practice.db")
+    parser.add_argument("--session", default=None, help="session id (default: all sessions)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--raw", action="store_true", help="use FTS5 query syntax directly")
+    args = parser.parse_args()
+
+    index = ConversationSearchIndex(args.db)
+    for hit in await index.search(args.session, args.query, args.limit, raw=args.raw):
+        print(f"{hit.session_id}  #{hit.message_id}  {hit.rank:.3f}  {hit.snippet}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_cli())
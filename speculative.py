@@ -0,0 +1,171 @@
+from agents import Agent, Runner, RunHooks, RunContextWrapper, RunResult, InputGuardrailTripwireTriggered  # type: ignore
+from agents.run import RunConfig, DEFAULT_MAX_TURNS  # type: ignore
+from dataclasses import dataclass, asdict, replace
+from typing import Any
+import asyncio
+import copy
+import time
+
+# Speculative execution.
+# Guarded agent ka pehla model call guardrail ke saath hi shuru ho jata hai. Pehle LLM
+# response ke baad run ek "gate" par rukta hai (koi tool / handoff nahi chalta) jab tak
+# guardrail ka verdict na aa jaye. Tripwire fire ho to speculative run cancel kar dete hain.
+
+# gate RunHooks.on_llm_end par khara hai (openai-agents 0.2.9 se). Purane SDK par hook kabhi
+# nahi chalta aur tools guardrail ke verdict se pehle chal jate, is liye yahin ruk jao.
+if not hasattr(RunHooks, "on_llm_end"):
+    raise ImportError("speculative.py needs openai-agents>=0.2.9 (RunHooks.on_llm_end is missing).")
+
+
+@dataclass
+class SpeculationStats:
+    runs: int = 0
+    kept: int = 0
+    tripped: int = 0
+    cancelled_in_flight: int = 0  # model call abhi chal rahi thi
+    cancelled_at_gate: int = 0  # model call ho chuki thi, verdict ka wait tha
+    wasted_tokens: int = 0
+    wasted_requests: int = 0
+    cancel_seconds: float = 0.0
+    guardrail_seconds: float = 0.0
+    overlap_seconds: float = 0.0  # guardrail time jo main call ke saath overlap hua
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+speculation_stats = SpeculationStats()
+
+
+class _GateHooks(RunHooks):
+    """Holds the speculative run after each LLM response until the guardrail verdict is in."""
+
+    def __init__(self, verdict: asyncio.Event, inner: RunHooks | None):
+        self.verdict = verdict
+        self.inner = inner or RunHooks()
+        self.llm_calls = 0
+        self.tokens = 0
+        self.llm_in_flight = False
+        self.first_response_at: float | None = None
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items):
+        self.llm_in_flight = True
+        await self.inner.on_llm_start(context, agent, system_prompt, input_items)
+
+    async def on_llm_end(self, context, agent, response):
+        self.llm_in_flight = False
+        self.llm_calls += 1
+        self.tokens = context.usage.total_tokens
+        if self.first_response_at is None:
+            self.first_response_at = time.perf_counter()
+        await self.verdict.wait()
+        await self.inner.on_llm_end(context, agent, response)
+
+    async def on_agent_start(self, context, agent):
+        await self.inner.on_agent_start(context, agent)
+
+    async def on_agent_end(self, context, agent, output):
+        await self.inner.on_agent_end(context, agent, output)
+
+    async def on_handoff(self, context, from_agent, to_agent):
+        await self.inner.on_handoff(context, from_agent, to_agent)
+
+    async def on_tool_start(self, context, agent, tool):
+        await self.inner.on_tool_start(context, agent, tool)
+
+    async def on_tool_end(self, context, agent, tool, result):
+        await self.inner.on_tool_end(context, agent, tool, result)
+
+
+async def _cancel(task: asyncio.Task, gate: _GateHooks, stats: SpeculationStats) -> None:
+    if task.done() and not task.cancelled() and task.exception() is None:
+        # guardrail se pehle hi poora run khatam ho gaya tha
+        stats.wasted_tokens += task.result().context_wrapper.usage.total_tokens
+        stats.wasted_requests += gate.llm_calls
+        return
+    if gate.llm_in_flight:
+        stats.cancelled_in_flight += 1
+        stats.wasted_requests += 1
+    else:
+        stats.cancelled_at_gate += 1
+    stats.wasted_tokens += gate.tokens
+    stats.wasted_requests += gate.llm_calls
+    started = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+    stats.cancel_seconds += time.perf_counter() - started
+
+
+async def run_speculative(
+    starting_agent: Agent,
+    input: Any,
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    hooks: RunHooks | None = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    stats: SpeculationStats = speculation_stats,
+) -> RunResult:
+    """Like ``Runner.run``, but the first model call overlaps the input guardrails.
+
+    Raises ``InputGuardrailTripwireTriggered`` exactly like a normal run when a guardrail trips.
+    """
+    guardrails = list(starting_agent.input_guardrails) + list(
+        (run_config.input_guardrails if run_config else None) or []
+    )
+    if not guardrails:
+        return await Runner.run(
+            starting_agent, input, context=context, run_config=run_config,
+            hooks=hooks, max_turns=max_turns,
+        )
+
+    stats.runs += 1
+    verdict = asyncio.Event()
+    gate = _GateHooks(verdict, hooks)
+    # guardrails hum khud chalate hain, speculative run unke baghair
+    speculative_agent = starting_agent.clone(input_guardrails=[])
+    speculative_config = replace(run_config, input_guardrails=None) if run_config else None
+    main_task = asyncio.create_task(
+        Runner.run(
+            speculative_agent, input, context=context, run_config=speculative_config,
+            hooks=gate, max_turns=max_turns,
+        )
+    )
+
+    guard_ctx = RunContextWrapper(context=context)
+    guard_input = copy.deepcopy(input)
+    started = time.perf_counter()
+    guard_tasks = [
+        asyncio.create_task(g.run(starting_agent, guard_input, guard_ctx)) for g in guardrails
+    ]
+    guardrail_results = []
+    try:
+        for done in asyncio.as_completed(guard_tasks):
+            result = await done
+            if result.output.tripwire_triggered:
+                stats.tripped += 1
+                for t in guard_tasks:
+                    t.cancel()
+                await _cancel(main_task, gate, stats)
+                raise InputGuardrailTripwireTriggered(result)
+            guardrail_results.append(result)
+    except InputGuardrailTripwireTriggered:
+        raise
+    except BaseException:
+        await _cancel(main_task, gate, stats)
+        raise
+    finally:
+        finished = time.perf_counter()
+        stats.guardrail_seconds += finished - started
+        # jitna guardrail time main call ke response se pehle guzra wo "free" tha
+        overlap_end = min(finished, gate.first_response_at or finished)
+        stats.overlap_seconds += max(0.0, overlap_end - started)
+
+    verdict.set()
+    run_result = await main_task
+    run_result.input_guardrail_results = guardrail_results
+    stats.kept += 1
+    return run_result
@@ -0,0 +1,166 @@
+from agents import OutputGuardrail, OutputGuardrailTripwireTriggered, RunContextWrapper, GuardrailFunctionOutput  # type: ignore
+from agents.guardrail import OutputGuardrailResult  # type: ignore
+from agents.result import RunResultStreaming  # type: ignore
+from agents.stream_events import StreamEvent  # type: ignore
+from openai.types.responses import ResponseTextDeltaEvent  # type: ignore
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Callable
+from preclassifier import FastPathVerdict, PreClassifier
+import asyncio
+import re
+
+# Streaming output guardrail.
+# Runner.run_streamed ke deltas jama karte hue chunk boundaries par output check hota hai:
+# har chunk par sasta local check, aur bari windows par LLM guardrail (background mein).
+# Tripwire fire ho to stream wahin cancel, poora response generate / bill nahi hota.
+
+_BOUNDARY = re.compile(r"[.!?\n]\s*$")
+
+
+@dataclass
+class StreamingGuardrailStats:
+    streams: int = 0
+    chunks_checked: int = 0
+    llm_checks: int = 0
+    tripped_local: int = 0
+    tripped_llm: int = 0
+    aborted_after_chars: int = 0  # kitne characters ke baad stream roki gayi (total)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+streaming_guardrail_stats = StreamingGuardrailStats()
+
+
+@dataclass
+class StreamingOutputGuardrail:
+    """Incremental version of an output guardrail.
+
+    ``local_classifier`` runs on every chunk boundary and trips on a confident ``deny``.
+    ``llm_guardrail`` (a normal ``@output_guardrail``) runs in the background every
+    ``window_chars`` new characters and once more on the full text at the end.
+    ``wrap_output`` turns the accumulated text into what ``llm_guardrail`` expects.
+    """
+
+    local_classifier: PreClassifier | None = None
+    llm_guardrail: OutputGuardrail | None = None
+    wrap_output: Callable[[str], Any] = lambda text: text
+    min_chunk_chars: int = 40
+    window_chars: int = 400
+
+    def __post_init__(self):
+        # local trip ka OutputGuardrailResult bhi asal OutputGuardrail object deta hai
+        self.local_guardrail: OutputGuardrail | None = None
+        if self.local_classifier is not None:
+            self.local_guardrail = OutputGuardrail(
+                guardrail_function=self._local_check, name=self.local_classifier.name
+            )
+
+    def local_verdict(self, text: str) -> GuardrailFunctionOutput | None:
+        """Tripping output when the local classifier confidently denies ``text``, else None."""
+        decision, score = self.local_classifier.decide(text)
+        if decision != "deny":
+            return None
+        return GuardrailFunctionOutput(
+            output_info=FastPathVerdict(
+                classifier=self.local_classifier.name,
+                decision=decision,
+                score=round(score, 4),
+                reason="partial output rejected by local check",
+            ),
+            tripwire_triggered=True,
+        )
+
+    def _local_check(self, ctx: RunContextWrapper, agent: Any, output: Any) -> GuardrailFunctionOutput:
+        text = output if isinstance(output, str) else str(output)
+        return self.local_verdict(text) or GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+
+async def stream_with_guardrail(
+    result: RunResultStreaming,
+    guardrail: StreamingOutputGuardrail,
+    context: Any = None,
+    stats: StreamingGuardrailStats = streaming_guardrail_stats,
+) -> AsyncIterator[StreamEvent]:
+    """Yield ``result.stream_events()`` while checking the partial output.
+
+    Raises ``OutputGuardrailTripwireTriggered`` (after cancelling the run) when a check trips.
+    """
+    stats.streams += 1
+    ctx = RunContextWrapper(context=context)
+    text = ""
+    last_chunk_at = 0
+    last_window_at = 0
+    llm_tasks: list[asyncio.Task] = []
+
+    def tripped(output: GuardrailFunctionOutput, guardrail_obj: Any) -> OutputGuardrailTripwireTriggered:
+        result.cancel()
+        for t in llm_tasks:
+            t.cancel()
+        stats.aborted_after_chars += len(text)
+        return OutputGuardrailTripwireTriggered(
+            OutputGuardrailResult(
+                guardrail=guardrail_obj,
+                agent_output=text,
+                agent=result.current_agent,
+                output=output,
+            )
+        )
+
+    def start_llm_check() -> None:
+        stats.llm_checks += 1
+        llm_tasks.append(
+            asyncio.create_task(
+                guardrail.llm_guardrail.run(ctx, result.current_agent, guardrail.wrap_output(text))
+            )
+        )
+
+    def finished_llm_trip() -> OutputGuardrailTripwireTriggered | None:
+        for t in [t for t in llm_tasks if t.done()]:
+            llm_tasks.remove(t)
+            check = t.result()
+            if check.output.tripwire_triggered:
+                stats.tripped_llm += 1
+                return tripped(check.output, check.guardrail)
+        return None
+
+    try:
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                text += event.data.delta
+                at_boundary = _BOUNDARY.search(text) is not None
+                if guardrail.local_classifier and (
+                    len(text) - last_chunk_at >= guardrail.min_chunk_chars
+                    or (at_boundary and len(text) > last_chunk_at)
+                ):
+                    last_chunk_at = len(text)
+                    stats.chunks_checked += 1
+                    verdict = guardrail.local_verdict(text)
+                    if verdict is not None:
+                        stats.tripped_local += 1
+                        raise tripped(verdict, guardrail.local_guardrail)
+                if guardrail.llm_guardrail and len(text) - last_window_at >= guardrail.window_chars:
+                    last_window_at = len(text)
+                    start_llm_check()
+
+            error = finished_llm_trip()
+            if error:
+                raise error
+            yield event
+
+        # stream khatam: bacha hua tail bhi LLM se check karwa lo (agar agent ke apne
+        # output_guardrails mein ye guardrail hai to SDK khud final output check karega)
+        sdk_checks_final = guardrail.llm_guardrail in result.current_agent.output_guardrails
+        if guardrail.llm_guardrail and len(text) > last_window_at and not sdk_checks_final:
+            start_llm_check()
+        if llm_tasks:
+            await asyncio.gather(*llm_tasks)
+            error = finished_llm_trip()
+            if error:
+                raise error
+    finally:
+        # consumer ne beech mein iteration chhor di (break / aclose) to background checks na latkein
+        for t in llm_tasks:
+            if not t.done():
+                t.cancel()
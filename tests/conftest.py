@@ -0,0 +1,8 @@
+import os
+import sys
+
+# modules repo root par flat rakhe hain
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# tests mein spans OpenAI ko export na hon
+os.environ.setdefault("OPENAI_AGENTS_DISABLE_TRACING", "1")
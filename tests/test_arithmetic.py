@@ -0,0 +1,36 @@
+import time
+
+from arithmetic import evaluate, format_number
+
+
+def test_plain_arithmetic():
+    assert format_number(evaluate("2 + 2 = ? ")) == "4"
+    assert format_number(evaluate("what is 3*(4+5)?")) == "27"
+    assert format_number(evaluate("10/4")) == "2.5"
+
+
+def test_word_problems_fall_back():
+    assert evaluate("If I have 3 apples and eat one") is None
+    assert evaluate('__import__("os")') is None
+    assert evaluate("1/0") is None
+
+
+def test_nested_power_is_rejected_quickly():
+    started = time.perf_counter()
+    assert evaluate("((10**1000)**1000)**1000") is None
+    assert evaluate("9**9**9") is None
+    assert evaluate("(2**1000)*(2**1000)*(2**1000)*(2**1000)*(2**1000)") is None
+    assert time.perf_counter() - started < 1.0
+
+
+def test_large_finite_result_formats_without_float():
+    assert format_number(evaluate("10**1000/3")) == "3.333333333e+999"
+
+
+def test_x_is_multiplication_but_hex_is_not():
+    assert format_number(evaluate("3x4")) == "12"
+    assert format_number(evaluate("10x10")) == "100"
+    assert format_number(evaluate("2 x (3+1)")) == "8"
+    assert format_number(evaluate("1.0x2")) == "2"
+    assert evaluate("0x10") is None
+    assert evaluate("2 * 0x10") is None
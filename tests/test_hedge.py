@@ -0,0 +1,39 @@
+import asyncio
+
+import httpx  # type: ignore
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner  # type: ignore
+
+from hedge import HedgedModel
+from mock_server import Latency, MockChatCompletions, MockConfig, MockTransport
+from rate_limit import AdaptiveLimiter, RateLimitTransport
+
+
+def _model(name: str, limiter: AdaptiveLimiter, config: MockConfig) -> OpenAIChatCompletionsModel:
+    transport = RateLimitTransport(MockTransport(MockChatCompletions(config)), limiter)
+    client = AsyncOpenAI(api_key="mock", base_url="http://mock/v1/", http_client=httpx.AsyncClient(transport=transport))
+    return OpenAIChatCompletionsModel(name, client)
+
+
+def test_streaming_loser_releases_its_response():
+    async def main():
+        limiter = AdaptiveLimiter(initial_concurrency=16, max_concurrency=16)
+        # dono ka pehla token deadline ke aas paas, taake kabhi primary haare kabhi secondary
+        config = dict(latency=Latency("uniform", 0.0, 0.04), tokens_per_second=200)
+        model = HedgedModel(
+            _model("primary", limiter, MockConfig(seed=1, **config)),
+            _model("secondary", limiter, MockConfig(seed=2, **config)),
+            initial_deadline=0.02,
+            min_samples=1000,
+            max_hedge_ratio=1.0,
+        )
+        agent = Agent(name="a", instructions="x", model=model)
+        for _ in range(40):
+            result = Runner.run_streamed(agent, "tell me a story")
+            async for _ in result.stream_events():
+                pass
+        await asyncio.sleep(0.05)
+        assert model.stats.hedged > 0
+        assert model.stats.primary_wins_after_hedge + model.stats.secondary_wins == model.stats.hedged
+        assert limiter.in_flight == 0
+
+    asyncio.run(asyncio.wait_for(main(), timeout=60))
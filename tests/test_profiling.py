@@ -0,0 +1,22 @@
+import asyncio
+import tracemalloc
+
+from profiling import ProfileSettings, profile_run
+
+
+def test_overlapping_memory_profiles(tmp_path):
+    settings = ProfileSettings(collectors=("memory",), output_dir=str(tmp_path))
+
+    async def run(delay: float) -> None:
+        async with profile_run(f"run-{delay}", settings):
+            await asyncio.sleep(delay)
+            data = [b"x" * 1024 for _ in range(10)]
+            assert tracemalloc.is_tracing()
+            del data
+
+    async def main() -> None:
+        await asyncio.gather(run(0.01), run(0.05))
+
+    asyncio.run(main())
+    assert not tracemalloc.is_tracing()
+    assert len(list(tmp_path.glob("*/memory.txt"))) == 2
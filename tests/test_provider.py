@@ -0,0 +1,25 @@
+import asyncio
+
+import httpx  # type: ignore
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner  # type: ignore
+
+import provider
+from mock_server import MockChatCompletions, MockConfig, MockTransport
+
+
+def test_cancelled_streamed_runs_do_not_leak_in_flight():
+    async def main():
+        transport = provider._InFlightTransport(MockTransport(MockChatCompletions(MockConfig(tokens_per_second=50))))
+        client = AsyncOpenAI(api_key="mock", base_url="http://mock/v1/", http_client=httpx.AsyncClient(transport=transport))
+        agent = Agent(name="a", instructions="x", model=OpenAIChatCompletionsModel("mock", client))
+        before = provider.pool_metrics.in_flight
+        for _ in range(30):
+            result = Runner.run_streamed(agent, "tell me a long story " * 10)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event":
+                    result.cancel()
+                    break
+        await asyncio.sleep(0.05)
+        assert provider.pool_metrics.in_flight == before
+
+    asyncio.run(asyncio.wait_for(main(), timeout=30))
@@ -0,0 +1,29 @@
+import asyncio
+
+import httpx  # type: ignore
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner  # type: ignore
+
+from mock_server import MockChatCompletions, MockConfig, MockTransport
+from rate_limit import AdaptiveLimiter, RateLimitTransport
+
+
+def test_cancelled_streamed_runs_release_their_slots():
+    async def main():
+        # dheema stream, taake cancel body ke beech mein ho
+        limiter = AdaptiveLimiter(initial_concurrency=16, max_concurrency=16)
+        transport = RateLimitTransport(MockTransport(MockChatCompletions(MockConfig(tokens_per_second=50))), limiter)
+        client = AsyncOpenAI(api_key="mock", base_url="http://mock/v1/", http_client=httpx.AsyncClient(transport=transport))
+        agent = Agent(name="a", instructions="x", model=OpenAIChatCompletionsModel("mock", client))
+
+        for _ in range(20):
+            result = Runner.run_streamed(agent, "tell me a long story " * 10)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event":
+                    result.cancel()
+                    break
+        await asyncio.sleep(0.05)
+        assert limiter.in_flight == 0
+        result = await Runner.run(agent, "hi")
+        assert result.final_output
+
+    asyncio.run(asyncio.wait_for(main(), timeout=30))
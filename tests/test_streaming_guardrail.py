@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from agents import Agent, OutputGuardrail, OutputGuardrailTripwireTriggered  # type: ignore
+from agents.stream_events import RawResponsesStreamEvent  # type: ignore
+from openai.types.responses import ResponseTextDeltaEvent  # type: ignore
+
+from preclassifier import PreClassifier
+from streaming_guardrail import StreamingGuardrailStats, StreamingOutputGuardrail, stream_with_guardrail
+
+
+class FakeStream:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.current_agent = Agent(name="fake")
+        self.cancelled = False
+
+    async def stream_events(self):
+        for delta in self.deltas:
+            await asyncio.sleep(0)
+            yield RawResponsesStreamEvent(data=ResponseTextDeltaEvent.model_construct(delta=delta))
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_local_trip_reports_output_guardrail():
+    guard = StreamingOutputGuardrail(
+        local_classifier=PreClassifier(name="no_flights", deny_keywords=["flight"]),
+        min_chunk_chars=1,
+    )
+    result = FakeStream(["Your flight ", "is booked."])
+
+    async def consume():
+        async for _ in stream_with_guardrail(result, guard, stats=StreamingGuardrailStats()):
+            pass
+
+    with pytest.raises(OutputGuardrailTripwireTriggered) as exc:
+        asyncio.run(consume())
+    assert isinstance(exc.value.guardrail_result.guardrail, OutputGuardrail)
+    assert result.cancelled
+
+
+def test_early_break_cancels_pending_llm_checks():
+    async def slow_check(ctx, agent, output):
+        await asyncio.sleep(60)
+
+    guard = StreamingOutputGuardrail(llm_guardrail=OutputGuardrail(slow_check), window_chars=1)
+
+    async def consume():
+        events = stream_with_guardrail(FakeStream(["a", "b", "c"]), guard, stats=StreamingGuardrailStats())
+        async for _ in events:
+            break
+        await events.aclose()
+        await asyncio.sleep(0.01)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(consume()) == []
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+import time
+
+from tool_executor import run_in_executor
+
+
+def test_cancelled_calls_keep_their_slot_until_the_thread_finishes():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    @run_in_executor("thread", max_concurrency=2)
+    def slow_tool(i: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.2)
+        with lock:
+            running -= 1
+        return i
+
+    async def main():
+        first = [asyncio.create_task(slow_tool(i)) for i in range(2)]
+        await asyncio.sleep(0.05)
+        for task in first:
+            task.cancel()  # threads chalte rehte hain
+        await asyncio.gather(*first, return_exceptions=True)
+        results = await asyncio.gather(*(slow_tool(i) for i in range(4)))
+        assert results == [0, 1, 2, 3]
+        stats = slow_tool.executor_stats
+        assert stats.in_flight == 0
+        assert stats.queued >= 1
+
+    asyncio.run(asyncio.wait_for(main(), timeout=10))
+    assert peak <= 2
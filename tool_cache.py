@@ -0,0 +1,176 @@
+from agents import RunContextWrapper  # type: ignore
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import time
+import typing
+
+# Memoizing decorator for function tools.
+# weather / day / admin-check jaise tools ka jawab args (aur kabhi context) se tay hota hai aur
+# der se badalta hai. @function_tool ke neeche lagao:
+#
+#   @function_tool
+#   @memoize_tool(ttl=300, context_fields=("city",))
+#   async def whether(ctx: RunContextWrapper, city: str) -> str: ...
+#
+# Key SDK ke validate kiye hue arguments (+ ctx.context ke chune hue fields) se banti hai.
+# Ek hi key ki saath chalti calls ek hi dafa chalti hain (single-flight). Error cache nahi hota.
+# Hooks mein hit ratio: tool_cache_stats(tool.name).
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # jo chalti hui same call ka intezar kar ke nikli
+    expired: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+# tool name -> stats (function ka naam, aur pehli call par SDK wala tool_name bhi)
+_registry: dict[str, ToolCacheStats] = {}
+
+
+def tool_cache_stats(name: str | None = None) -> dict[str, Any]:
+    """Stats for one memoized tool, or for all of them.
+
+    Tools are keyed by ``module.qualname`` (e.g. ``tools.weather_news``) unless ``memoize_tool`` was
+    given a ``name``; a tool called with ``ctx`` can also be looked up by its tool name.
+    """
+    if name is not None:
+        stats = _registry.get(name)
+        return stats.as_dict() if stats else {}
+    seen: dict[int, str] = {}
+    for tool_name, stats in _registry.items():
+        seen.setdefault(id(stats), tool_name)
+    return {tool_name: _registry[tool_name].as_dict() for tool_name in seen.values()}
+
+
+def _takes_context(func: Callable) -> bool:
+    params = list(inspect.signature(func).parameters.values())
+    if not params:
+        return False
+    annotation = typing.get_type_hints(func).get(params[0].name)
+    origin = typing.get_origin(annotation) or annotation
+    return inspect.isclass(origin) and issubclass(origin, RunContextWrapper)
+
+
+def _context_value(context: Any, path: str) -> Any:
+    value = context
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return repr(value)
+
+
+def memoize_tool(
+    ttl: float | None = 300.0,
+    maxsize: int = 256,
+    context_fields: tuple[str, ...] = (),
+    name: str | None = None,
+) -> Callable[[Callable], Callable]:
+    """Cache a tool function's results per arguments for ``ttl`` seconds (None = forever).
+
+    ``context_fields`` are attribute paths on ``ctx.context`` (e.g. ``"city"``) added to the key;
+    the function must then take ``ctx`` as its first parameter.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        takes_ctx = _takes_context(func)
+        if context_fields and not takes_ctx:
+            raise ValueError(f"{func.__name__}: context_fields need a ctx: RunContextWrapper parameter.")
+        # sirf __name__ par alag modules ke same naam wale tools ek doosre ke stats mita dete
+        stats = ToolCacheStats()
+        _registry[name or f"{func.__module__}.{func.__qualname__}"] = stats
+        cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        in_flight: dict[str, asyncio.Future] = {}
+
+        def make_key(args: tuple, kwargs: dict) -> str:
+            ctx = args[0] if takes_ctx else None
+            call_args = args[1:] if takes_ctx else args
+            context_part = [_context_value(ctx.context, f) for f in context_fields] if ctx else []
+            # hash, taake password jaise args cache mein plain text na rahein
+            raw = json.dumps([call_args, kwargs, context_part], sort_keys=True, default=_json_default)
+            return hashlib.sha256(raw.encode()).hexdigest()
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if takes_ctx:
+                tool_name = getattr(args[0], "tool_name", None)
+                if tool_name:
+                    _registry.setdefault(tool_name, stats)  # name_override wale tools ke liye
+            key = make_key(args, kwargs)
+
+            while True:
+                entry = cache.get(key)
+                if entry is not None:
+                    expires_at, value = entry
+                    if expires_at >= time.monotonic():
+                        cache.move_to_end(key)
+                        stats.hits += 1
+                        return value
+                    del cache[key]
+                    stats.expired += 1
+
+                future = in_flight.get(key)
+                if future is None:
+                    break
+                try:
+                    value = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if future.cancelled():
+                        continue  # pehli call cancel hui, ab ye khud chalaye
+                    raise
+                stats.coalesced += 1
+                return value
+
+            stats.misses += 1
+            future = in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                stats.errors += 1
+                future.set_exception(e)
+                future.exception()  # intezar karne wala koi na ho to bhi warning na aaye
+                raise
+            else:
+                cache[key] = (time.monotonic() + ttl if ttl is not None else float("inf"), result)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    stats.evictions += 1
+                future.set_result(result)
+                return result
+            finally:
+                if in_flight.get(key) is future:
+                    del in_flight[key]
+
+        wrapper.cache_stats = stats  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,216 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from tool_cache import _takes_context
+from typing import Any, Callable, Literal
+import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
+import os
+import sys
+import time
+import weakref
+
+# Executors for sync function tools.
+# SDK sync tool (book_flight, wheather) ko seedha event loop par chalata hai; ek slow tool
+# process ke saare concurrent runs rok deta hai. Tool khud batata hai kahan chale:
+#
+#   @function_tool
+#   @run_in_executor("thread", max_concurrency=8)    # blocking I/O: shared thread pool
+#   def book_flight(flight: FlightBook) -> str: ...
+#
+#   "inline"  -> loop par hi (chhote, fori tools)
+#   "thread"  -> shared ThreadPoolExecutor (AGENTS_TOOL_THREADS)
+#   "process" -> shared ProcessPoolExecutor (AGENTS_TOOL_PROCESSES), CPU-heavy kaam ke liye;
+#                args / result pickle hone chahiye aur ctx nahi mil sakta
+#
+# max_concurrency us tool ki ek waqt mein chalti calls ki had hai (baqi loop par intezar karti hain).
+# memoize_tool ke saath: @function_tool, phir @memoize_tool, phir @run_in_executor.
+
+ExecutorKind = Literal["inline", "thread", "process"]
+
+
+@dataclass
+class ToolPoolSettings:
+    threads: int = int(os.getenv("AGENTS_TOOL_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+    processes: int = int(os.getenv("AGENTS_TOOL_PROCESSES", str(os.cpu_count() or 1)))
+
+
+tool_pool_settings = ToolPoolSettings()
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def configure_tool_pools(**settings: Any) -> ToolPoolSettings:
+    """Change pool sizes. Must be called before the first tool runs in a pool."""
+    if _thread_pool is not None or _process_pool is not None:
+        raise RuntimeError("configure_tool_pools() must be called before the pools are created.")
+    for name, value in settings.items():
+        if not hasattr(tool_pool_settings, name):
+            raise ValueError(f"Unknown tool pool setting: {name}")
+        setattr(tool_pool_settings, name, value)
+    return tool_pool_settings
+
+
+def _pool(kind: ExecutorKind) -> Executor:
+    global _thread_pool, _process_pool
+    if kind == "thread":
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(tool_pool_settings.threads, thread_name_prefix="tool")
+        return _thread_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(tool_pool_settings.processes)
+    return _process_pool
+
+
+def shutdown_tool_pools(wait: bool = True) -> None:
+    global _thread_pool, _process_pool
+    for pool in (_thread_pool, _process_pool):
+        if pool is not None:
+            pool.shutdown(wait=wait)
+    _thread_pool = _process_pool = None
+
+
+@dataclass
+class ToolExecutorStats:
+    executor: str = "inline"
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    queued: int = 0  # max_concurrency ki wajah se intezar karne wali calls
+    queue_wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+_registry: dict[str, ToolExecutorStats] = {}
+
+# process pool ke child mein function naam se dhoonda jata hai: module ka attribute to
+# FunctionTool ban chuka hota hai, is liye asal functions yahan register hote hain
+_process_functions: dict[str, Callable] = {}
+
+
+def tool_executor_stats(name: str | None = None) -> dict[str, Any]:
+    """Stats for one executor-wrapped tool, or for all of them.
+
+    Tools are keyed by ``module.qualname`` (e.g. ``agent_hooks.book_flight``) unless
+    ``run_in_executor`` was given a ``name``.
+    """
+    if name is not None:
+        stats = _registry.get(name)
+        return stats.as_dict() if stats else {}
+    return {tool_name: stats.as_dict() for tool_name, stats in _registry.items()}
+
+
+def _process_call(key: str, args: tuple, kwargs: dict) -> Any:
+    func = _process_functions.get(key)
+    if func is None:
+        # spawn: child ne module abhi import nahi kiya (script ho to __mp_main__ naam se hota hai)
+        module, _, _ = key.partition(":")
+        if module == "__main__":
+            module = "__mp_main__"
+            key = key.replace("__main__:", "__mp_main__:", 1)
+        if module not in sys.modules:
+            importlib.import_module(module)
+        func = _process_functions[key]
+    return func(*args, **kwargs)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    # pool thread se: asyncio.Semaphore sirf apne loop par chhua ja sakta hai
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass  # loop band ho chuka
+
+
+def run_in_executor(
+    executor: ExecutorKind = "thread",
+    max_concurrency: int | None = None,
+    name: str | None = None,
+) -> Callable[[Callable], Callable]:
+    """Run a sync tool function ``inline``, in the shared ``thread`` pool or in the ``process`` pool.
+
+    ``max_concurrency`` limits how many calls of this tool run at once.
+    """
+    if executor not in ("inline", "thread", "process"):
+        raise ValueError(f"Unknown executor {executor!r}; use 'inline', 'thread' or 'process'.")
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            raise ValueError(f"{func.__name__} is async; run_in_executor is for sync tools.")
+        if executor == "process":
+            if _takes_context(func):
+                raise ValueError(f"{func.__name__}: process-pool tools cannot take ctx.")
+            key = f"{func.__module__}:{func.__qualname__}"
+            _process_functions[key] = func
+        # sirf __name__ par do scripts ke book_flight ek doosre ke stats mita dete
+        stats = ToolExecutorStats(executor=executor)
+        _registry[name or f"{func.__module__}.{func.__qualname__}"] = stats
+        semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # loop -> Semaphore
+
+        def submit(loop: asyncio.AbstractEventLoop, args: tuple, kwargs: dict) -> Future:
+            if executor == "thread":
+                # tracing spans / log correlation contextvars thread mein bhi milen
+                context = contextvars.copy_context()
+                return _pool(executor).submit(context.run, func, *args, **kwargs)
+            return _pool(executor).submit(_process_call, key, args, kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            semaphore = None
+            if max_concurrency:
+                semaphore = semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = semaphores[loop] = asyncio.Semaphore(max_concurrency)
+                if semaphore.locked():
+                    stats.queued += 1
+                started = time.perf_counter()
+                await semaphore.acquire()
+                stats.queue_wait_seconds += time.perf_counter() - started
+
+            stats.calls += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            started = time.perf_counter()
+
+            def finished() -> None:
+                stats.run_seconds += time.perf_counter() - started
+                stats.in_flight -= 1
+                if semaphore is not None:
+                    semaphore.release()
+
+            if executor == "inline":
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    stats.errors += 1
+                    raise
+                finally:
+                    finished()
+
+            try:
+                job = submit(loop, args, kwargs)
+            except BaseException:
+                stats.errors += 1
+                finished()
+                raise
+            # slot tab wapas jab pool mein kaam waqai khatam ho: awaiting task cancel ho jaye to
+            # bhi thread chalta rehta hai, aur max_concurrency usi ko gin-ta hai
+            job.add_done_callback(lambda _: _call_soon(loop, finished))
+            try:
+                return await asyncio.wrap_future(job, loop=loop)
+            except BaseException:
+                stats.errors += 1
+                raise
+
+        wrapper.executor_stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
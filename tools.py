@@ -1,29 +1,17 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, enable_verbose_stdout_logging, function_tool, ModelSettings, RunContextWrapper, FunctionTool  # type: ignore
 from agents.run import RunConfig  # type: ignore
-from dotenv import load_dotenv  # type: ignore
-import os
+from provider import get_client, get_model
+from tool_cache import memoize_tool
 import rich
 from pydantic import BaseModel  # type: ignore
 
 
 # enable_verbose_stdout_logging()
 
-load_dotenv()
-openai = os.getenv("OPENAI_API_KEY")
-Api_key = os.getenv("api_key")
-if not Api_key:
-    raise ValueError("API key is not set in the environment variables.")
 
+External_client: AsyncOpenAI = get_client()
 
-External_client: AsyncOpenAI = AsyncOpenAI(
-    api_key=Api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model: OpenAIChatCompletionsModel = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=External_client,
-)
+model: OpenAIChatCompletionsModel = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -38,6 +26,7 @@ class address(BaseModel):
 
 
 @function_tool
+@memoize_tool(ttl=300)
 def weather_news(city: str) -> str:
     """Returns the weather news for a given city."""
     # raise ValueError("fail to fetch whether news")
@@ -85,6 +74,7 @@ def enable(ctx: RunContextWrapper, Agent: Agent) -> bool:
     use_docstring_info=True,
     is_enabled=True, 
 )
+@memoize_tool(ttl=300, context_fields=("city",))
 async def whether(ctx: RunContextWrapper, city: str) -> str:
     """Returns the weather for a given city."""
     # raise ValueError("fail to fetch whether")
@@ -0,0 +1,366 @@
+from agents.tracing import add_trace_processor, set_trace_processors  # type: ignore
+from agents.tracing.processor_interface import TracingExporter  # type: ignore
+from agents.tracing.processors import BatchTraceProcessor  # type: ignore
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable
+import argparse
+import json
+import sqlite3
+import threading
+
+# Local trace store + analytics.
+# Spans remote backend ke bajaye SDK ke BatchTraceProcessor (background thread, batches) ke
+# zariye local JSONL ya SQLite file mein jate hain. Phir CLI:
+#
+#   python trace_store.py traces.db types            # LLM / tool / guardrail / handoff par kitna waqt
+#   python trace_store.py traces.db slowest -n 10    # sab se slow workflows aur runs
+#   python trace_store.py traces.db critical-path    # har run ka critical path (ya --trace ID)
+#
+# provider.py mein AGENTS_TRACE_STORE=traces.db (ya .jsonl) set karo to har script yahin likhti hai.
+
+# span_data ke bare fields (prompts / outputs) default mein store nahi hote
+_PAYLOAD_FIELDS = ("input", "output", "model_config", "mcp_data")
+
+# SDK span types -> report ki categories
+CATEGORIES = {
+    "generation": "llm",
+    "response": "llm",
+    "function": "tool",
+    "mcp_tools": "tool",
+    "guardrail": "guardrail",
+    "handoff": "handoff",
+    "agent": "agent",
+}
+
+
+def _is_sqlite(path: str) -> bool:
+    return path.endswith((".db", ".sqlite", ".sqlite3"))
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS traces (
+            id TEXT PRIMARY KEY, workflow_name TEXT, group_id TEXT, metadata TEXT
+        );
+        CREATE TABLE IF NOT EXISTS spans (
+            id TEXT PRIMARY KEY, trace_id TEXT, parent_id TEXT, type TEXT,
+            started_at TEXT, ended_at TEXT, error TEXT, data TEXT
+        );
+        CREATE INDEX IF NOT EXISTS spans_trace ON spans (trace_id);
+        """
+    )
+    return conn
+
+
+class LocalTraceExporter(TracingExporter):
+    """Writes exported traces and spans to a JSONL file, or SQLite for ``.db``/``.sqlite`` paths."""
+
+    def __init__(self, path: str = "traces.jsonl", include_payloads: bool = False):
+        self.path = path
+        self.include_payloads = include_payloads
+        self._lock = threading.Lock()  # worker thread aur shutdown flush dono export karte hain
+
+    def _item(self, item: Any) -> dict[str, Any] | None:
+        data = item.export()
+        if data and not self.include_payloads and "span_data" in data:
+            data["span_data"] = {
+                k: v for k, v in (data["span_data"] or {}).items() if k not in _PAYLOAD_FIELDS
+            }
+        return data
+
+    def export(self, items: list[Any]) -> None:
+        rows = [row for row in map(self._item, items) if row]
+        if not rows:
+            return
+        with self._lock:
+            if _is_sqlite(self.path):
+                self._export_sqlite(rows)
+            else:
+                with open(self.path, "a") as f:
+                    f.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+
+    def _export_sqlite(self, rows: list[dict[str, Any]]) -> None:
+        conn = _connect(self.path)
+        try:
+            with conn:
+                for row in rows:
+                    if row.get("object") == "trace":
+                        conn.execute(
+                            "INSERT OR REPLACE INTO traces VALUES (?, ?, ?, ?)",
+                            (row["id"], row.get("workflow_name"), row.get("group_id"),
+                             json.dumps(row.get("metadata"), default=str)),
+                        )
+                    else:
+                        span_data = row.get("span_data") or {}
+                        conn.execute(
+                            "INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (row["id"], row["trace_id"], row.get("parent_id"), span_data.get("type"),
+                             row.get("started_at"), row.get("ended_at"),
+                             json.dumps(row.get("error"), default=str) if row.get("error") else None,
+                             json.dumps(span_data, default=str)),
+                        )
+        finally:
+            conn.close()
+
+
+def install_local_tracing(
+    path: str = "traces.jsonl",
+    local_only: bool = True,
+    include_payloads: bool = False,
+    **batch_settings: Any,
+) -> BatchTraceProcessor:
+    """Send traces to ``path`` in batches; with ``local_only`` the remote exporter is removed."""
+    processor = BatchTraceProcessor(LocalTraceExporter(path, include_payloads), **batch_settings)
+    if local_only:
+        set_trace_processors([processor])
+    else:
+        add_trace_processor(processor)
+    return processor
+
+
+# ---- analytics ----
+
+
+@dataclass
+class SpanRecord:
+    id: str
+    trace_id: str
+    parent_id: str | None
+    type: str
+    started: float
+    ended: float
+    data: dict[str, Any]
+    error: Any = None
+    children: list["SpanRecord"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.ended - self.started)
+
+    @property
+    def category(self) -> str:
+        return CATEGORIES.get(self.type, self.type or "other")
+
+    @property
+    def label(self) -> str:
+        d = self.data
+        if self.type == "handoff":
+            return f"{d.get('from_agent')} -> {d.get('to_agent')}"
+        if self.type == "generation":
+            return str(d.get("model") or "generation")
+        return str(d.get("name") or self.type)
+
+
+@dataclass
+class TraceRecord:
+    id: str
+    workflow_name: str = "?"
+    group_id: str | None = None
+    metadata: Any = None
+    spans: list[SpanRecord] = field(default_factory=list)
+
+    @property
+    def roots(self) -> list[SpanRecord]:
+        ids = {s.id for s in self.spans}
+        return [s for s in self.spans if s.parent_id not in ids]
+
+    @property
+    def started(self) -> float:
+        return min(s.started for s in self.spans)
+
+    @property
+    def duration(self) -> float:
+        return max(s.ended for s in self.spans) - self.started if self.spans else 0.0
+
+
+def _ts(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def _rows(path: str) -> Iterable[dict[str, Any]]:
+    if _is_sqlite(path):
+        conn = _connect(path)
+        try:
+            for id, workflow_name, group_id, metadata in conn.execute("SELECT * FROM traces"):
+                yield {"object": "trace", "id": id, "workflow_name": workflow_name,
+                       "group_id": group_id, "metadata": json.loads(metadata or "null")}
+            for id, trace_id, parent_id, _, started, ended, error, data in conn.execute(
+                "SELECT * FROM spans"
+            ):
+                yield {"object": "trace.span", "id": id, "trace_id": trace_id, "parent_id": parent_id,
+                       "started_at": started, "ended_at": ended,
+                       "error": json.loads(error) if error else None, "span_data": json.loads(data)}
+        finally:
+            conn.close()
+    else:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def load_traces(path: str) -> dict[str, TraceRecord]:
+    """Read the store into traces with their span trees (unfinished spans are skipped)."""
+    traces: dict[str, TraceRecord] = {}
+    for row in _rows(path):
+        if row.get("object") == "trace":
+            trace = traces.setdefault(row["id"], TraceRecord(row["id"]))
+            trace.workflow_name = row.get("workflow_name") or "?"
+            trace.group_id, trace.metadata = row.get("group_id"), row.get("metadata")
+            continue
+        started, ended = _ts(row.get("started_at")), _ts(row.get("ended_at"))
+        if started is None or ended is None:
+            continue
+        data = row.get("span_data") or {}
+        traces.setdefault(row["trace_id"], TraceRecord(row["trace_id"])).spans.append(
+            SpanRecord(row["id"], row["trace_id"], row.get("parent_id"), data.get("type", ""),
+                       started, ended, data, row.get("error"))
+        )
+    for trace in traces.values():
+        by_id = {s.id: s for s in trace.spans}
+        for span in trace.spans:
+            if span.parent_id in by_id:
+                by_id[span.parent_id].children.append(span)
+    return {k: t for k, t in traces.items() if t.spans}
+
+
+def _percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _self_time(span: SpanRecord) -> float:
+    # span ka woh waqt jo kisi child ne cover nahi kiya (overlapping children ek baar gine jate hain)
+    covered, cursor = 0.0, span.started
+    for child in sorted(span.children, key=lambda c: c.started):
+        start, end = max(child.started, cursor), min(child.ended, span.ended)
+        if end > start:
+            covered += end - start
+            cursor = end
+    return max(0.0, span.duration - covered)
+
+
+def time_by_type(traces: dict[str, TraceRecord]) -> dict[str, dict[str, Any]]:
+    """Count, inclusive and self duration (ms) per span category, plus share of total run time.
+
+    The share uses self time (duration minus time covered by child spans), so an agent span
+    is not counted again for the LLM / tool spans inside it.
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    self_times: dict[str, float] = defaultdict(float)
+    for trace in traces.values():
+        for span in trace.spans:
+            durations[span.category].append(span.duration)
+            self_times[span.category] += _self_time(span)
+    total_run = sum(t.duration for t in traces.values()) or 1.0
+    return {
+        category: {
+            "count": len(values),
+            "total_ms": round(sum(values) * 1000, 2),
+            "self_ms": round(self_times[category] * 1000, 2),
+            "avg_ms": round(sum(values) / len(values) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "share_of_run_time": round(self_times[category] / total_run, 4),
+        }
+        for category, values in sorted(durations.items(), key=lambda kv: -self_times[kv[0]])
+    }
+
+
+def slowest(traces: dict[str, TraceRecord], n: int = 10) -> dict[str, Any]:
+    """Top-``n`` workflows by p95 run time and the ``n`` slowest individual runs."""
+    by_workflow: dict[str, list[float]] = defaultdict(list)
+    for trace in traces.values():
+        by_workflow[trace.workflow_name].append(trace.duration)
+    workflows = [
+        {
+            "workflow_name": name,
+            "runs": len(values),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2),
+        }
+        for name, values in by_workflow.items()
+    ]
+    runs = sorted(traces.values(), key=lambda t: -t.duration)[:n]
+    return {
+        "workflows": sorted(workflows, key=lambda w: -w["p95_ms"])[:n],
+        "runs": [
+            {"trace_id": t.id, "workflow_name": t.workflow_name, "duration_ms": round(t.duration * 1000, 2)}
+            for t in runs
+        ],
+    }
+
+
+def _path_through(span: SpanRecord, tolerance: float = 1e-4) -> list[tuple[SpanRecord, float]]:
+    # span ke end se peeche chalo: jo child sab se der tak chala wahi is waqt ko tay karta hai
+    path: list[tuple[SpanRecord, float]] = []
+    cursor, self_time = span.ended, 0.0
+    children = sorted(span.children, key=lambda c: c.ended, reverse=True)
+    for child in children:
+        if child.ended > cursor + tolerance:
+            continue  # overlap: kisi baad wale child ke saath chal raha tha
+        self_time += max(0.0, cursor - child.ended)
+        path = _path_through(child) + path
+        cursor = child.started
+    self_time += max(0.0, cursor - span.started)
+    return [(span, self_time)] + path
+
+
+def critical_path(trace: TraceRecord) -> list[dict[str, Any]]:
+    """Spans that determine the run's wall time, in start order, with their own (self) time."""
+    root = SpanRecord("", trace.id, None, "run", trace.started, trace.started + trace.duration, {},
+                      children=trace.roots)
+    steps = sorted(_path_through(root)[1:], key=lambda step: step[0].started)
+    return [
+        {
+            "type": span.category,
+            "name": span.label,
+            "offset_ms": round((span.started - trace.started) * 1000, 2),
+            "duration_ms": round(span.duration * 1000, 2),
+            "self_ms": round(self_time * 1000, 2),
+        }
+        for span, self_time in steps
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analyse traces stored by LocalTraceExporter.")
+    parser.add_argument("store", help="traces .jsonl or .db file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("types", help="time per span type (llm, tool, guardrail, handoff, agent)")
+    slow = commands.add_parser("slowest", help="top-N slowest workflows and runs")
+    slow.add_argument("-n", type=int, default=10)
+    path = commands.add_parser("critical-path", help="critical path of runs")
+    path.add_argument("--trace", default=None, help="trace id (default: the -n slowest runs)")
+    path.add_argument("-n", type=int, default=3)
+    args = parser.parse_args()
+
+    traces = load_traces(args.store)
+    if args.command == "types":
+        report: Any = time_by_type(traces)
+    elif args.command == "slowest":
+        report = slowest(traces, args.n)
+    else:
+        if args.trace and args.trace not in traces:
+            parser.error(f"unknown trace id {args.trace!r} in {args.store}")
+        selected = (
+            [traces[args.trace]] if args.trace else sorted(traces.values(), key=lambda t: -t.duration)[: args.n]
+        )
+        report = [
+            {
+                "trace_id": t.id,
+                "workflow_name": t.workflow_name,
+                "duration_ms": round(t.duration * 1000, 2),
+                "critical_path": critical_path(t),
+            }
+            for t in selected
+        ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()